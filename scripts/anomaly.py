@@ -0,0 +1,153 @@
+"""
+Anomaly Scoring
+Vectorized mention anomaly detection over a (tickers x subreddits x days) count matrix
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+# EWMA half-life in buckets (days)
+EWMA_HALFLIFE = 7
+
+# An alert needs at least this many mentions in the current bucket
+MIN_COUNT = 5
+
+# Poisson surprise (log-likelihood ratio, nats) and robust z-score thresholds
+SURPRISE_THRESHOLD = 6.0
+Z_THRESHOLD = 3.0
+
+# Floors so quiet series do not produce infinite scores
+MIN_RATE = 0.1
+MIN_SCALE = 1.0
+
+# Scale factor that makes the MAD a consistent estimator of the standard deviation
+MAD_SCALE = 1.4826
+
+# Series scored per block; bounds the float32 temporaries (~rows x days x 4 bytes)
+CHUNK_ROWS = 1 << 17
+
+Alert = namedtuple('Alert', ['ticker', 'subreddit', 'count', 'baseline', 'robust_z', 'surprise'])
+
+
+def ewma_weights(n, halflife=EWMA_HALFLIFE):
+    """Normalised EWMA weights for n buckets, oldest first"""
+    decay = 0.5 ** (1.0 / halflife)
+    weights = decay ** np.arange(n - 1, -1, -1, dtype=np.float64)
+    return (weights / weights.sum()).astype(np.float32)
+
+
+def ewma_baseline(history, halflife=EWMA_HALFLIFE):
+    """
+    EWMA of each series over its last axis (oldest bucket first)
+
+    With a fixed window the recursive EWMA is a weighted sum, so the whole matrix
+    is one matrix-vector product instead of a Python loop over buckets.
+    """
+    history = np.asarray(history)
+    return history.astype(np.float32, copy=False) @ ewma_weights(history.shape[-1], halflife)
+
+
+def poisson_surprise(current, baseline):
+    """
+    Poisson log-likelihood ratio of `current` against rate `baseline`, in nats
+
+    x ln(x / λ) - (x - λ) for counts above the rate, 0 otherwise. It is the
+    exponent of the Chernoff bound on P(X >= x), so e^-surprise bounds how
+    likely the count is under the baseline rate.
+    """
+    current = np.asarray(current, dtype=np.float32)
+    rate = np.maximum(np.asarray(baseline, dtype=np.float32), MIN_RATE)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        surprise = current * np.log(current / rate) - (current - rate)
+    return np.where(current > rate, surprise, np.float32(0))
+
+
+def robust_zscores(history, current):
+    """(current - median) / (1.4826 * MAD) over each series' history"""
+    history = np.asarray(history, dtype=np.float32)
+    median = np.median(history, axis=-1)
+    mad = np.median(np.abs(history - median[..., None]), axis=-1)
+
+    scale = np.maximum(MAD_SCALE * mad, MIN_SCALE)
+    return (np.asarray(current, dtype=np.float32) - median) / scale
+
+
+def _score_series(series, halflife, min_count, surprise_threshold, z_threshold):
+    """
+    Score (rows x buckets) series; the last bucket is the one under test
+
+    EWMA and Poisson surprise are computed for every row. The median/MAD pass is
+    the expensive one, so it only runs on rows that already have enough mentions
+    and pass the surprise threshold. Returns (rows, count, baseline, z, surprise)
+    for the rows that pass both tests.
+    """
+    found = []
+
+    for start in range(0, len(series), CHUNK_ROWS):
+        block = series[start:start + CHUNK_ROWS]
+        history, current = block[:, :-1], block[:, -1]
+
+        baseline = ewma_baseline(history, halflife)
+        surprise = poisson_surprise(current, baseline)
+
+        candidates = np.flatnonzero((current >= min_count) & (surprise >= surprise_threshold))
+        if not len(candidates):
+            continue
+
+        z = robust_zscores(history[candidates], current[candidates])
+        keep = z >= z_threshold
+        rows = candidates[keep]
+
+        found.append((rows + start, current[rows], baseline[rows], z[keep], surprise[rows]))
+
+    if not found:
+        empty = np.array([], dtype=np.float32)
+        return np.array([], dtype=np.int64), empty, empty, empty, empty
+    return tuple(np.concatenate(parts) for parts in zip(*found))
+
+
+def score_anomalies(counts, tickers, subreddits=None, halflife=EWMA_HALFLIFE,
+                    min_count=MIN_COUNT, surprise_threshold=SURPRISE_THRESHOLD,
+                    z_threshold=Z_THRESHOLD, top_n=50):
+    """
+    Rank mention anomalies in the latest time bucket
+
+    counts is (tickers x subreddits x buckets) or (tickers x buckets), oldest
+    bucket first. Each (ticker, subreddit) series is scored, and so is each
+    ticker's total across subreddits (reported with subreddit=None), so broad
+    surges show up even when no single subreddit is anomalous.
+
+    A series alerts when its latest count is at least min_count and both its
+    Poisson surprise against the EWMA baseline and its robust z-score against
+    its own median/MAD clear their thresholds. Returns up to top_n Alerts,
+    most surprising first.
+    """
+    counts = np.asarray(counts)
+    if counts.ndim == 2:
+        counts = counts[:, None, :]
+        subreddits = [None]
+
+    n_tickers, n_subreddits, n_buckets = counts.shape
+    if n_buckets < 2:
+        return []
+
+    levels = [(counts.reshape(-1, n_buckets), list(subreddits))]
+    if n_subreddits > 1:
+        levels.append((counts.sum(axis=1), [None]))
+
+    alerts = []
+    for series, labels in levels:
+        rows, current, baseline, z, surprise = _score_series(
+            series, halflife, min_count, surprise_threshold, z_threshold
+        )
+        for row, count, rate, score, llr in zip(rows, current, baseline, z, surprise):
+            ticker_row, subreddit_col = divmod(int(row), len(labels))
+            alerts.append(Alert(
+                tickers[ticker_row], labels[subreddit_col], int(count),
+                float(rate), float(score), float(llr)
+            ))
+
+    alerts.sort(key=lambda alert: alert.surprise, reverse=True)
+    return alerts[:top_n]
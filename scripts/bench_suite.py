@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Throughput and peak memory of the analysis hot paths on a seeded synthetic
+corpus (1k / 100k / 1M documents), compared against a stored baseline; runs offline
+
+No baseline is committed (the numbers are machine-specific): run --save-baseline
+once before comparing, or every path reports "no baseline" and no regression is flagged.
+
+Usage:
+    python3 scripts/bench_suite.py --save-baseline       # first: record this machine's numbers as the baseline
+    python3 scripts/bench_suite.py                       # 1k and 100k, compared with the baseline
+    python3 scripts/bench_suite.py --sizes 1k,100k,1m    # include the 1M-document runs
+    python3 scripts/bench_suite.py --paths analyze_posts,extract_themes
+    python3 scripts/bench_suite.py --tolerance 0.1       # flag throughput drops over 10% (default 20%)
+"""
+
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from settings import configure
+from synthetic_corpus import DEFAULT_THEMES, DEFAULT_TICKERS, SyntheticCorpus
+
+BASELINE_PATH = Path(__file__).parent.parent / "data" / "benchmark_baseline.json"
+
+SIZES = {'1k': 1000, '100k': 100000, '1m': 1000000}
+DEFAULT_SIZES = ('1k', '100k')
+
+# A run is a regression when throughput drops, or peak memory grows, by more than this
+THROUGHPUT_TOLERANCE = 0.20
+MEMORY_TOLERANCE = 0.20
+
+# Peak memory below this is noise, not a regression
+MEMORY_FLOOR_MB = 1.0
+
+# Small corpora are timed repeatedly (for about this long) and the best run is kept
+MIN_TIMED_SECONDS = 2.0
+MAX_REPEATS = 100
+
+
+def extract_tickers(posts):
+    from live_reddit_monitor import extract_tickers_from_text
+    for post in posts:
+        extract_tickers_from_text(f"{post['title']} {post['body']}")
+
+def analyze_sentiment(results):
+    from live_report_generator import analyze_sentiment as analyze
+    for result in results:
+        analyze(result['content'])
+
+def extract_themes(results):
+    from live_report_generator import extract_themes_from_results
+    extract_themes_from_results(results)
+
+def analyze_posts(posts):
+    from live_reddit_monitor import analyze_posts as analyze
+    analyze(posts)
+
+def generate_full_report(results):
+    from live_report_generator import generate_full_report as generate
+    generate(results)
+
+# Hot path -> (corpus it runs on, function)
+HOT_PATHS = {
+    'extract_tickers': ('posts', extract_tickers),
+    'analyze_sentiment': ('search_results', analyze_sentiment),
+    'extract_themes': ('search_results', extract_themes),
+    'analyze_posts': ('posts', analyze_posts),
+    'generate_full_report': ('search_results', generate_full_report),
+}
+
+
+def measure(function, documents):
+    """
+    (docs/sec of the best untraced run, peak traced memory in MB)
+
+    The garbage collector is paused while timing, as in timeit: otherwise the
+    collections triggered by the corpus itself make the numbers jump between runs.
+    """
+    runs = []
+    gc.collect()
+    gc.disable()
+    try:
+        while not runs or (sum(runs) < MIN_TIMED_SECONDS and len(runs) < MAX_REPEATS):
+            start = time.perf_counter()
+            function(documents)
+            runs.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    best = min(runs)
+
+    # A separate traced run: tracemalloc slows allocation-heavy code down
+    tracemalloc.start()
+    function(documents)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return len(documents) / best, peak / 1024 / 1024
+
+def machine():
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()}
+
+def load_baseline(path=BASELINE_PATH):
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def save_baseline(results, path=BASELINE_PATH):
+    """Merge results into the baseline file (written atomically)"""
+    path = Path(path)
+    baseline = load_baseline(path) or {}
+    baseline.update(machine())
+    baseline['saved'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    baseline.setdefault('results', {}).update(results)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.tmp")
+    with open(temp_path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+def compare(result, reference, tolerance=THROUGHPUT_TOLERANCE):
+    """(text, regressed) for one result against its baseline entry"""
+    if reference is None:
+        return "no baseline", False
+
+    speed = result['docs_per_sec'] / reference['docs_per_sec'] - 1
+    memory = result['peak_mb'] - reference['peak_mb']
+    slower = speed < -tolerance
+    larger = memory > MEMORY_FLOOR_MB and result['peak_mb'] > reference['peak_mb'] * (1 + MEMORY_TOLERANCE)
+
+    text = f"{speed:+.0%} speed, {memory:+.1f} MB"
+    if slower or larger:
+        text += "  ❌ regression"
+    return text, slower or larger
+
+def run_suite(sizes=DEFAULT_SIZES, paths=None, seed=42, baseline_path=BASELINE_PATH, save=False,
+              tolerance=THROUGHPUT_TOLERANCE):
+    """
+    Run every hot path at every size; returns (results, regressions)
+
+    results maps "path/size" to {docs_per_sec, peak_mb}. The report builders
+    read their tickers and themes from settings, so the suite points settings
+    at an in-memory config matching the corpus.
+    """
+    paths = paths or list(HOT_PATHS)
+    configure(config={'obsidian_vault_path': '/tmp', 'tickers': DEFAULT_TICKERS, 'themes': DEFAULT_THEMES})
+
+    baseline = None if save else load_baseline(baseline_path)
+    if baseline:
+        if any(baseline.get(key) != value for key, value in machine().items()):
+            print(f"⚠️  Baseline recorded on another setup ({baseline.get('platform')}, "
+                  f"Python {baseline.get('python')}, {baseline.get('cpus')} CPUs)")
+        print(f"📏 Comparing against the baseline from {baseline.get('saved')}: {baseline_path}")
+    elif not save:
+        print(f"⚠️  No baseline at {baseline_path}: nothing to compare against. "
+              f"Record one first with --save-baseline")
+    print()
+
+    corpus = SyntheticCorpus(seed)
+    results, regressions = {}, []
+
+    for size in sizes:
+        count = SIZES[size]
+        started = time.perf_counter()
+        documents = {
+            kind: getattr(corpus, kind)(count)
+            for kind in sorted({HOT_PATHS[path][0] for path in paths})
+        }
+        print(f"📊 {size} documents (corpus generated in {time.perf_counter() - started:.1f}s)")
+
+        for path in paths:
+            kind, function = HOT_PATHS[path]
+            docs_per_sec, peak_mb = measure(function, documents[kind])
+            key = f"{path}/{size}"
+            results[key] = {'docs_per_sec': round(docs_per_sec, 1), 'peak_mb': round(peak_mb, 2)}
+
+            reference = (baseline or {}).get('results', {}).get(key)
+            text, regressed = compare(results[key], reference, tolerance)
+            if regressed:
+                regressions.append(key)
+            print(f"   {path:24} {docs_per_sec:>12,.0f} docs/sec  {peak_mb:8.1f} MB peak   {text}")
+        print()
+        del documents
+
+    if save:
+        save_baseline(results, baseline_path)
+        print(f"✅ Baseline saved: {baseline_path}")
+    elif regressions:
+        print(f"❌ Regressions: {', '.join(regressions)}")
+
+    return results, regressions
+
+def main(args=None):
+    """Run the suite from the command line; exits 1 on a regression"""
+    args = sys.argv[1:] if args is None else list(args)
+
+    def option(name, default=None):
+        if name in args:
+            position = args.index(name)
+            value = args[position + 1]
+            del args[position:position + 2]
+            return value
+        return default
+
+    sizes = option("--sizes", ",".join(DEFAULT_SIZES)).lower().split(",")
+    paths = option("--paths")
+    paths = paths.split(",") if paths else None
+    seed = int(option("--seed", 42))
+    baseline_path = Path(option("--baseline", BASELINE_PATH))
+    tolerance = float(option("--tolerance", THROUGHPUT_TOLERANCE))
+    save = "--save-baseline" in args
+    if save:
+        args.remove("--save-baseline")
+
+    unknown = [size for size in sizes if size not in SIZES] + [path for path in paths or [] if path not in HOT_PATHS]
+    if args or unknown:
+        print(__doc__)
+        print(f"   Sizes: {', '.join(SIZES)}; paths: {', '.join(HOT_PATHS)}")
+        sys.exit(1)
+
+    _, regressions = run_suite(sizes, paths, seed, baseline_path, save, tolerance)
+    if regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1288 @@
+#!/usr/bin/env python3
+"""
+Reddit Capital Rotation - Benchmarks
+Throughput checks for the analysis hot paths on a synthetic corpus (runs offline)
+
+Usage:
+    python3 scripts/benchmarks.py                  # run everything
+    python3 scripts/benchmarks.py ticker_matcher   # run selected benchmarks
+"""
+
+import json
+import random
+import re
+import sys
+import threading
+import time
+import urllib.request
+from collections import Counter
+from functools import lru_cache, partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from keyword_index import ThemeIndex
+from synthetic_corpus import DEFAULT_THEMES, DEFAULT_TICKERS, FILLER_WORDS, SyntheticCorpus
+from ticker_matcher import TickerMatcher
+
+ALL_TICKERS = [ticker for tier in DEFAULT_TICKERS.values() for ticker in tier]
+
+def synthetic_texts(n_docs, kind='search_results', seed=42):
+    """Texts of n_docs synthetic search results, or of posts (title and body); see SyntheticCorpus"""
+    corpus = SyntheticCorpus(seed)
+    if kind == 'posts':
+        return [f"{post['title']} {post['body']}" for post in corpus.iter_posts(n_docs)]
+    return [result['content'] for result in corpus.iter_search_results(n_docs)]
+
+def timed(func, *args):
+    """Run func once and return (result, seconds)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def print_throughput(label, n_docs, seconds, baseline_seconds=None):
+    """Print a single result line"""
+    line = f"   {label:32} {n_docs / seconds:>12,.0f} docs/sec  ({seconds:.3f}s)"
+    if baseline_seconds is not None:
+        line += f"  {baseline_seconds / seconds:5.1f}x"
+    print(line)
+
+def bench_ticker_matcher(n_docs=20000):
+    """Compiled ticker matcher vs. the original per-ticker regex loop"""
+
+    def regex_loop(docs):
+        # Original live_report_generator.extract_tickers_from_text
+        results = []
+        for text in docs:
+            found = []
+            text_upper = text.upper()
+            for ticker in ALL_TICKERS:
+                pattern = r'\b' + re.escape(ticker) + r'\b'
+                if re.search(pattern, text_upper):
+                    found.append(ticker)
+            results.append(found)
+        return results
+
+    def matcher_find(docs):
+        matcher = TickerMatcher(ALL_TICKERS)
+        return [matcher.find(text) for text in docs]
+
+    docs = synthetic_texts(n_docs)
+
+    print(f"📊 Ticker extraction ({n_docs:,} docs, {len(ALL_TICKERS)} tickers)")
+    expected, baseline = timed(regex_loop, docs)
+    print_throughput("per-ticker regex loop", n_docs, baseline)
+
+    found, seconds = timed(matcher_find, docs)
+    print_throughput("TickerMatcher.find", n_docs, seconds, baseline)
+
+    print()
+    if found != expected:
+        print("   ❌ Results differ from the regex loop!")
+        return False
+
+def synthetic_themes(n_themes, keywords_per_theme=5, seed=11):
+    """The default themes padded out with random themes up to n_themes"""
+    rng = random.Random(seed)
+    themes = dict(DEFAULT_THEMES)
+
+    while len(themes) < n_themes:
+        keywords = [
+            ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(5, 9)))
+            for _ in range(keywords_per_theme)
+        ]
+        themes[f"Theme {len(themes) + 1}"] = keywords
+
+    return themes
+
+def bench_themes(n_docs=20000):
+    """Compiled theme index vs. the original per-theme, per-keyword scan"""
+
+    def keyword_scan(docs, theme_keywords):
+        # Original extract_themes_from_results matching (lowercases per keyword)
+        return [
+            [theme_name for theme_name, keywords in theme_keywords.items()
+             if any(keyword.lower() in content.lower() for keyword in keywords)]
+            for content in docs
+        ]
+
+    def theme_index(docs, theme_keywords):
+        index = ThemeIndex(theme_keywords)
+        return [index.match(content) for content in docs]
+
+    docs = synthetic_texts(n_docs)
+
+    ok = True
+    for n_themes in (len(DEFAULT_THEMES), 120):
+        theme_keywords = synthetic_themes(n_themes)
+        print(f"📊 Theme matching ({n_docs:,} docs, {n_themes} themes)")
+
+        expected, baseline = timed(keyword_scan, docs, theme_keywords)
+        print_throughput("per-keyword scan", n_docs, baseline)
+
+        found, seconds = timed(theme_index, docs, theme_keywords)
+        print_throughput("ThemeIndex.match", n_docs, seconds, baseline)
+
+        if found != expected:
+            print("   ❌ Results differ from the keyword scan!")
+            ok = False
+        print()
+    return ok
+
+class FakeListingHandler(BaseHTTPRequestHandler):
+    """Serves /r/<subreddit>/new.json pages of synthetic posts with fixed latency"""
+
+    posts_per_subreddit = 500
+    post_interval = 600
+    latency = 0.05
+
+    # Newest posts not "published" yet, to simulate the listing at an earlier time
+    hidden = 0
+    base_time = time.time()
+    requests = 0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        subreddit = url.path.split('/')[2]
+        query = parse_qs(url.query)
+        start = max(int(query.get('after', ['0'])[0]), self.hidden)
+        limit = int(query.get('limit', ['100'])[0])
+
+        time.sleep(self.latency)
+        FakeListingHandler.requests += 1
+
+        end = min(start + limit, self.posts_per_subreddit)
+        children = []
+        for i in range(start, end):
+            rng = random.Random(f"{subreddit}-{i}")
+            children.append({
+                'id': f"{subreddit}{i}",
+                'title': ' '.join(rng.choice(FILLER_WORDS + ALL_TICKERS) for _ in range(8)),
+                'selftext': ' '.join(rng.choice(FILLER_WORDS + ALL_TICKERS) for _ in range(40)),
+                'created_utc': self.base_time - i * self.post_interval,
+                'score': rng.randint(0, 500),
+                'num_comments': rng.randint(0, 200),
+                'url': f"https://reddit.com/r/{subreddit}/{i}",
+            })
+
+        body = json.dumps({'children': children, 'after': end if end < self.posts_per_subreddit else None}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeSubreddit:
+    """Minimal stand-in for praw's Subreddit: lazily pages through the fake server"""
+
+    def __init__(self, base_url, name):
+        self.base_url = base_url
+        self.name = name
+
+    def new(self, limit=100):
+        after = 0
+        fetched = 0
+        while after is not None and fetched < limit:
+            url = f"{self.base_url}/r/{self.name}/new.json?after={after}&limit=100"
+            with urllib.request.urlopen(url) as response:
+                page = json.load(response)
+            for child in page['children']:
+                fetched += 1
+                yield SimpleNamespace(**child)
+            after = page['after']
+
+class FakeReddit:
+    """Minimal stand-in for praw.Reddit backed by the fake listing server"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def subreddit(self, name):
+        return FakeSubreddit(self.base_url, name)
+
+def fake_listing_server():
+    """Start the fake listing server on a free local port; returns (server, base_url)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeListingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def bench_collection():
+    """Concurrent subreddit collection vs. one subreddit at a time, against a local fake server"""
+    import reddit_monitor
+    from rate_limiter import TokenBucket
+
+    server, base_url = fake_listing_server()
+    subreddits = reddit_monitor.SUBREDDITS
+    pages = len(subreddits) * -(-FakeListingHandler.posts_per_subreddit // 100)
+
+    def sequential():
+        reddit = FakeReddit(base_url)
+        mentions = Counter()
+        for name in subreddits:
+            counts, _ = reddit_monitor.analyze_subreddit(reddit, name)
+            mentions.update(counts)
+        return mentions
+
+    def concurrent():
+        # Generous bucket so the fake server's latency, not the quota, is measured
+        limiter = TokenBucket(rate=500, capacity=50)
+        mentions, _ = reddit_monitor.collect_subreddits(
+            lambda: FakeReddit(base_url), subreddits, rate_limiter=limiter
+        )
+        return mentions
+
+    print(f"📊 Subreddit collection ({len(subreddits)} subreddits, {pages} pages, "
+          f"{FakeListingHandler.latency * 1000:.0f} ms/page)")
+    try:
+        expected, baseline = timed(sequential)
+        print(f"   {'one subreddit at a time':32} {baseline:8.3f}s")
+
+        mentions, seconds = timed(concurrent)
+        print(f"   {'collect_subreddits':32} {seconds:8.3f}s  {baseline / seconds:5.1f}x")
+
+    finally:
+        server.shutdown()
+    print()
+    if mentions != expected:
+        print("   ❌ Mention counts differ from sequential collection!")
+        return False
+
+class FakeRedditJSONHandler(BaseHTTPRequestHandler):
+    """
+    Serves Reddit-format /r/<subreddit>/new.json listings over keep-alive connections
+
+    Pages carry an ETag (If-None-Match gets a 304). Every throttle_every-th
+    request is refused with a 429 and Retry-After, every error_every-th with a 503.
+    Each new connection first waits `handshake` seconds, standing in for the TCP
+    and TLS round trips a real HTTPS connection to Reddit costs before its first request.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; with Nagle on, keep-alive stalls on delayed ACKs
+    disable_nagle_algorithm = True
+    posts_per_subreddit = 1000
+    latency = 0.002
+    handshake = 0.0
+    throttle_every = 0
+    error_every = 0
+    retry_after = '0.01'
+    requests = 0
+    connections = set()
+    lock = threading.Lock()
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def page(subreddit, start, limit):
+        """(body, etag) of one listing page"""
+        end = min(start + limit, FakeRedditJSONHandler.posts_per_subreddit)
+        children = []
+        for i in range(start, end):
+            rng = random.Random(f"{subreddit}-{i}")
+            children.append({'kind': 't3', 'data': {
+                'id': f"{subreddit}{i}",
+                'name': f"t3_{subreddit}{i}",
+                'title': ' '.join(rng.choice(FILLER_WORDS + ALL_TICKERS) for _ in range(8)),
+                'selftext': ' '.join(rng.choice(FILLER_WORDS + ALL_TICKERS) for _ in range(40)),
+                'subreddit': subreddit,
+                'created_utc': 1767225600 - i * 600,
+                'score': rng.randint(0, 500),
+                'num_comments': rng.randint(0, 200),
+                'url': f"https://reddit.com/r/{subreddit}/{i}",
+            }})
+        after = f"t3_{subreddit}{end}" if end < FakeRedditJSONHandler.posts_per_subreddit else None
+        body = json.dumps({'kind': 'Listing', 'data': {'children': children, 'after': after}}).encode()
+        return body, f'"{hash(body) & 0xffffffff:08x}"'
+
+    def setup(self):
+        super().setup()
+        time.sleep(self.handshake)
+
+    def do_GET(self):
+        with self.lock:
+            FakeRedditJSONHandler.requests += 1
+            number = FakeRedditJSONHandler.requests
+            FakeRedditJSONHandler.connections.add(self.client_address)
+        time.sleep(self.latency)
+
+        if self.throttle_every and number % self.throttle_every == 0:
+            return self.reply(429, b'{}', {'Retry-After': self.retry_after})
+        if self.error_every and number % self.error_every == 0:
+            return self.reply(503, b'{}')
+
+        url = urlparse(self.path)
+        subreddit = url.path.split('/')[2]
+        query = parse_qs(url.query)
+        after = query.get('after', [f"t3_{subreddit}0"])[0]
+        body, etag = self.page(subreddit, int(after[len(f"t3_{subreddit}"):]), int(query.get('limit', ['100'])[0]))
+
+        if self.headers.get('If-None-Match') == etag:
+            return self.reply(304, b'', {'ETag': etag})
+        self.reply(200, body, {'ETag': etag, 'Content-Type': 'application/json'})
+
+    def reply(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def bench_http_client(subreddits=('wallstreetbets', 'stocks', 'investing', 'stockmarket'), rounds=3,
+                      handshake=0.01):
+    """
+    Pooled HttpClient vs. a connection per request, 304 savings, and recovery from 429/503s
+
+    Loopback connections are nearly free, so the stand-in server charges each new
+    connection `handshake` seconds (a TLS handshake to Reddit takes several times this).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from http_client import HttpClient, iter_listing
+    from live_reddit_monitor import fetch_posts
+
+    handler = FakeRedditJSONHandler
+    handler.handshake = handshake
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    names = list(subreddits) * rounds
+
+    def urllib_listing(subreddit):
+        # A new connection per request, as with plain urllib.request
+        posts, after = [], None
+        while True:
+            query = "limit=100&raw_json=1" + (f"&after={after}" if after else "")
+            with urllib.request.urlopen(f"{base_url}/r/{subreddit}/new.json?{query}") as response:
+                listing = json.load(response)['data']
+            posts.extend(child['data']['id'] for child in listing['children'])
+            after = listing['after']
+            if not after:
+                return posts
+
+    def client_listing(client, subreddit):
+        return [post['id'] for post in iter_listing(client, subreddit)]
+
+    def run(fetch):
+        handler.requests, handler.connections = 0, set()
+        with ThreadPoolExecutor(max_workers=len(subreddits)) as executor:
+            result, seconds = timed(lambda: list(executor.map(fetch, names)))
+        return result, seconds, handler.requests, len(handler.connections)
+
+    pages = len(names) * -(-handler.posts_per_subreddit // 100)
+    print(f"📊 HTTP client ({pages} listing pages, {len(subreddits)} concurrent subreddits, "
+          f"{handler.latency * 1000:.0f} ms/page, {handshake * 1000:.0f} ms per new connection)")
+    ok = True
+    try:
+        expected, baseline, requests, connections = run(urllib_listing)
+        print(f"   {'connection per request':32} {requests / baseline:8.0f} req/s  ({connections} connections)")
+
+        with HttpClient(base_url, conditional=False) as client:
+            found, seconds, requests, connections = run(partial(client_listing, client))
+        print(f"   {'pooled HttpClient':32} {requests / seconds:8.0f} req/s  ({connections} connections)  "
+              f"{baseline / seconds:5.1f}x")
+        ok &= found == expected
+        faster = seconds < baseline
+
+        with HttpClient(base_url) as client:
+            run(partial(client_listing, client))
+            client.reset_stats()
+            found, seconds, requests, _ = run(partial(client_listing, client))
+            print(f"   {'conditional (unchanged pages)':32} {requests / seconds:8.0f} req/s  "
+                  f"{client.stats['not_modified']} x 304, {client.stats['bytes_saved'] / 1024:,.0f} KB saved "
+                  f"of {(client.stats['bytes_saved'] + client.stats['bytes_received']) / 1024:,.0f} KB")
+            ok &= found == expected and client.stats['not_modified'] == requests
+
+        handler.throttle_every, handler.error_every = 7, 11
+        with HttpClient(base_url, backoff_base=0.01) as client:
+            import io
+            from contextlib import redirect_stdout
+            with redirect_stdout(io.StringIO()):
+                posts, seconds = timed(fetch_posts, subreddits, 1000, client)
+            stats = client.stats
+            print(f"   {'with 429 / 503 injected':32} {stats['requests'] / seconds:8.0f} req/s  "
+                  f"{stats['retries']} retries, {stats['failures']} failed, {len(posts):,} posts")
+            ok &= [post['id'] for post in posts] == [i for ids in expected[:len(subreddits)] for i in ids]
+    finally:
+        handler.throttle_every = handler.error_every = 0
+        handler.handshake = 0.0
+        server.shutdown()
+
+    if not ok:
+        print("   ❌ Fetched posts differ from the plain urllib fetch!")
+    if not faster:
+        print("   ❌ The pooled client is slower than a connection per request!")
+    print()
+    return ok and faster
+
+def bench_response_cache(subreddits=('wallstreetbets', 'stocks', 'investing', 'stockmarket'),
+                         n_entries=5000, entry_kb=40):
+    """Repeat listing fetch through the on-disk response cache, and LRU get/put cost at its size cap"""
+    import io
+    import tempfile
+    from contextlib import redirect_stdout
+    from http_client import HttpClient
+    from live_reddit_monitor import fetch_posts
+    from response_cache import ResponseCache
+
+    handler = FakeRedditJSONHandler
+    handler.latency = 0.02
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"📊 Response cache ({len(subreddits)} subreddits x 10 listing pages, "
+          f"{handler.latency * 1000:.0f} ms/page; {n_entries:,} x {entry_kb} KB entries)")
+    ok = True
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            runs = []
+            for label in ('first run (empty cache)', 'rerun within the TTL'):
+                # A new cache and client per run, as in separate processes
+                with HttpClient(base_url, cache=ResponseCache(tmp)) as client:
+                    handler.requests = 0
+                    with redirect_stdout(io.StringIO()):
+                        posts, seconds = timed(fetch_posts, subreddits, 1000, client)
+                    runs.append(posts)
+                    cache = client.cache
+                    print(f"   {label:32} {seconds * 1000:8.1f} ms  {handler.requests:3} requests, "
+                          f"hit rate {cache.hit_rate():4.0%}, ~{cache.saved_seconds * 1000:.0f} ms saved")
+            ok &= runs[0] == runs[1] and handler.requests == 0
+
+        with tempfile.TemporaryDirectory() as tmp:
+            # Cap at half the entries, so the second half of the puts each evict one
+            cache = ResponseCache(tmp, max_bytes=n_entries * entry_kb * 1024 // 2)
+            payload = b'x' * (entry_kb * 1024)
+            _, put = timed(lambda: [cache.put('listing', f"/r/s/new.json?after={i}", payload)
+                                    for i in range(n_entries)])
+            keys = [f"/r/s/new.json?after={i}" for i in range(n_entries)]
+            _, get = timed(lambda: [cache.get('listing', key) for key in keys])
+            print(f"   {'put (with LRU eviction)':32} {put / n_entries * 1e6:8.0f} us/entry  "
+                  f"{cache.evicted:,} evicted, {cache.nbytes / 1024 / 1024:.0f} MB kept")
+            print(f"   {'get (half evicted)':32} {get / n_entries * 1e6:8.0f} us/entry  "
+                  f"hit rate {cache.hit_rate():.0%}")
+            ok &= cache.nbytes <= cache.max_bytes and cache.hits == len(cache)
+    finally:
+        server.shutdown()
+        handler.latency = 0.002
+
+    if not ok:
+        print("   ❌ Cached fetch differs from the first run, or the cache exceeded its cap!")
+    print()
+    return ok
+
+def bench_incremental(cadence_days=3):
+    """Incremental fetch from high-water marks vs. re-walking the lookback window"""
+    import tempfile
+    import reddit_monitor
+    from rate_limiter import TokenBucket
+
+    # A busy subreddit: 1000 posts per 7-day window
+    FakeListingHandler.posts_per_subreddit = 1000
+    FakeListingHandler.post_interval = 7 * 86400 // 1000
+    new_posts = int(cadence_days * 86400) // FakeListingHandler.post_interval
+
+    server, base_url = fake_listing_server()
+    subreddits = reddit_monitor.SUBREDDITS
+
+    def collect(checkpoint_file=None):
+        limiter = TokenBucket(rate=500, capacity=50)
+        FakeListingHandler.requests = 0
+        mentions, _ = reddit_monitor.collect_subreddits(
+            lambda: FakeReddit(base_url), subreddits, rate_limiter=limiter,
+            checkpoint_file=checkpoint_file
+        )
+        return mentions, FakeListingHandler.requests
+
+    print(f"📊 Incremental fetching ({len(subreddits)} subreddits, {new_posts} new posts each "
+          f"since the last run {cadence_days} days ago)")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint_file = Path(tmp) / 'checkpoints.json'
+
+            # Previous run, before the newest posts existed
+            FakeListingHandler.hidden = new_posts
+            collect(checkpoint_file)
+            FakeListingHandler.hidden = 0
+
+            (_, full_requests), baseline = timed(collect)
+            print(f"   {'full lookback re-fetch':32} {baseline:8.3f}s  {full_requests:4} requests")
+
+            (_, requests), seconds = timed(collect, checkpoint_file)
+            print(f"   {'incremental from checkpoint':32} {seconds:8.3f}s  {requests:4} requests"
+                  f"  {baseline / seconds:5.1f}x")
+    finally:
+        server.shutdown()
+        FakeListingHandler.posts_per_subreddit = 500
+        FakeListingHandler.post_interval = 600
+    print()
+
+def fake_comment_forest(rng, remaining, depth=0, per_level=10):
+    """
+    Build one "page" of a fake comment forest: up to per_level comments with nested
+    replies, plus a MoreComments stub standing in for the rest
+    """
+    import praw
+
+    class FakeMoreComments(praw.models.MoreComments):
+        def __init__(self, rng, remaining, depth):
+            self._rng, self._remaining, self._depth = rng, remaining, depth
+
+        def comments(self, update=True):
+            return fake_comment_forest(self._rng, self._remaining, self._depth)
+
+    forest = []
+    while remaining > 0 and len(forest) < per_level:
+        reply_count = min(remaining - 1, rng.randint(0, 6)) if depth < 4 else 0
+        remaining -= 1 + reply_count
+        forest.append(SimpleNamespace(
+            body=' '.join(rng.choice(FILLER_WORDS + ALL_TICKERS) for _ in range(30)),
+            created_utc=time.time() - rng.randint(0, 86400),
+            replies=fake_comment_forest(rng, reply_count, depth + 1, per_level=3),
+        ))
+
+    if remaining > 0:
+        forest.append(FakeMoreComments(rng, remaining, depth))
+    return forest
+
+class FakeCommentReddit:
+    """praw.Reddit stand-in whose submissions carry generated comment trees"""
+
+    def __init__(self, comment_counts):
+        self.comment_counts = comment_counts
+
+    def submission(self, id):
+        rng = random.Random(id)
+        return SimpleNamespace(comments=fake_comment_forest(rng, self.comment_counts[id]))
+
+def bench_comments(n_posts=200, api_budget=400, replace_more_limit=8):
+    """Streaming BFS comment ingestion: throughput, peak memory and budget allocation"""
+    import tracemalloc
+    import praw
+    import reddit_monitor
+
+    rng = random.Random(3)
+    comment_counts = {f"post{i}": int(rng.paretovariate(1.2) * 40) for i in range(n_posts)}
+    candidates = [(count, post_id) for post_id, count in comment_counts.items()]
+    reddit = FakeCommentReddit(comment_counts)
+
+    def materialize_everything():
+        # Naive approach: load every tree fully, then scan
+        tracemalloc.start()
+        trees = []
+        for post_id in comment_counts:
+            queue = list(reddit.submission(post_id).comments)
+            comments = []
+            while queue:
+                item = queue.pop()
+                if isinstance(item, praw.models.MoreComments):
+                    queue.extend(item.comments())
+                else:
+                    comments.append(item)
+                    queue.extend(item.replies)
+            trees.append(comments)
+        mentions = Counter(t for comments in trees for c in comments for t in reddit_monitor.extract_tickers(c.body))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return mentions, peak
+
+    print(f"📊 Comment ingestion ({n_posts} posts, {sum(comment_counts.values()):,} comments, "
+          f"budget {api_budget} requests, replace_more {replace_more_limit}/post)")
+
+    (_, naive_peak), naive_seconds = timed(materialize_everything)
+    print(f"   {'materialize all trees':32} {naive_seconds:8.3f}s  peak {naive_peak / 1024 / 1024:6.1f} MB")
+
+    _, stats = reddit_monitor.ingest_comments(
+        reddit, candidates, api_budget, replace_more_limit, track_memory=True
+    )
+    print(f"   {'ingest_comments (streaming)':32} {stats['seconds']:8.3f}s  peak {stats['peak_memory_mb']:6.1f} MB"
+          f"  {stats['comments']:,} comments  {stats['comments_per_sec']:,.0f} comments/sec"
+          f"  {stats['api_requests']} requests")
+    print()
+
+def bench_history(years=5, n_tickers=10000, csv_tickers=1000, cadence_days=3):
+    """Partitioned Parquet history vs. the original whole-file CSV scan"""
+    import csv
+    import tempfile
+    from datetime import date, timedelta
+    from history_store import TickerHistoryStore
+
+    def snapshots(tickers):
+        rng = random.Random(5)
+        day = date.today() - timedelta(days=365 * years)
+        while day <= date.today():
+            yield day.isoformat(), {
+                ticker: {'mentions': rng.randint(0, 50), 'tier': 'Tier 2',
+                         'theme': 'Multiple', 'sentiment': 'neutral'}
+                for ticker in tickers
+            }
+            day += timedelta(days=cadence_days)
+
+    def csv_load_previous_data(history_file):
+        # Original live_report_generator.load_previous_data
+        previous_data = {}
+        with open(history_file, 'r') as f:
+            rows = list(csv.DictReader(f))
+            recent_date = max(row['date'] for row in rows)
+            for row in rows:
+                if row['date'] == recent_date:
+                    previous_data[row['ticker']] = {
+                        'mentions': int(row['mentions']) if row['mentions'] else 0,
+                        'theme': row['theme'],
+                        'sentiment': row['sentiment']
+                    }
+        return previous_data
+
+    n_snapshots = len(range(0, 365 * years + 1, cadence_days))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The CSV baseline holds every row in memory, so it runs on a smaller universe
+        history_file = Path(tmp) / 'ticker_history.csv'
+        csv_universe = [f"T{i:05d}" for i in range(csv_tickers)]
+        with open(history_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['date', 'ticker', 'mentions', 'tier', 'theme', 'sentiment'])
+            for day, ticker_data in snapshots(csv_universe):
+                for ticker, data in ticker_data.items():
+                    writer.writerow([day, ticker, data['mentions'], data['tier'], data['theme'], data['sentiment']])
+
+        print(f"📊 Ticker history ({years} years, {n_snapshots} snapshots every {cadence_days} days)")
+        _, seconds = timed(csv_load_previous_data, history_file)
+        print(f"   {f'CSV latest snapshot ({csv_tickers:,} tickers)':40} {seconds * 1000:10.1f} ms"
+              f"  ({history_file.stat().st_size / 1024 / 1024:.0f} MB file)")
+
+        store = TickerHistoryStore(Path(tmp) / 'ticker_history')
+        universe = [f"T{i:05d}" for i in range(n_tickers)]
+        _, build_seconds = timed(lambda: [store.append_snapshot(data, day) for day, data in snapshots(universe)])
+
+        for label, runs_ago in ((f"Parquet latest ({n_tickers:,} tickers)", 0),
+                                (f"Parquet 10 runs ago ({n_tickers:,} tickers)", 10)):
+            (_, snapshot), seconds = timed(store.latest_snapshot, runs_ago)
+            print(f"   {label:40} {seconds * 1000:10.1f} ms  ({len(snapshot):,} rows read)")
+
+        _, seconds = timed(store.read_history, (date.today() - timedelta(days=90)).isoformat())
+        print(f"   {'Parquet 90-day range':40} {seconds * 1000:10.1f} ms")
+        print(f"   (store built in {build_seconds:.1f}s)")
+    print()
+
+def bench_theme_log(n_snapshots=2000, n_themes=20):
+    """Append-only theme log vs. rewriting the whole theme_evolution.json every run"""
+    import tempfile
+    from datetime import date, timedelta
+    from theme_log import ThemeEvolutionLog
+
+    rng = random.Random(9)
+    first_day = date(2020, 1, 1)
+
+    def snapshot():
+        return {
+            f"Theme {i}": {
+                'mentions': rng.randint(0, 40),
+                'tickers': set(rng.sample(ALL_TICKERS, 4)),
+                'sentiment': [rng.choice(['positive', 'neutral', 'negative']) for _ in range(40)],
+            }
+            for i in range(n_themes)
+        }
+
+    def json_rewrite(path, themes_data, day):
+        # Original save_theme_evolution
+        history = json.loads(path.read_text()) if path.exists() else []
+        history.append({'date': day, 'themes': {name: {
+            'mentions': data['mentions'], 'tickers': list(data['tickers']), 'sentiment': data['sentiment']
+        } for name, data in themes_data.items()}})
+        path.write_text(json.dumps(history, indent=2))
+
+    themes_data = snapshot()
+    print(f"📊 Theme evolution ({n_snapshots:,} snapshots of {n_themes} themes)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / 'theme_evolution.json'
+        history = [{'date': (first_day + timedelta(days=i)).isoformat(), 'themes': {
+            name: {'mentions': d['mentions'], 'tickers': list(d['tickers']), 'sentiment': d['sentiment']}
+            for name, d in themes_data.items()}} for i in range(n_snapshots)]
+        json_path.write_text(json.dumps(history, indent=2))
+        next_day = (first_day + timedelta(days=n_snapshots)).isoformat()
+
+        _, seconds = timed(json_rewrite, json_path, themes_data, next_day)
+        print(f"   {'JSON rewrite (append 1)':32} {seconds * 1000:10.1f} ms"
+              f"  ({json_path.stat().st_size / 1024 / 1024:.1f} MB)")
+
+        for compress in (False, True):
+            log = ThemeEvolutionLog(Path(tmp) / ('theme.ndjson.gz' if compress else 'theme.ndjson'))
+            for i in range(n_snapshots):
+                log.append(themes_data, date=(first_day + timedelta(days=i)).isoformat())
+
+            label = 'gzip' if compress else 'plain'
+            _, seconds = timed(log.append, themes_data, next_day)
+            print(f"   {f'NDJSON {label} (append 1)':32} {seconds * 1000:10.1f} ms"
+                  f"  ({log.path.stat().st_size / 1024 / 1024:.1f} MB)")
+
+            start = (first_day + timedelta(days=n_snapshots - 30)).isoformat()
+            records, seconds = timed(lambda: list(log.read(start)))
+            print(f"   {f'NDJSON {label} (last 30 days)':32} {seconds * 1000:10.1f} ms  ({len(records)} records)")
+    print()
+
+def bench_momentum(n_tickers=5000, n_days=365):
+    """Ring-buffer baselines vs. recomputing 7/30/90-day means from the raw history"""
+    import numpy as np
+    from datetime import date, timedelta
+    from momentum import MomentumEngine
+
+    rng = np.random.default_rng(3)
+    tickers = [f"T{i:05d}" for i in range(n_tickers)]
+    history = rng.poisson(4, size=(n_days, n_tickers))
+    days = [(date(2025, 1, 1) + timedelta(days=i)).isoformat() for i in range(n_days)]
+
+    engine = MomentumEngine(tickers)
+    for day, row in zip(days[:-1], history[:-1]):
+        engine.record_day(day, dict(zip(tickers, row)))
+
+    def rebuild(window):
+        # Recompute from the raw daily history, as a baseline-less system would
+        return history[-window - 1:-1].mean(axis=0)
+
+    today = dict(zip(tickers, history[-1]))
+    print(f"📊 Momentum baselines ({n_tickers:,} tickers, {n_days} days of history)")
+
+    _, seconds = timed(engine.record_day, days[-1], today)
+    print(f"   {'Ring buffer: record 1 day':36} {seconds * 1000:10.2f} ms")
+
+    for window in engine.windows:
+        (_, _, baseline, _), engine_seconds = timed(engine.momentum, window)
+        expected, rebuild_seconds = timed(rebuild, window)
+        assert np.allclose(baseline, expected)
+        print(f"   {f'{window}-day momentum (all tickers)':36} {engine_seconds * 1000:10.2f} ms"
+              f"  (rebuild from history {rebuild_seconds * 1000:.2f} ms)")
+    print()
+
+def bench_anomaly(n_tickers=10000, n_subreddits=200, n_days=90):
+    """Anomaly scoring over a full tickers x subreddits x days matrix (target: < 1 s)"""
+    import numpy as np
+    from anomaly import score_anomalies
+
+    rng = np.random.default_rng(8)
+    rates = rng.gamma(0.3, 2.0, size=(n_tickers, n_subreddits, 1))
+    counts = rng.poisson(rates, size=(n_tickers, n_subreddits, n_days)).astype(np.uint16)
+
+    # Plant one single-subreddit spike and one broad surge
+    counts[5, 3, -1] += 40
+    counts[77, :, -1] += 3
+
+    tickers = [f"T{i:05d}" for i in range(n_tickers)]
+    subreddits = [f"sub{i}" for i in range(n_subreddits)]
+
+    print(f"📊 Anomaly scoring ({n_tickers:,} tickers x {n_subreddits} subreddits x {n_days} days, "
+          f"{counts.nbytes / 1024 / 1024:.0f} MB)")
+    alerts, seconds = timed(score_anomalies, counts, tickers, subreddits)
+    print(f"   {'score_anomalies':36} {seconds * 1000:10.1f} ms  ({len(alerts)} alerts)")
+
+    planted = [(alert.ticker, alert.subreddit) for alert in alerts[:2]]
+    print(f"   Planted spikes ranked first: {planted == [('T00077', None), ('T00005', 'sub3')]}")
+    print()
+
+def bench_daemon(cycles=5):
+    """Warm daemon cycles vs. a cold process per run, against the fake listing server"""
+    import subprocess
+    import tempfile
+    import reddit_monitor
+    from monitor_daemon import MonitorDaemon
+    from rate_limiter import TokenBucket
+
+    FakeListingHandler.latency = 0.005
+    server, base_url = fake_listing_server()
+
+    cold_run = f"""
+import sys; sys.path.insert(0, {str(Path(__file__).parent)!r})
+import reddit_monitor
+from benchmarks import FakeReddit
+from rate_limiter import TokenBucket
+checkpoint_file, state_file = sys.argv[1:3]
+reddit_monitor.collect_subreddits(lambda: FakeReddit({base_url!r}), rate_limiter=TokenBucket(500, 50),
+                                  checkpoint_file=checkpoint_file)
+reddit_monitor.update_momentum(checkpoint_file, state_file)
+reddit_monitor.detect_anomalies(checkpoint_file)
+"""
+
+    print(f"📊 Monitor daemon ({len(reddit_monitor.SUBREDDITS)} subreddits, no new posts between cycles)")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint_file, state_file = Path(tmp) / 'checkpoints.json', Path(tmp) / 'momentum.npz'
+            subprocess.run([sys.executable, '-c', cold_run, checkpoint_file, state_file], check=True)
+
+            _, cold = timed(subprocess.run, [sys.executable, '-c', cold_run, checkpoint_file, state_file])
+            print(f"   {'cold process per run':32} {cold * 1000:10.1f} ms")
+
+            daemon = MonitorDaemon(
+                lambda: FakeReddit(base_url), reddit_monitor.SUBREDDITS, checkpoint_every=cycles + 1,
+                checkpoint_file=checkpoint_file, momentum_file=state_file,
+                report_file=Path(tmp) / 'report.txt'
+            )
+            daemon.rate_limiter = TokenBucket(500, 50)
+            daemon.print_cycle = lambda timings: None
+
+            timings = [daemon.run_cycle() for _ in range(cycles)]
+            collect = sum(t['collect'] for t in timings) / cycles
+            analysis = sum(t['analysis'] for t in timings) / cycles
+            print(f"   {'warm cycle (collect)':32} {collect * 1000:10.1f} ms")
+            print(f"   {'warm cycle (analysis)':32} {analysis * 1000:10.1f} ms")
+    finally:
+        server.shutdown()
+        FakeListingHandler.latency = 0.05
+    print()
+
+def bench_post_archive(n_days=90, posts_per_day=2000):
+    """Segmented post archive vs. one pretty-printed JSON file, and time-range reads"""
+    import gzip
+    import tempfile
+    from datetime import datetime, timedelta, timezone
+    from post_archive import PostArchive
+
+    docs = synthetic_texts(posts_per_day, 'posts')
+    first_day = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def day_posts(day):
+        created = (first_day + timedelta(days=day)).timestamp()
+        return [{
+            'id': f"t3_{day}_{i}", 'title': doc[:80], 'body': doc, 'subreddit': 'stocks',
+            'score': i % 500, 'url': f"https://reddit.com/r/stocks/{day}_{i}", 'created_utc': created + i,
+        } for i, doc in enumerate(docs)]
+
+    print(f"📊 Post archive ({n_days} days x {posts_per_day:,} posts)")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PostArchive(Path(tmp) / 'post_archive')
+        all_posts = []
+        append_seconds = 0.0
+        for day in range(n_days):
+            posts = day_posts(day)
+            all_posts.extend(posts)
+            _, seconds = timed(archive.append, posts, first_day + timedelta(days=day, hours=23))
+            append_seconds += seconds
+
+        json_path = Path(tmp) / 'latest_posts.json'
+        json_path.write_text(json.dumps(all_posts, indent=2))
+        stats = archive.stats()
+        print(f"   {'pretty JSON (all days)':32} {json_path.stat().st_size / 1024 / 1024:10.1f} MB")
+        print(f"   {'archive':32} {stats['bytes'] / 1024 / 1024:10.1f} MB  ({stats['segments']} segments, "
+              f"append {append_seconds / n_days * 1000:.1f} ms/day)")
+
+        start = first_day + timedelta(days=n_days - 7)
+        posts, seconds = timed(lambda: list(archive.read(start)))
+        print(f"   {'read last 7 days (index)':32} {seconds * 1000:10.1f} ms  ({len(posts):,} posts)")
+
+        def scan_all():
+            found = []
+            for name in archive.segments():
+                with gzip.open(archive.root / name, 'rt') as f:
+                    found.extend(post for post in map(json.loads, f) if post['created_utc'] >= start.timestamp())
+            return found
+
+        posts, seconds = timed(scan_all)
+        print(f"   {'read last 7 days (full scan)':32} {seconds * 1000:10.1f} ms  ({len(posts):,} posts)")
+
+        _, seconds = timed(archive.get, f"t3_{n_days // 2}_17")
+        print(f"   {'lookup one post by id':32} {seconds * 1000:10.1f} ms")
+    print()
+
+def bench_replay(n_days=20, posts_per_day=3000):
+    """Replay of archived posts: one process vs. a process pool (results must be identical)"""
+    import os
+    import tempfile
+    from datetime import datetime, timedelta, timezone
+    from post_archive import PostArchive
+    from replay import replay
+
+    docs = synthetic_texts(posts_per_day, 'posts')
+    first_day = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    last_day = (first_day + timedelta(days=n_days - 1)).strftime("%Y-%m-%d")
+    workers = os.cpu_count() or 1
+
+    print(f"📊 Replay ({n_days} days x {posts_per_day:,} posts, {workers} CPUs)")
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PostArchive(Path(tmp) / 'post_archive')
+        for day in range(n_days):
+            created = (first_day + timedelta(days=day)).timestamp()
+            archive.append([
+                {'id': f"{day}_{i}", 'title': doc[:80], 'body': doc, 'created_utc': created + i}
+                for i, doc in enumerate(docs)
+            ], first_day + timedelta(days=day))
+
+        serial, serial_seconds = timed(replay, archive.root, "2026-01-01", last_day, None, None, 1)
+        total = n_days * posts_per_day
+        print(f"   {'1 worker':32} {serial_seconds * 1000:10.1f} ms  ({total / serial_seconds:,.0f} posts/s)")
+
+        for count in sorted({2, workers} - {1}):
+            parallel, seconds = timed(replay, archive.root, "2026-01-01", last_day, None, None, count)
+            print(f"   {f'{count} workers':32} {seconds * 1000:10.1f} ms  ({total / seconds:,.0f} posts/s, "
+                  f"{serial_seconds / seconds:.1f}x)")
+            if parallel != serial:
+                print("   ❌ parallel results differ from the serial replay")
+                return False
+    print()
+
+def bench_seen_posts(n_posts=5000, scans=3, overlap=0.8, crosspost_rate=0.1):
+    """Seen-post Bloom filter: overlapping scans with crossposts, with and without dedup"""
+    from live_reddit_monitor import analyze_posts
+    from seen_posts import ScalableBloomFilter, SeenPosts
+
+    docs = synthetic_texts(n_posts, 'posts')
+    step = int(n_posts * (1 - overlap))
+
+    def scan(number):
+        # Each scan shares `overlap` of its posts with the previous one
+        posts = []
+        for i in range(number * step, number * step + n_posts):
+            post = {'id': f"p{i}", 'title': docs[i % n_posts][:80], 'body': docs[i % n_posts]}
+            if random.Random(i).random() < crosspost_rate:
+                post['crosspost_parent'] = f"t3_p{max(0, i - 7)}"
+            posts.append(post)
+        return posts
+
+    all_scans = [scan(number) for number in range(scans)]
+    print(f"📊 Seen-post filter ({scans} scans x {n_posts:,} posts, {overlap:.0%} overlap, "
+          f"{crosspost_rate:.0%} crossposts)")
+
+    def run(seen):
+        mentions = Counter()
+        for posts in all_scans:
+            mentions.update(analyze_posts(posts, seen)[0])
+        return mentions
+
+    mentions, seconds = timed(run, None)
+    print(f"   {'no dedup':32} {seconds * 1000:10.1f} ms  ({sum(mentions.values()):,} mentions)")
+
+    seen = SeenPosts()
+    mentions, seconds = timed(run, seen)
+    print(f"   {'Bloom filter':32} {seconds * 1000:10.1f} ms  ({sum(mentions.values()):,} mentions)")
+    print(f"   {seen.summary()}")
+
+    bloom = ScalableBloomFilter(capacity=1000)
+    for i in range(100000):
+        bloom.add(f"t3_{i}")
+    false_positives = sum(f"t3_unseen{i}" in bloom for i in range(100000))
+    print(f"   {'false positives (100k unseen)':32} {false_positives / 100000:10.4%}  "
+          f"(target {bloom.error_rate:.2%}, {bloom.nbytes / 1024:.0f} KB)")
+
+    ok = false_positives / 100000 <= bloom.error_rate
+    if not ok:
+        print("   ❌ False-positive rate above the target!")
+    print()
+    return ok
+
+def syndicated_corpus(n_docs, duplicate_rate=0.3, words_per_doc=40, seed=7):
+    """
+    Documents where duplicate_rate of them are edited copies of another one
+
+    A copy has one word replaced and, half the time, a source line appended
+    (like syndicated articles and copy-pasted pump posts). Returns (texts,
+    origin), origin[i] being the document i was copied from (itself for originals).
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array(FILLER_WORDS + ALL_TICKERS + [f"word{i}" for i in range(5000)])
+    words = rng.integers(0, len(vocabulary), size=(n_docs, words_per_doc))
+
+    origin = np.arange(n_docs)
+    copies = np.flatnonzero(rng.random(n_docs) < duplicate_rate)
+    copies = copies[copies > 0]
+    origin[copies] = rng.integers(0, copies, size=len(copies))
+    # Copies of copies point at the first original
+    while np.any(origin[origin] != origin):
+        origin = origin[origin]
+
+    words[copies] = words[origin[copies]]
+    words[copies, rng.integers(0, words_per_doc, size=len(copies))] = rng.integers(0, len(vocabulary), size=len(copies))
+    tagged = set(copies[rng.random(len(copies)) < 0.5].tolist())
+
+    texts = [
+        " ".join(row) + (" - via Yahoo Finance" if i in tagged else "")
+        for i, row in enumerate(vocabulary[words].tolist())
+    ]
+    return texts, origin
+
+def bench_near_duplicates(n_docs=1000000, duplicate_rate=0.3, naive_sample=2000):
+    """MinHash LSH clustering of near-duplicates: throughput, memory and accuracy against the known copies"""
+    import tracemalloc
+    import numpy as np
+    from near_duplicates import cluster_near_duplicates
+
+    texts, origin = syndicated_corpus(n_docs, duplicate_rate)
+    expected = len(np.unique(origin))
+    print(f"📊 Near-duplicate clustering ({n_docs:,} docs, {n_docs - expected:,} edited copies)")
+
+    clusters, seconds = timed(cluster_near_duplicates, texts)
+    print_throughput("MinHash LSH", n_docs, seconds)
+
+    sample_docs = max(1, n_docs // 10)
+    tracemalloc.start()
+    cluster_near_duplicates(texts[:sample_docs])
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"   {f'peak memory ({sample_docs:,} docs)':32} {peak / 1024 / 1024:10.1f} MB")
+
+    # Naive pairwise Jaccard on a sample, extrapolated to n_docs
+    sample = [set(zip(words, words[1:], words[2:])) for words in (text.lower().split() for text in texts[:naive_sample])]
+    start = time.perf_counter()
+    for i, first in enumerate(sample):
+        for second in sample[i + 1:]:
+            len(first & second) / len(first | second)
+    pairs = naive_sample * (naive_sample - 1) / 2
+    naive_seconds = (time.perf_counter() - start) / pairs * n_docs * (n_docs - 1) / 2
+    print(f"   {'naive pairwise (extrapolated)':32} {naive_seconds:10,.0f} s  ({naive_seconds / seconds:,.0f}x slower)")
+
+    # A copy is found when it shares its original's cluster; a false merge joins two originals
+    labels = clusters.labels
+    copied = origin != np.arange(n_docs)
+    recall = np.mean(labels[copied] == labels[origin[copied]]) if copied.any() else 1.0
+    originals = np.flatnonzero(~copied)
+    false_merges = len(originals) - len(np.unique(labels[originals]))
+    stats = clusters.stats()
+    print(f"   {'clusters':32} {stats['clusters']:10,}  (expected {expected:,}, largest {stats['largest']})")
+    print(f"   {'copies found':32} {recall:10.2%}")
+    print(f"   {'originals merged by mistake':32} {false_merges:10,}")
+    print()
+
+    if recall < 0.95 or false_merges > len(originals) * 0.001:
+        print("   ❌ near-duplicate clustering below the accuracy budget")
+        return False
+
+def bench_parallel_analysis(n_posts=200000, chunk_posts=5000):
+    """Post analysis in a process pool vs. one process (the report must be identical)"""
+    import os
+    import pickle
+    import live_reddit_monitor as monitor
+    from report_renderer import render_to_string
+
+    docs = synthetic_texts(5000, 'posts')
+    rng = random.Random(5)
+    posts = [
+        {'id': f"p{i}", 'title': f"{i} {docs[i % len(docs)][:80]}", 'body': f"{docs[(i * 7) % len(docs)]} {i}",
+         'subreddit': rng.choice(monitor.SUBREDDITS), 'score': rng.randrange(500), 'url': f"https://reddit.com/p{i}"}
+        for i in range(n_posts)
+    ]
+    cpus = os.cpu_count() or 1
+
+    def report(result):
+        mentions, ticker_posts = result
+        return render_to_string([
+            partial(monitor.write_top_tickers, ticker_mentions=mentions),
+            partial(monitor.write_tier1_tracker, ticker_mentions=mentions),
+            partial(monitor.write_top_posts, ticker_mentions=mentions, ticker_posts=ticker_posts),
+        ])
+
+    print(f"📊 Parallel post analysis ({n_posts:,} posts, chunks of {chunk_posts:,}, {cpus} CPUs)")
+    serial, serial_seconds = timed(monitor.analyze_posts, posts)
+    print_throughput("1 process", n_posts, serial_seconds)
+
+    expected = report(serial)
+    for workers in sorted({2, cpus} - {1}):
+        result, seconds = timed(monitor.analyze_posts_parallel, posts, None, workers, chunk_posts)
+        print_throughput(f"{workers} workers", n_posts, seconds, serial_seconds)
+        if report(result) != expected or result != serial:
+            print("   ❌ parallel results differ from the serial analysis")
+            return False
+
+    # Projected scaling (process start-up excluded): forked workers inherit the
+    # posts, so the parent's only serial work is unpickling and merging partial results
+    chunks = [posts[start:start + chunk_posts] for start in range(0, n_posts, chunk_posts)]
+    partials, worker_seconds = timed(lambda: [monitor.analyze_chunk(chunk, number * chunk_posts)
+                                              for number, chunk in enumerate(chunks)])
+    payloads = [pickle.dumps(result) for result in partials]
+    _, merge_seconds = timed(lambda: monitor.merge_partials(map(pickle.loads, payloads),
+                                                            monitor.TICKER_MATCHER.tickers))
+    print(f"   {'partial results pickled':32} {sum(map(len, payloads)) / 1024:10.0f} KB")
+    projected = ", ".join(
+        f"{cores}: {worker_seconds / (merge_seconds + worker_seconds / cores):.1f}x"
+        for cores in (2, 4, 8, 16)
+    )
+    print(f"   {'projected speedup by cores':32} {projected}")
+    print()
+
+def bench_report_render(universes=(1000, 10000, 100000)):
+    """Streaming report renderer vs. string concatenation, for large ticker universes"""
+    import tempfile
+    import tracemalloc
+    from report_renderer import render_to_file
+
+    def concatenated(path, ticker_data):
+        # Original pattern: build the whole report with +=, then write it
+        report = "## Ticker Mentions\n\n| Ticker | Mentions | Theme | Sentiment |\n"
+        report += "|--------|----------|-------|-----------|\n"
+        for ticker, data in ticker_data.items():
+            report += f"| {ticker} | {data['mentions']} | {data['theme']} | {data['sentiment']} |\n"
+        with open(path, 'w') as f:
+            f.write(report)
+
+    def sections(ticker_data):
+        return [
+            lambda out: out.write("## Ticker Mentions\n\n"),
+            lambda out: out.table(["Ticker", "Mentions", "Theme", "Sentiment"], (
+                (ticker, data['mentions'], data['theme'], data['sentiment'])
+                for ticker, data in ticker_data.items()
+            )),
+        ]
+
+    def measured(func, *args):
+        # Timed without tracing (tracemalloc slows every allocation), then traced for the peak
+        _, seconds = timed(func, *args)
+        tracemalloc.start()
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return seconds, peak
+
+    rng = random.Random(14)
+    print("📊 Report rendering (full ticker mention table)")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'report.md'
+        for n_tickers in universes:
+            ticker_data = {
+                f"T{i:06d}": {
+                    'mentions': rng.randint(1, 500),
+                    'theme': rng.choice(list(DEFAULT_THEMES)),
+                    'sentiment': rng.choice(['positive', 'neutral', 'negative']),
+                }
+                for i in range(n_tickers)
+            }
+
+            seconds, peak = measured(concatenated, path, ticker_data)
+            print(f"   {f'{n_tickers:,} tickers, concatenation':32} {seconds * 1000:10.1f} ms"
+                  f"  (peak {peak / 1024 / 1024:6.2f} MB)")
+            seconds, peak = measured(render_to_file, sections(ticker_data), path)
+            print(f"   {f'{n_tickers:,} tickers, streaming':32} {seconds * 1000:10.1f} ms"
+                  f"  (peak {peak / 1024 / 1024:6.2f} MB, file {path.stat().st_size / 1024 / 1024:.1f} MB)")
+    print()
+
+# Cold import budget for the analysis core, and the dependencies it must not pull in
+IMPORT_BUDGET_MS = 100
+CORE_MODULES = ['ticker_matcher', 'keyword_index', 'sentiment', 'settings',
+                'live_report_generator', 'report_generator', 'reddit_monitor', 'live_reddit_monitor',
+                'run_profile', 'http_client', 'response_cache']
+HEAVY_MODULES = ['numpy', 'pandas', 'pyarrow', 'praw']
+
+# A disabled span must cost less than this (spans wrap stages and listing pages, never single posts)
+SPAN_BUDGET_NS = 1000
+
+def bench_run_profile(n_spans=200000):
+    """Cost per span with run profiling off and on, checked against a budget when off"""
+    import tempfile
+    from run_profile import profiled_run, span
+
+    def spans():
+        for _ in range(n_spans):
+            with span('stage', subreddit='stocks'):
+                pass
+
+    def bare():
+        for _ in range(n_spans):
+            pass
+
+    print(f"📊 Run profile spans ({n_spans:,} spans, budget {SPAN_BUDGET_NS} ns each when disabled)")
+    _, loop = timed(bare)
+    _, disabled = timed(spans)
+    with tempfile.TemporaryDirectory() as tmp:
+        with profiled_run('bench', {'enabled': True, 'prometheus_textfile_dir': tmp}, directory=tmp) as profile:
+            _, enabled = timed(spans)
+        profile_kb = profile.path.stat().st_size / 1024
+
+    disabled_ns = (disabled - loop) / n_spans * 1e9
+    enabled_ns = (enabled - loop) / n_spans * 1e9
+    ok = disabled_ns < SPAN_BUDGET_NS
+    print(f"   {'✅' if ok else '❌'} {'disabled':30} {disabled_ns:10.0f} ns/span")
+    print(f"      {'enabled':30} {enabled_ns:10.0f} ns/span  (profile {profile_kb:,.0f} KB, "
+          f"{len(profile.spans):,} spans kept)")
+    print()
+    return ok
+
+def bench_suite(sizes=('1k',)):
+    """Hot-path suite at 1k documents against the stored baseline (see bench_suite.py for 100k / 1M)"""
+    from bench_suite import run_suite
+
+    _, regressions = run_suite(sizes)
+    if regressions:
+        return False
+
+def bench_import_time():
+    """Cold import cost of the analysis core (python -X importtime), checked against a budget"""
+    import subprocess
+
+    print(f"📊 Cold import time (budget {IMPORT_BUDGET_MS} ms, must not load {'/'.join(HEAVY_MODULES)})")
+    within_budget = True
+
+    for module in CORE_MODULES:
+        code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        )
+        process_ms = (time.perf_counter() - start) * 1000
+
+        # "import time: self [us] | cumulative | name"; the module's own line covers everything it imports
+        cumulative_us = next(
+            int(line.split('|')[1]) for line in result.stderr.splitlines()
+            if line.split('|')[-1].strip() == module
+        )
+        heavy = result.stdout.strip()
+
+        ok = cumulative_us / 1000 < IMPORT_BUDGET_MS and not heavy
+        within_budget &= ok
+        print(f"   {'✅' if ok else '❌'} {module:24} {cumulative_us / 1000:7.1f} ms"
+              f"  (whole process {process_ms:.0f} ms)" + (f"  loads {heavy}" if heavy else ""))
+
+    print()
+    return within_budget
+
+BENCHMARKS = {
+    'ticker_matcher': bench_ticker_matcher,
+    'themes': bench_themes,
+    'collection': bench_collection,
+    'http_client': bench_http_client,
+    'response_cache': bench_response_cache,
+    'incremental': bench_incremental,
+    'comments': bench_comments,
+    'history': bench_history,
+    'theme_log': bench_theme_log,
+    'momentum': bench_momentum,
+    'anomaly': bench_anomaly,
+    'daemon': bench_daemon,
+    'report_render': bench_report_render,
+    'post_archive': bench_post_archive,
+    'replay': bench_replay,
+    'seen_posts': bench_seen_posts,
+    'near_duplicates': bench_near_duplicates,
+    'parallel_analysis': bench_parallel_analysis,
+    'run_profile': bench_run_profile,
+    'suite': bench_suite,
+    'import_time': bench_import_time,
+}
+
+def main(names=None):
+    """Run the selected benchmarks (all by default)"""
+    names = names or list(BENCHMARKS)
+
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"❌ Unknown benchmark: {name}")
+            print(f"   Available: {', '.join(BENCHMARKS)}")
+            sys.exit(1)
+
+    # Benchmarks return False when a result is wrong or a budget is exceeded
+    failed = [name for name in names if BENCHMARKS[name]() is False]
+    if failed:
+        print(f"❌ Failed: {', '.join(failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -186,6 +186,14 @@ There are 73 Undervalued US Small Caps With Insider Buying available according t
     print(" EXECUTING LIVE REPORT GENERATION WITH REAL WEB SEARCH DATA")
     print("="*80)
     print()
+
+    # Results cached today for the current queries replace the bundled snapshot above
+    cached, missing = live_report_generator.collect_search_results()
+    if not missing:
+        search_results = cached
+    else:
+        print(f"   {len(missing)} queries not cached today - using the bundled search results")
+    print()
     print(f"📊 Collected {len(search_results)} search result blocks")
     print("🔍 Search queries executed:")
     for i, result in enumerate(search_results, 1):
@@ -19,6 +19,7 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent))
 
 import live_report_generator
+from response_cache import normalize_query
 
 def generate_report_from_searches(search_results_data):
     """
@@ -38,11 +39,26 @@ def generate_report_from_searches(search_results_data):
 
     Returns:
         Path to generated report
+
+    The results are cached for the rest of the day, alongside earlier results
+    for the same queries, and the report uses every result cached for them.
+    Queries from get_search_queries() that were not searched this time are
+    filled in from the cache, so a rerun only needs to search the queries it
+    is missing. Results without a query are used but not cached.
     """
     print(f"\n{'='*70}")
     print("Generating Live Report with Web Search Data")
     print(f"{'='*70}\n")
 
+    cached = live_report_generator.cache_search_results(search_results_data)
+    search_results_data = cached + [result for result in search_results_data if not result.get('query')]
+    searched = {normalize_query(result['query']) for result in cached}
+    remaining = [query for query in live_report_generator.get_search_queries()
+                 if normalize_query(query) not in searched]
+    if remaining:
+        cached, _ = live_report_generator.collect_search_results(remaining)
+        search_results_data += cached
+
     print(f"📊 Processing {len(search_results_data)} search result blocks\n")
 
     # Call the main report generator
@@ -64,7 +80,8 @@ def format_search_results(raw_results):
 
     for result in raw_results:
         formatted.append({
-            'query': result.get('query', 'Unknown'),
+            # No placeholder query: results without one are not cached under a shared key
+            'query': result.get('query', ''),
             'content': result.get('content', ''),
             'source': result.get('source', 'Web Search'),
             'timestamp': datetime.now().isoformat()
@@ -90,15 +107,16 @@ def main():
     print()
 
     queries = live_report_generator.get_search_queries()
+    _, missing = live_report_generator.collect_search_results(queries)
     for i, query in enumerate(queries, 1):
-        print(f"   {i}. {query}")
+        print(f"   {i}. {query}" + ("" if query in missing else "  (cached today)"))
 
     print()
     print("="*70)
     print()
     print("🤖 Instructions for Claude Code:")
     print()
-    print("1. Execute WebSearch for each query above")
+    print(f"1. Execute WebSearch for each query above not cached today ({len(missing)} of {len(queries)})")
     print("2. Collect all search results")
     print("3. Format results using format_search_results()")
     print("4. Call generate_report_from_searches() with formatted data")
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Ticker History Store
+Columnar, date-partitioned ticker history (Parquet), replacing ticker_history.csv
+
+Layout:
+    ticker_history/
+        date=2026-01-15/part-093012.parquet
+        date=2026-01-18/part-101544.parquet
+
+Usage (one-time migration of an existing CSV):
+    python3 scripts/history_store.py migrate path/to/ticker_history.csv path/to/ticker_history
+"""
+
+import csv
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+SNAPSHOT_SCHEMA = pa.schema([
+    ('ticker', pa.string()),
+    ('mentions', pa.int32()),
+    ('tier', pa.string()),
+    ('theme', pa.string()),
+    ('sentiment', pa.string()),
+])
+
+PARTITION_PREFIX = "date="
+
+
+class TickerHistoryStore:
+    """
+    One Parquet partition per snapshot date.
+
+    Lookups list partition directories (cheap) and read only the partition they
+    need, so "latest snapshot" does not get slower as history grows. Several runs
+    on the same day add part files to the same partition; later parts win.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def _partition(self, date):
+        return self.root / f"{PARTITION_PREFIX}{date}"
+
+    def snapshot_dates(self):
+        """All snapshot dates (YYYY-MM-DD), oldest first"""
+        if not self.root.exists():
+            return []
+
+        return sorted(
+            path.name[len(PARTITION_PREFIX):]
+            for path in self.root.iterdir()
+            if path.name.startswith(PARTITION_PREFIX) and path.is_dir()
+        )
+
+    def append_snapshot(self, ticker_data, date=None):
+        """Write one snapshot ({ticker: {mentions, tier, theme, sentiment}})"""
+        now = datetime.now()
+        date = date or now.strftime("%Y-%m-%d")
+
+        tickers = list(ticker_data)
+        table = pa.table({
+            'ticker': tickers,
+            'mentions': [int(ticker_data[t].get('mentions', 0) or 0) for t in tickers],
+            'tier': [ticker_data[t].get('tier', '') for t in tickers],
+            'theme': [ticker_data[t].get('theme', '') for t in tickers],
+            'sentiment': [ticker_data[t].get('sentiment', 'neutral') for t in tickers],
+        }, schema=SNAPSHOT_SCHEMA)
+
+        partition = self._partition(date)
+        partition.mkdir(parents=True, exist_ok=True)
+
+        # Hidden temp name: dataset discovery skips dot-files until the rename
+        path = partition / f"part-{now.strftime('%H%M%S%f')}.parquet"
+        temp_path = partition / f".{path.name}.tmp"
+        pq.write_table(table, temp_path)
+        temp_path.replace(path)
+        return path
+
+    def read_snapshot(self, date):
+        """Read one snapshot as {ticker: {mentions, tier, theme, sentiment}}"""
+        snapshot = {}
+
+        for path in sorted(self._partition(date).glob("*.parquet")):
+            for row in pq.read_table(path, schema=SNAPSHOT_SCHEMA).to_pylist():
+                snapshot[row.pop('ticker')] = row
+
+        return snapshot
+
+    def latest_snapshot(self, runs_ago=0):
+        """Return (date, snapshot) for the latest snapshot, or N snapshots before it"""
+        # Walk back from the newest partition, skipping any left empty by a failed write
+        for date in reversed(self.snapshot_dates()):
+            if next(self._partition(date).glob("*.parquet"), None) is None:
+                continue
+            if runs_ago == 0:
+                return date, self.read_snapshot(date)
+            runs_ago -= 1
+
+        return None, {}
+
+    def read_history(self, start_date=None, end_date=None, columns=None):
+        """Read a date range as a pyarrow Table with a typed `date` column"""
+        if not self.snapshot_dates():
+            return SNAPSHOT_SCHEMA.empty_table()
+
+        dataset = ds.dataset(
+            self.root, format="parquet",
+            partitioning=ds.partitioning(pa.schema([('date', pa.date32())]), flavor="hive"),
+        )
+
+        expression = None
+        if start_date:
+            expression = ds.field('date') >= pa.scalar(datetime.strptime(start_date, "%Y-%m-%d").date())
+        if end_date:
+            end = ds.field('date') <= pa.scalar(datetime.strptime(end_date, "%Y-%m-%d").date())
+            expression = end if expression is None else expression & end
+
+        return dataset.to_table(columns=columns, filter=expression)
+
+    def migrate_csv(self, csv_path):
+        """One-time import of a ticker_history.csv; returns the number of rows migrated"""
+        snapshots = {}
+
+        with open(csv_path, 'r', newline='') as f:
+            for row in csv.DictReader(f):
+                snapshots.setdefault(row['date'], {})[row['ticker']] = {
+                    'mentions': int(row['mentions']) if row['mentions'] else 0,
+                    'tier': row.get('tier', ''),
+                    'theme': row.get('theme', ''),
+                    'sentiment': row.get('sentiment', 'neutral'),
+                }
+
+        for date, ticker_data in sorted(snapshots.items()):
+            self.append_snapshot(ticker_data, date=date)
+
+        return sum(len(ticker_data) for ticker_data in snapshots.values())
+
+
+def migrate_if_needed(csv_path, store):
+    """Migrate a legacy CSV into an empty store, then rename the CSV out of the way"""
+    csv_path = Path(csv_path)
+    if not csv_path.exists() or store.snapshot_dates():
+        return 0
+
+    rows = store.migrate_csv(csv_path)
+    csv_path.rename(csv_path.with_name(csv_path.name + ".migrated"))
+    print(f"✅ Migrated {rows} rows from {csv_path.name} to {store.root}")
+    return rows
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] != "migrate":
+        print(__doc__)
+        sys.exit(1)
+
+    store = TickerHistoryStore(sys.argv[3])
+    rows = store.migrate_csv(sys.argv[2])
+    print(f"✅ Migrated {rows} rows into {store.root}")
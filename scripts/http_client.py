@@ -0,0 +1,305 @@
+"""
+HTTP Client
+Pooled fetcher for Reddit JSON listings (or any JSON API) shared by every worker
+
+One requests.Session keeps persistent keep-alive connection pools. A semaphore
+bounds how many requests are in flight, and an optional TokenBucket keeps them
+within a quota. 429 and 5xx responses (and dropped connections) are retried with
+exponential backoff and full jitter, waiting at least as long as the server's
+Retry-After. Responses with an ETag or Last-Modified are remembered, so fetching
+the same URL again sends a conditional request and a 304 reuses the stored body.
+With a ResponseCache, a page fetched within its TTL (by this or an earlier run)
+is served from disk without a request at all.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlencode, urljoin
+
+REDDIT_BASE_URL = 'https://www.reddit.com'
+
+# Reddit throttles generic user agents much harder
+USER_AGENT = 'reddit-capital-rotation/1.0 (listing monitor)'
+
+# Requests in flight at once (also the connection pool size per host)
+MAX_CONCURRENCY = 8
+
+# Retries: up to MAX_RETRIES after the first attempt, backing off
+# BACKOFF_BASE * 2 ** attempt seconds (full jitter) up to BACKOFF_CAP
+MAX_RETRIES = 5
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+
+# Longest Retry-After honoured; a server asking for more gets this
+MAX_RETRY_AFTER = 300.0
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+REQUEST_TIMEOUT = 10.0
+
+# URLs whose validators (ETag / Last-Modified) and body are kept for conditional requests
+VALIDATOR_CACHE_SIZE = 1024
+
+# Posts per listing page (Reddit's maximum)
+LISTING_PAGE_SIZE = 100
+
+
+class HttpError(Exception):
+    """A request failed for good: a non-retryable status, or retries ran out"""
+
+    def __init__(self, message, status=None, url=None):
+        super().__init__(message)
+        self.status = status
+        self.url = url
+
+
+def retry_after_seconds(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or an HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+class HttpClient:
+    """
+    Thread-safe pooled HTTP client with retries and conditional requests
+
+    get() returns the response body as bytes (the stored body on a 304) and
+    get_json() the decoded JSON. Paths are resolved against base_url, so the
+    same code runs against Reddit or a local stand-in server. Counters for the
+    run summary are in `stats`; summary() adds requests/sec and the bytes 304s saved.
+
+    A ResponseCache (`cache`) is consulted before every request, under
+    `cache_source` (whose TTL applies), and successful responses are stored in it.
+
+    sleep and rng (a 0-1 float source for jitter) are injectable for tests.
+    """
+
+    def __init__(self, base_url=REDDIT_BASE_URL, user_agent=USER_AGENT, max_concurrency=MAX_CONCURRENCY,
+                 rate_limiter=None, max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE,
+                 backoff_cap=BACKOFF_CAP, timeout=REQUEST_TIMEOUT, conditional=True,
+                 cache=None, cache_source='listing', sleep=time.sleep, rng=random.random):
+        # requests (and urllib3) are only imported once a client is built
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.base_url = base_url.rstrip('/') + '/'
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.conditional = conditional
+        self.cache = cache
+        self.cache_source = cache_source
+        self.sleep = sleep
+        self.rng = rng
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': user_agent, 'Accept': 'application/json'})
+        # With trust_env, requests re-reads the proxy variables and ~/.netrc on every
+        # request (a third of its per-request time); resolve them once for base_url instead
+        self.session.trust_env = False
+        self.session.proxies = requests.utils.get_environ_proxies(self.base_url)
+        self.session.verify = os.environ.get('REQUESTS_CA_BUNDLE') or os.environ.get('CURL_CA_BUNDLE') or True
+        # Retries are handled here (with Retry-After and jitter), not by urllib3
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_concurrency, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.transport_errors = (requests.ConnectionError, requests.Timeout)
+
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.lock = threading.Lock()
+        self.validators = OrderedDict()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {
+                'requests': 0, 'retries': 0, 'not_modified': 0, 'failures': 0,
+                'bytes_received': 0, 'bytes_saved': 0, 'backoff_seconds': 0.0,
+            }
+            self.started = None
+            self.finished = None
+
+    def url(self, path, params=None):
+        url = urljoin(self.base_url, path.lstrip('/')) if '://' not in path else path
+        return f"{url}?{urlencode(params)}" if params else url
+
+    def backoff(self, attempt, retry_after=None):
+        """Seconds to wait before retry `attempt` (0-based): full jitter, at least Retry-After"""
+        delay = self.rng() * min(self.backoff_cap, self.backoff_base * 2 ** attempt)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, MAX_RETRY_AFTER))
+        return delay
+
+    def _count(self, **deltas):
+        with self.lock:
+            for name, value in deltas.items():
+                self.stats[name] += value
+            self.finished = time.perf_counter()
+
+    def _request(self, url, headers):
+        """One attempt, holding a concurrency slot (and a rate-limit token) while in flight"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        with self.slots:
+            with self.lock:
+                if self.started is None:
+                    self.started = time.perf_counter()
+            return self.session.get(url, headers=headers, timeout=self.timeout)
+
+    def get(self, path, params=None):
+        """Response body of a GET (bytes), retried on 429/5xx; raises HttpError on failure"""
+        url = self.url(path, params)
+        if self.cache is not None:
+            content = self.cache.get(self.cache_source, url)
+            if content is not None:
+                return content
+
+        start = time.perf_counter()
+        headers = {}
+        with self.lock:
+            cached = self.validators.get(url)
+            if cached is not None:
+                self.validators.move_to_end(url)
+        if self.conditional and cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                response = self._request(url, headers)
+            except self.transport_errors as e:
+                self._count(requests=1)
+                error = HttpError(f"GET {url}: {e.__class__.__name__}", url=url)
+            else:
+                content = response.content
+                self._count(requests=1, bytes_received=len(content))
+
+                if response.status_code == 304 and cached is not None:
+                    self._count(not_modified=1, bytes_saved=len(cached[2]))
+                    return self._cached(url, cached[2], start)
+                if response.status_code < 400:
+                    self._remember(url, response, content)
+                    return self._cached(url, content, start)
+
+                error = HttpError(f"GET {url}: HTTP {response.status_code}", response.status_code, url)
+                if response.status_code not in RETRY_STATUSES:
+                    break
+                retry_after = retry_after_seconds(response.headers.get('Retry-After'))
+
+            if attempt == self.max_retries:
+                break
+            delay = self.backoff(attempt, retry_after)
+            self._count(retries=1, backoff_seconds=delay)
+            self.sleep(delay)
+
+        self._count(failures=1)
+        raise error
+
+    def _cached(self, url, content, start):
+        if self.cache is not None:
+            self.cache.put(self.cache_source, url, content, time.perf_counter() - start)
+        return content
+
+    def get_json(self, path, params=None):
+        return json.loads(self.get(path, params))
+
+    def _remember(self, url, response, content):
+        if not self.conditional:
+            return
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        with self.lock:
+            if etag or last_modified:
+                self.validators[url] = (etag, last_modified, content)
+                self.validators.move_to_end(url)
+                while len(self.validators) > VALIDATOR_CACHE_SIZE:
+                    self.validators.popitem(last=False)
+            else:
+                self.validators.pop(url, None)
+
+    def requests_per_second(self):
+        with self.lock:
+            if self.started is None or self.finished is None or self.finished <= self.started:
+                return 0.0
+            return self.stats['requests'] / (self.finished - self.started)
+
+    def summary(self):
+        stats = self.stats
+        return (f"{stats['requests']} requests ({self.requests_per_second():.1f}/s), "
+                f"{stats['retries']} retries ({stats['backoff_seconds']:.1f}s backing off), "
+                f"{stats['not_modified']} not modified ({stats['bytes_saved'] / 1024:.0f} KB saved), "
+                f"{stats['bytes_received'] / 1024:.0f} KB received, {stats['failures']} failed")
+
+    def print_summary(self):
+        print(f"🌐 HTTP: {self.summary()}")
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def listing_post(child):
+    """A listing child (t3 submission) in the live monitor's post format"""
+    data = child.get('data', child)
+    post = {
+        'id': data.get('id', ''),
+        'name': data.get('name') or f"t3_{data.get('id', '')}",
+        'title': data.get('title', ''),
+        'body': data.get('selftext', ''),
+        'subreddit': data.get('subreddit', ''),
+        'score': data.get('score', 0),
+        'num_comments': data.get('num_comments', 0),
+        'url': data.get('url', ''),
+        'created_utc': data.get('created_utc', 0),
+    }
+    if data.get('crosspost_parent'):
+        post['crosspost_parent'] = data['crosspost_parent']
+    return post
+
+def iter_listing(client, subreddit, sort='new', limit=1000, page_size=LISTING_PAGE_SIZE):
+    """Yield up to `limit` posts of /r/<subreddit>/<sort>.json, paging with `after`"""
+    after = None
+    fetched = 0
+    while fetched < limit:
+        params = {'limit': min(page_size, limit - fetched), 'raw_json': 1}
+        if after:
+            params['after'] = after
+        listing = client.get_json(f"/r/{subreddit}/{sort}.json", params).get('data', {})
+
+        children = listing.get('children', [])
+        for child in children:
+            yield listing_post(child)
+        fetched += len(children)
+
+        after = listing.get('after')
+        if not after or not children:
+            return
@@ -0,0 +1,149 @@
+"""
+Keyword Index
+Compiled keyword lexicon that resolves every keyword hit from one split of the text
+"""
+
+from functools import reduce
+from operator import or_
+
+# Up to this many keywords, direct substring checks beat tokenizing in CPython
+DIRECT_SCAN_MAX_KEYWORDS = 40
+
+# Bound on memoised chunks before the memo is reset
+MAX_MEMO_CHUNKS = 500000
+
+
+class _ChunkMasks(dict):
+    """Memo of whitespace chunk -> bitmask of the keywords it contains"""
+
+    def __init__(self, keywords, bits):
+        super().__init__()
+        self._keywords = keywords
+        self._bits = bits
+
+    def __missing__(self, chunk):
+        if len(self) >= MAX_MEMO_CHUNKS:
+            self.clear()
+
+        mask = 0
+        for keyword in self._keywords:
+            if keyword in chunk:
+                mask |= self._bits[keyword]
+        self[chunk] = mask
+        return mask
+
+
+class KeywordIndex:
+    """
+    Case-insensitive substring matcher for a fixed keyword list.
+
+    Semantics are identical to `keyword.lower() in text.lower()` for every keyword.
+    A keyword without whitespace can only occur inside one whitespace-separated
+    chunk, so each document is split once and every distinct chunk is resolved to
+    the keywords it contains a single time (memoised across documents). Cost then
+    depends on document length, not on the number of keywords. Keywords that contain
+    whitespace ("revenue growth") are checked against the lowered text directly.
+
+    Hits are integer bitmasks (bit i = keywords[i]) so they combine cheaply and
+    unpack into NumPy matrices for batch scoring.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keyword.lower() for keyword in keywords))
+        self._bits = {keyword: 1 << i for i, keyword in enumerate(self.keywords)}
+        self._direct = [(k, self._bits[k]) for k in self.keywords]
+
+        chunk_keywords = [k for k in self.keywords if len(k.split()) == 1]
+        self._phrases = [(k, self._bits[k]) for k in self.keywords if len(k.split()) != 1]
+        self._chunk_masks = _ChunkMasks(chunk_keywords, self._bits)
+        self._use_chunks = len(self.keywords) > DIRECT_SCAN_MAX_KEYWORDS
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def match_lower(self, text_lower):
+        """Return the hit bitmask for text that has already been lowercased"""
+        if not self._use_chunks:
+            mask = 0
+            for keyword, bit in self._direct:
+                if keyword in text_lower:
+                    mask |= bit
+            return mask
+
+        mask = reduce(or_, map(self._chunk_masks.__getitem__, set(text_lower.split())), 0)
+        for phrase, bit in self._phrases:
+            if phrase in text_lower:
+                mask |= bit
+        return mask
+
+    def match(self, text):
+        """Return the hit bitmask for text"""
+        if not text:
+            return 0
+        return self.match_lower(text.lower())
+
+    def keywords_in(self, mask):
+        """Decode a bitmask back into keywords"""
+        return [keyword for keyword in self.keywords if mask & self._bits[keyword]]
+
+    def mask_of(self, keywords):
+        """Bitmask covering the given keywords"""
+        return reduce(or_, (self._bits[keyword.lower()] for keyword in keywords), 0)
+
+    def hit_matrix(self, masks):
+        """Unpack a sequence of bitmasks into an (n_docs, n_keywords) boolean matrix"""
+        # Imported here so matching alone never pays NumPy's import cost
+        import numpy as np
+
+        n_bytes = max(1, (len(self.keywords) + 7) // 8)
+        buffer = b''.join(mask.to_bytes(n_bytes, 'little') for mask in masks)
+
+        packed = np.frombuffer(buffer, dtype=np.uint8).reshape(len(masks), n_bytes)
+        bits = np.unpackbits(packed, axis=1, bitorder='little')
+        return bits[:, :len(self.keywords)].astype(bool)
+
+
+class ThemeIndex:
+    """
+    Keyword -> theme automaton built from {theme: [keywords]} definitions.
+
+    All themes share one KeywordIndex, so a document is scanned once no matter how
+    many themes are defined; each theme is then a single bitmask test.
+    """
+
+    def __init__(self, theme_keywords):
+        self.themes = list(theme_keywords)
+        self.index = KeywordIndex(
+            keyword for keywords in theme_keywords.values() for keyword in keywords
+        )
+        self._theme_masks = [
+            (theme_name, self.index.mask_of(keywords))
+            for theme_name, keywords in theme_keywords.items()
+        ]
+
+    def match_lower(self, text_lower):
+        """Return matching theme names (definition order) for lowercased text"""
+        mask = self.index.match_lower(text_lower)
+        if not mask:
+            return []
+        return [theme_name for theme_name, theme_mask in self._theme_masks if mask & theme_mask]
+
+    def match(self, text):
+        """Return matching theme names (definition order) for text"""
+        if not text:
+            return []
+        return self.match_lower(text.lower())
+
+
+_theme_index_cache = {}
+
+def get_theme_index(theme_keywords):
+    """Return a ThemeIndex for these definitions, rebuilding only when they change"""
+    key = tuple((name, tuple(keywords)) for name, keywords in theme_keywords.items())
+
+    theme_index = _theme_index_cache.get(key)
+    if theme_index is None:
+        _theme_index_cache.clear()
+        theme_index = _theme_index_cache[key] = ThemeIndex(theme_keywords)
+
+    return theme_index
@@ -5,12 +5,19 @@ Uses Chrome automation to scrape Reddit in real-time
 No API credentials required
 """
 
-import json
-import re
+import heapq
+import os
+import time
+from array import array
 from datetime import datetime
 from collections import Counter, defaultdict
+from functools import partial
 from pathlib import Path
 
+from report_renderer import render_to_file, render_to_string
+from run_profile import count as count_metric
+from ticker_matcher import TickerMatcher, build_matcher
+
 # Tickers to track
 TICKERS = {
     'Tier 1': ['ASTS', 'RKLB', 'AVGO', 'MRVL', 'POET', 'TSMC', 'QBTS', 'SMR', 'CEG', 'D', 'LEU', 'BWXT'],
@@ -22,6 +29,20 @@ ALL_TICKERS = []
 for tier_list in TICKERS.values():
     ALL_TICKERS.extend(tier_list)
 
+# Only 2-5 letter symbols, matching the original [A-Z]{2,5} pattern
+TICKER_MATCHER = build_matcher(TICKERS, min_length=2, max_length=5)
+
+# Posts per parallel analysis task, and best-scored posts analyze_posts keeps per
+# ticker in either mode (the report shows the top 2 per ticker)
+ANALYSIS_CHUNK_POSTS = 5000
+TOP_POSTS_PER_TICKER = 5
+
+# Posts being analyzed by analyze_posts_parallel; forked workers read their chunks from here
+_SHARED_POSTS = None
+
+# Raw posts of every scan are appended here (see post_archive)
+POST_ARCHIVE_DIR = Path(__file__).parent.parent / 'data' / 'post_archive'
+
 # Subreddits to monitor
 SUBREDDITS = [
     'wallstreetbets',
@@ -39,115 +60,293 @@ def get_ticker_tier(ticker):
 
 def extract_tickers_from_text(text):
     """Extract ticker symbols from text"""
-    if not text:
-        return []
-
-    # Pattern for $TICKER or standalone TICKER
-    pattern = r'\$?([A-Z]{2,5})\b'
-    potential_tickers = re.findall(pattern, text.upper())
-
-    # Filter to only tracked tickers
-    found = [t for t in potential_tickers if t in ALL_TICKERS]
-    return list(set(found))  # Remove duplicates
-
-def analyze_posts(posts_data):
-    """Analyze collected posts for ticker mentions"""
-    ticker_mentions = Counter()
-    ticker_posts = defaultdict(list)
-
-    for post in posts_data:
+    # $TICKER or standalone TICKER, each tracked symbol reported once
+    return TICKER_MATCHER.find(text)
+
+def compact_post(post):
+    """The fields of a post the report shows"""
+    return {
+        'title': post.get('title', ''),
+        'subreddit': post.get('subreddit', ''),
+        'score': post.get('score', 0),
+        'url': post.get('url', '')
+    }
+
+def fetch_posts(subreddits=None, limit=1000, client=None, sort='new', cache=None):
+    """
+    Fetch recent posts from each subreddit's public JSON listing (no browser needed)
+
+    Subreddits are fetched concurrently through one pooled HttpClient, so they
+    share its keep-alive connections, concurrency bound, retry policy and, when
+    the client is built here, Reddit's rate limit. A subreddit that keeps
+    failing is reported and keeps the pages fetched before the failure.
+    Returns the posts in subreddit order.
+
+    A client built here checks the on-disk response cache (`cache`, by default
+    data/response_cache) before each page, so a rerun within the listing TTL
+    (5 minutes) makes no requests; a caller's own client keeps its own cache setting.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from http_client import HttpClient, HttpError, iter_listing
+    from rate_limiter import reddit_rate_limiter
+    from response_cache import ResponseCache
+
+    subreddits = list(subreddits or SUBREDDITS)
+    own_client = client is None
+    if own_client:
+        client = HttpClient(rate_limiter=reddit_rate_limiter(),
+                            cache=ResponseCache() if cache is None else cache)
+    if client.cache is not None:
+        client.cache.reset_stats()
+
+    def fetch(subreddit):
+        posts = []
+        try:
+            posts.extend(iter_listing(client, subreddit, sort, limit))
+        except HttpError as e:
+            print(f"Error fetching r/{subreddit}: {e}")
+        return posts
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(len(subreddits), client.max_concurrency) or 1) as executor:
+            batches = list(executor.map(fetch, subreddits))
+    finally:
+        if own_client:
+            client.close()
+
+    client.print_summary()
+    if client.cache is not None:
+        client.cache.print_summary()
+    posts = [post for batch in batches for post in batch]
+    count_metric('posts_fetched', len(posts))
+    return posts
+
+def analyze_posts(posts_data, seen=None, workers=1):
+    """
+    Analyze collected posts for ticker mentions
+
+    Returns (ticker_mentions, ticker_posts): a Counter of mentions per ticker
+    (in order of first mention) and, per ticker, its TOP_POSTS_PER_TICKER
+    best-scored posts in post order (earlier posts win ties). The report shows
+    the top 2; the totals are in ticker_mentions.
+
+    With a SeenPosts filter, posts it has already seen (repeats, crossposts, or
+    posts from earlier scans if the filter is persisted) are skipped before extraction.
+
+    workers > 1 (None: one per CPU) analyzes large batches in a process pool,
+    see analyze_posts_parallel; the result is the same either way.
+    """
+    if workers != 1 and len(posts_data) > ANALYSIS_CHUNK_POSTS:
+        return analyze_posts_parallel(posts_data, seen, workers)
+
+    if seen is not None:
+        posts_data = [post for post in posts_data if seen.check(post)]
+    count_metric('posts_analyzed', len(posts_data))
+
+    chunk_result = analyze_chunk(posts_data)
+    if seen is not None:
+        seen.processed_post(chunk_result[3], len(posts_data))
+
+    return merge_partials([chunk_result], TICKER_MATCHER.tickers)
+
+def _init_analysis_worker(tickers):
+    """Use the parent's ticker universe in a pool worker (once per process)"""
+    global TICKER_MATCHER
+    TICKER_MATCHER = TickerMatcher(tickers)
+
+def analyze_chunk(posts, first_index=0, top_n=TOP_POSTS_PER_TICKER):
+    """
+    Compact partial result for one chunk of posts (runs in a pool worker)
+
+    Returns (counts, order, top_posts, seconds): mention counts as an array
+    aligned with TICKER_MATCHER.tickers, ticker positions in order of first
+    mention, {ticker position: [(post index, post)]} holding the top_n
+    best-scored posts (earlier posts win ties, as in heapq.nlargest), and
+    the extraction time.
+    """
+    start = time.perf_counter()
+    rank = {ticker: position for position, ticker in enumerate(TICKER_MATCHER.tickers)}
+    counts = array('I', bytes(4 * len(rank)))
+    order = []
+    heaps = defaultdict(list)
+
+    for index, post in enumerate(posts, first_index):
         text = f"{post.get('title', '')} {post.get('body', '')}"
-        tickers = extract_tickers_from_text(text)
+        for ticker in extract_tickers_from_text(text):
+            position = rank[ticker]
+            if not counts[position]:
+                order.append(position)
+            counts[position] += 1
+
+            # Min-heap on (score, -index): the root is the worst of the kept posts
+            entry = (post.get('score', 0), -index)
+            heap = heaps[position]
+            if len(heap) < top_n:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+    top_posts = {
+        position: [(-negated, compact_post(posts[-negated - first_index])) for _, negated in heap]
+        for position, heap in heaps.items()
+    }
+    return counts, order, top_posts, time.perf_counter() - start
+
+def _analyze_shared(start, stop):
+    """analyze_chunk over posts inherited from the parent (fork start method)"""
+    return analyze_chunk(_SHARED_POSTS[start:stop], start)
+
+def merge_partials(partials, tickers, top_n=TOP_POSTS_PER_TICKER):
+    """
+    Merge analyze_chunk results (in chunk order) into (ticker_mentions, ticker_posts)
+
+    Tickers enter the Counter in order of first mention and each ticker's posts
+    stay in post order, so most_common() ties and heapq.nlargest() over the
+    posts resolve exactly as in the serial analysis.
+    """
+    ticker_mentions = Counter()
+    candidates = defaultdict(list)
 
-        for ticker in tickers:
-            ticker_mentions[ticker] += 1
-            ticker_posts[ticker].append({
-                'title': post.get('title', ''),
-                'subreddit': post.get('subreddit', ''),
-                'score': post.get('score', 0),
-                'url': post.get('url', '')
-            })
+    for counts, order, top_posts, _ in partials:
+        for position in order:
+            ticker_mentions[tickers[position]] += counts[position]
+        for position, posts in top_posts.items():
+            candidates[position].extend(posts)
 
+    ticker_posts = defaultdict(list)
+    for position, posts in candidates.items():
+        best = heapq.nlargest(top_n, posts, key=lambda item: (item[1]['score'], -item[0]))
+        ticker_posts[tickers[position]] = [post for _, post in sorted(best, key=lambda item: item[0])]
     return ticker_mentions, ticker_posts
 
-def generate_report(ticker_mentions, ticker_posts, output_file='data/live_report.txt'):
-    """Generate monitoring report"""
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-    report = f"""
-╔═══════════════════════════════════════════════════════════════╗
-║          REDDIT LIVE MONITORING REPORT                        ║
-║          {timestamp}                          ║
-╚═══════════════════════════════════════════════════════════════╝
-
-═══════════════════════════════════════════════════════════════
-TOP MENTIONED TICKERS (Current Scan)
-═══════════════════════════════════════════════════════════════
-
-"""
+def analyze_posts_parallel(posts_data, seen=None, workers=None, chunk_posts=ANALYSIS_CHUNK_POSTS):
+    """
+    analyze_posts over chunks of posts in a process pool
+
+    Workers send back compact partial results (count arrays and bounded top-post
+    lists, see analyze_chunk) rather than a dict per mention, and they are merged
+    in chunk order, so ticker_mentions and ticker_posts are identical to the
+    serial analysis.
+
+    With the fork start method the workers inherit the posts and only chunk
+    bounds are sent, so the parent does not pickle the batch.
+    """
+    global _SHARED_POSTS
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if seen is not None:
+        posts_data = [post for post in posts_data if seen.check(post)]
+    count_metric('posts_analyzed', len(posts_data))
+
+    starts = range(0, len(posts_data), chunk_posts)
+    stops = [min(start + chunk_posts, len(posts_data)) for start in starts]
+    tickers = TICKER_MATCHER.tickers
+    fork = multiprocessing.get_start_method() == 'fork'
+
+    # Set before the pool forks its workers
+    _SHARED_POSTS = posts_data if fork else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                                 initializer=_init_analysis_worker, initargs=(tickers,)) as executor:
+            if fork:
+                partials = list(executor.map(_analyze_shared, starts, stops))
+            else:
+                chunks = [posts_data[start:stop] for start, stop in zip(starts, stops)]
+                partials = list(executor.map(analyze_chunk, chunks, starts))
+    finally:
+        _SHARED_POSTS = None
+
+    if seen is not None:
+        for start, stop, (_, _, _, seconds) in zip(starts, stops, partials):
+            seen.processed_post(seconds, stop - start)
+
+    return merge_partials(partials, tickers)
+
+def write_top_tickers(out, ticker_mentions, top_n=20):
+    out.banner("TOP MENTIONED TICKERS (Current Scan)")
 
     if not ticker_mentions:
-        report += "No tracked tickers found in current scan.\n"
-    else:
-        for i, (ticker, count) in enumerate(ticker_mentions.most_common(20), 1):
-            tier = get_ticker_tier(ticker)
-            marker = "⭐" if tier.startswith('T1') else "📊" if tier.startswith('T2') else "💎"
-            report += f"{i:2}. {ticker:6} - {count:4} mentions [{tier}] {marker}\n"
-
-    report += """
-═══════════════════════════════════════════════════════════════
-TIER 1 TRACKER (High Conviction Holdings)
-═══════════════════════════════════════════════════════════════
+        out.line("No tracked tickers found in current scan.")
+        return
 
-"""
+    for i, (ticker, count) in enumerate(ticker_mentions.most_common(top_n), 1):
+        tier = get_ticker_tier(ticker)
+        marker = "⭐" if tier.startswith('T1') else "📊" if tier.startswith('T2') else "💎"
+        out.write(f"{i:2}. {ticker:6} - {count:4} mentions [{tier}] {marker}\n")
+
+def write_tier1_tracker(out, ticker_mentions):
+    out.banner("TIER 1 TRACKER (High Conviction Holdings)")
 
     for ticker in TICKERS['Tier 1']:
         count = ticker_mentions.get(ticker, 0)
         status = "📈" if count >= 5 else "📊" if count >= 2 else "📉"
-        report += f"{status} {ticker:6} - {count:4} mentions\n"
-
-    report += """
-═══════════════════════════════════════════════════════════════
-TOP POSTS BY TRACKED TICKERS
-═══════════════════════════════════════════════════════════════
+        out.write(f"{status} {ticker:6} - {count:4} mentions\n")
 
-"""
+def write_top_posts(out, ticker_mentions, ticker_posts, top_n=10):
+    out.banner("TOP POSTS BY TRACKED TICKERS")
 
-    for ticker in list(ticker_mentions.most_common(10)):
-        ticker_symbol = ticker[0]
+    for ticker_symbol, count in ticker_mentions.most_common(top_n):
         posts = ticker_posts[ticker_symbol]
 
         if posts:
-            # Sort by score and take top 2
-            top_posts = sorted(posts, key=lambda x: x['score'], reverse=True)[:2]
-            report += f"\n{ticker_symbol} ({len(posts)} total mentions):\n"
+            # Top 2 by score, without sorting every post
+            top_posts = heapq.nlargest(2, posts, key=lambda x: x['score'])
+            out.write(f"\n{ticker_symbol} ({count} total mentions):\n")
 
             for post in top_posts:
-                report += f"  • r/{post['subreddit']}: {post['title'][:60]}...\n"
-                report += f"    Score: {post['score']} | {post['url']}\n"
+                out.write(f"  • r/{post['subreddit']}: {post['title'][:60]}...\n")
+                out.write(f"    Score: {post['score']} | {post['url']}\n")
 
-    report += "\n" + "="*63 + "\n"
-    report += f"\nScan completed at: {timestamp}\n"
-    report += f"Subreddits monitored: {', '.join(SUBREDDITS)}\n"
-    report += f"Tickers tracked: {len(ALL_TICKERS)}\n"
+def write_scan_footer(out, timestamp):
+    out.write("\n" + "="*63 + "\n")
+    out.write(f"\nScan completed at: {timestamp}\n")
+    out.write(f"Subreddits monitored: {', '.join(SUBREDDITS)}\n")
+    out.write(f"Tickers tracked: {len(ALL_TICKERS)}\n")
 
-    # Save report
+def report_sections(ticker_mentions, ticker_posts):
+    """The monitoring report as renderer sections (see report_renderer)"""
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    return [
+        lambda out: out.box("REDDIT LIVE MONITORING REPORT", timestamp),
+        partial(write_top_tickers, ticker_mentions=ticker_mentions),
+        partial(write_tier1_tracker, ticker_mentions=ticker_mentions),
+        partial(write_top_posts, ticker_mentions=ticker_mentions, ticker_posts=ticker_posts),
+        partial(write_scan_footer, timestamp=timestamp),
+    ]
+
+def generate_report(ticker_mentions, ticker_posts, output_file='data/live_report.txt', echo=True):
+    """Generate monitoring report: saved to output_file, printed (with echo) and returned as text"""
     output_path = Path(__file__).parent.parent / output_file
-    output_path.parent.mkdir(exist_ok=True)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
 
+    report = render_to_string(report_sections(ticker_mentions, ticker_posts))
     with open(output_path, 'w') as f:
         f.write(report)
 
-    print(report)
+    if echo:
+        print(report)
     return report
 
-def save_posts_json(posts_data, filename='data/latest_posts.json'):
-    """Save raw posts data to JSON"""
-    output_path = Path(__file__).parent.parent / filename
-    output_path.parent.mkdir(exist_ok=True)
+def write_report(ticker_mentions, ticker_posts, output_file='data/live_report.txt', echo=True):
+    """Stream the generate_report() report straight into output_file (and stdout); returns the path"""
+    output_path = Path(__file__).parent.parent / output_file
+    return render_to_file(report_sections(ticker_mentions, ticker_posts), output_path, echo)
 
-    with open(output_path, 'w') as f:
-        json.dump(posts_data, f, indent=2)
+def archive_posts(posts_data, archive_dir=POST_ARCHIVE_DIR):
+    """Append raw posts to the compressed post archive (posts already archived are skipped)"""
+    # numpy is only imported when posts are actually archived
+    from post_archive import PostArchive
+
+    archive = PostArchive(archive_dir)
+    archived = archive.append(posts_data)
+    print(f"📦 Archived {archived} new posts ({len(posts_data) - archived} already archived)")
+    return archived
+
+def save_posts_json(posts_data, archive_dir=POST_ARCHIVE_DIR):
+    """Save raw posts data (now appended to the post archive rather than data/latest_posts.json)"""
+    return archive_posts(posts_data, archive_dir)
 
 if __name__ == "__main__":
     print("This script is designed to work with browser automation.")
@@ -4,45 +4,36 @@ Live Reddit Capital Rotation Report Generator
 Uses WebSearch to collect REAL DATA and generate comprehensive investment reports
 """
 
+import heapq
 import os
-import json
-import csv
-import sys
+import time
 from datetime import datetime
 from pathlib import Path
 from collections import defaultdict, Counter
-import re
+from functools import partial
 
-# Load configuration
-def load_config():
-    """Load configuration from config.json"""
-    config_path = Path(__file__).parent.parent / "config.json"
+import sentiment
+from keyword_index import get_theme_index
+from report_index import headline, open_manifest
+from report_renderer import render_to_string
+from run_profile import count as count_metric, profiled_run, span
+from settings import get_settings, require_settings
+from theme_log import ThemeEvolutionLog, migrate_if_needed as migrate_theme_log
+from vault_writer import VaultWriter
 
-    if not config_path.exists():
-        print("❌ Error: config.json not found!")
-        print(f"   Expected at: {config_path}")
-        sys.exit(1)
+# Config is read on first use, not at import (see settings.Settings)
+SETTINGS = get_settings()
 
-    with open(config_path, 'r') as f:
-        return json.load(f)
+# Vault notes are only rewritten when their content changes (bytes written/skipped per run)
+VAULT = VaultWriter()
 
-# Load config
-CONFIG = load_config()
-
-# Paths from config
-OBSIDIAN_VAULT = Path(CONFIG['obsidian_vault_path']).expanduser()
-REPORTS_DIR = OBSIDIAN_VAULT / CONFIG['reports_subfolder']
-DATA_DIR = REPORTS_DIR / "data"
-
-# Tracked tickers from config
-ALL_TICKERS = []
-for tier, tickers in CONFIG['tickers'].items():
-    ALL_TICKERS.extend(tickers)
+# Rolling baseline (days) the momentum table compares against
+MOMENTUM_WINDOW = 7
 
 def ensure_directories():
     """Create necessary directories if they don't exist"""
-    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    SETTINGS.reports_dir.mkdir(parents=True, exist_ok=True)
+    SETTINGS.data_dir.mkdir(parents=True, exist_ok=True)
 
 def get_search_queries():
     """Generate search queries for data collection"""
@@ -69,145 +60,253 @@ def get_search_queries():
 
     return queries
 
-def extract_tickers_from_text(text):
-    """Extract ticker mentions from text"""
-    if not text:
-        return []
+def search_cache():
+    """Response cache for search results (data/response_cache, shared with the listing fetcher)"""
+    from response_cache import ResponseCache
+    return ResponseCache()
+
+def cached_results(cache, query):
+    """Results cached today for query (a list, empty if none)"""
+    results = cache.get_json('search', query)
+    return [] if results is None else results
+
+def merge_results(results, new_results):
+    """results plus those of new_results not already in it (same content and source)"""
+    seen = {(result.get('content', ''), result.get('source')) for result in results}
+    merged = list(results)
+    for result in new_results:
+        key = (result.get('content', ''), result.get('source'))
+        if key not in seen:
+            seen.add(key)
+            merged.append(result)
+    return merged
+
+def cache_search_results(search_results, cache=None):
+    """
+    Store search results (dicts with a 'query') so later runs today can reuse them
 
-    # Look for our tracked tickers
-    found_tickers = []
-    text_upper = text.upper()
+    Results are grouped by normalized query, and each query keeps every result
+    cached for it today: new ones are added to those already cached, skipping
+    repeats. Results without a query are not cached. Returns every result now
+    cached for the queries in search_results, in query order.
+    """
+    from response_cache import normalize_query
+    if cache is None:
+        cache = search_cache()
+
+    by_query = {}
+    for result in search_results:
+        if result.get('query'):
+            by_query.setdefault(normalize_query(result['query']), []).append(result)
+
+    stored = []
+    for query, results in by_query.items():
+        merged = merge_results(cached_results(cache, query), results)
+        cache.put_json('search', query, merged)
+        stored.extend(merged)
+    return stored
+
+def collect_search_results(queries=None, search=None, cache=None):
+    """
+    Search results for queries (get_search_queries() by default), from the cache while fresh
 
-    for ticker in ALL_TICKERS:
-        # Use word boundary regex to avoid false matches
-        pattern = r'\b' + re.escape(ticker) + r'\b'
-        if re.search(pattern, text_upper):
-            found_tickers.append(ticker)
+    Each query is looked up in the response cache first, and every result cached
+    for it today is used. search(query), if given, is only called for the rest:
+    it returns a result dict ('content', 'source', ...) or None, and new results
+    are cached (search results stay fresh for a day).
+    Prints the cache hit rate and time saved; returns (results, queries still missing).
+    """
+    if cache is None:
+        cache = search_cache()
+    cache.reset_stats()
+
+    results, missing = [], []
+    for query in queries or get_search_queries():
+        found = cached_results(cache, query)
+        if not found and search is not None:
+            start = time.perf_counter()
+            result = search(query)
+            if result is not None:
+                found = [{'query': query, **result}]
+                cache.put_json('search', query, found, time.perf_counter() - start)
+        if found:
+            results.extend(found)
+        else:
+            missing.append(query)
 
-    return found_tickers
+    cache.print_summary()
+    return results, missing
+
+def extract_tickers_from_text(text):
+    """Extract ticker mentions from text"""
+    # Word-boundary matches, returned in config order
+    return SETTINGS.ticker_matcher.find(text)
 
 def analyze_sentiment(text):
     """Simple sentiment analysis based on keywords"""
-    if not text:
-        return "neutral"
+    return sentiment.analyze_sentiment(text)
+
+# Default theme keyword definitions (override with "themes" in config.json)
+DEFAULT_THEME_KEYWORDS = {
+    'Space Connectivity': ['satellite', 'space', 'orbital', 'ASTS', 'direct-to-cell', 'LEO'],
+    'Custom AI Chips': ['ASIC', 'custom chip', 'AI accelerator', 'Broadcom', 'AVGO', 'alternative to nvidia'],
+    'Optical Interconnects': ['optical', 'photonics', 'POET', 'interconnect', 'data center bandwidth'],
+    'Nuclear Energy for AI': ['nuclear', 'SMR', 'small modular reactor', 'CEG', 'power generation', 'data center power'],
+    'Quantum Computing': ['quantum', 'qubit', 'IONQ', 'RGTI', 'quantum computing'],
+    'Reddit Platform': ['RDDT', 'reddit stock', 'social media AI', 'data monetization'],
+    'Copper & Materials': ['copper', 'FCX', 'critical materials', 'electrification'],
+    'Healthcare AI': ['biotech', 'healthcare AI', 'drug discovery', 'NBIS'],
+    'Small Cap Value': ['small cap', 'insider buying', 'value rotation', 'Russell 2000'],
+}
+
+def theme_keywords():
+    """Theme definitions from config.json, or the defaults above"""
+    return SETTINGS.themes(DEFAULT_THEME_KEYWORDS)
+
+def match_themes(text):
+    """Return the names of all themes with at least one keyword in text"""
+    # The compiled index is cached and only rebuilt when the definitions change
+    return get_theme_index(theme_keywords()).match(text)
+
+def analyze_document(result, theme_index=None):
+    """Compute all per-document features in a single pass over one search result"""
+    content = result.get('content', '')
+    text_upper = content.upper()
+
+    if theme_index is None:
+        theme_index = get_theme_index(theme_keywords())
+
+    return {
+        'source': result.get('source', 'Unknown'),
+        'text_upper': text_upper,
+        'tickers': SETTINGS.ticker_matcher.find_upper(text_upper) if content else [],
+        'sentiment': analyze_sentiment(content),
+        'themes': theme_index.match(content),
+    }
 
-    text_lower = text.lower()
+def analyze_documents(search_results):
+    """Analyze every search result exactly once"""
+    theme_index = get_theme_index(theme_keywords())
+    return [analyze_document(result, theme_index) for result in search_results]
 
-    positive_words = ['bullish', 'surge', 'gain', 'growth', 'momentum', 'upgrade',
-                      'strong', 'rally', 'breakout', 'buy', 'opportunity', 'catalyst',
-                      'outperform', 'beating', 'revenue growth', 'partnership']
+def build_ticker_index(documents):
+    """Build an inverted index: ticker -> positions of the documents mentioning it"""
+    index = defaultdict(list)
 
-    negative_words = ['bearish', 'decline', 'loss', 'drop', 'downgrade', 'weak',
-                      'risk', 'concern', 'warning', 'overvalued', 'sell', 'miss']
+    for position, document in enumerate(documents):
+        for ticker in document['tickers']:
+            index[ticker].append(position)
 
-    positive_count = sum(1 for word in positive_words if word in text_lower)
-    negative_count = sum(1 for word in negative_words if word in text_lower)
+    return dict(index)
 
-    if positive_count > negative_count + 2:
-        return "positive"
-    elif negative_count > positive_count + 2:
-        return "negative"
-    else:
-        return "neutral"
+def cluster_results(search_results):
+    """Cluster near-duplicate search results (syndicated articles, copy-pasted posts)"""
+    # numpy is only imported when a report is actually built
+    from near_duplicates import cluster_near_duplicates
+    return cluster_near_duplicates([result.get('content', '') for result in search_results])
+
+def extract_themes_from_results(search_data, documents=None):
+    """
+    Extract investment themes from search results
 
-def extract_themes_from_results(search_data):
-    """Extract investment themes from search results"""
+    Pass precomputed `documents` (from analyze_documents) to avoid re-analyzing.
+    A document with a 'weight' stands for that many near-identical copies: it
+    counts once in 'mentions' and `weight` times in 'copies'.
+    """
     themes = defaultdict(lambda: {
         'mentions': 0,
+        'copies': 0,
         'tickers': set(),
         'catalysts': [],
         'sentiment': [],
         'sources': []
     })
 
-    # Define theme keywords
-    theme_keywords = {
-        'Space Connectivity': ['satellite', 'space', 'orbital', 'ASTS', 'direct-to-cell', 'LEO'],
-        'Custom AI Chips': ['ASIC', 'custom chip', 'AI accelerator', 'Broadcom', 'AVGO', 'alternative to nvidia'],
-        'Optical Interconnects': ['optical', 'photonics', 'POET', 'interconnect', 'data center bandwidth'],
-        'Nuclear Energy for AI': ['nuclear', 'SMR', 'small modular reactor', 'CEG', 'power generation', 'data center power'],
-        'Quantum Computing': ['quantum', 'qubit', 'IONQ', 'RGTI', 'quantum computing'],
-        'Reddit Platform': ['RDDT', 'reddit stock', 'social media AI', 'data monetization'],
-        'Copper & Materials': ['copper', 'FCX', 'critical materials', 'electrification'],
-        'Healthcare AI': ['biotech', 'healthcare AI', 'drug discovery', 'NBIS'],
-        'Small Cap Value': ['small cap', 'insider buying', 'value rotation', 'Russell 2000'],
-    }
-
-    for query_result in search_data:
-        content = query_result.get('content', '')
-
-        for theme_name, keywords in theme_keywords.items():
-            if any(keyword.lower() in content.lower() for keyword in keywords):
-                themes[theme_name]['mentions'] += 1
-                themes[theme_name]['sentiment'].append(analyze_sentiment(content))
-                themes[theme_name]['sources'].append(query_result.get('source', 'Unknown'))
+    if documents is None:
+        documents = analyze_documents(search_data)
 
-                # Extract tickers
-                tickers = extract_tickers_from_text(content)
-                themes[theme_name]['tickers'].update(tickers)
+    for document in documents:
+        for theme_name in document['themes']:
+            themes[theme_name]['mentions'] += 1
+            themes[theme_name]['copies'] += document.get('weight', 1)
+            themes[theme_name]['sentiment'].append(document['sentiment'])
+            themes[theme_name]['sources'].append(document['source'])
+            themes[theme_name]['tickers'].update(document['tickers'])
 
     return dict(themes)
 
-def generate_executive_summary(themes, ticker_data):
-    """Generate executive summary section"""
-    top_themes = sorted(themes.items(), key=lambda x: x[1]['mentions'], reverse=True)[:3]
+def write_executive_summary(out, themes, ticker_data):
+    """Write executive summary section"""
+    top_themes = heapq.nlargest(3, themes.items(), key=lambda x: x[1]['mentions'])
 
-    summary = "## Executive Summary\n\n"
-    summary += f"Analysis completed on {datetime.now().strftime('%B %d, %Y at %H:%M')}. "
-    summary += f"Analyzed {len(themes)} investment themes across {len(ticker_data)} tracked tickers.\n\n"
+    out.write("## Executive Summary\n\n")
+    out.write(f"Analysis completed on {datetime.now().strftime('%B %d, %Y at %H:%M')}. ")
+    out.write(f"Analyzed {len(themes)} investment themes across {len(ticker_data)} tracked tickers.\n\n")
 
-    summary += "**Top 3 Emerging Themes:**\n"
+    out.write("**Top 3 Emerging Themes:**\n")
     for i, (theme_name, data) in enumerate(top_themes, 1):
         sentiment_summary = Counter(data['sentiment']).most_common(1)[0][0] if data['sentiment'] else 'neutral'
-        summary += f"{i}. **{theme_name}** - {data['mentions']} mentions, {sentiment_summary} sentiment\n"
+        out.write(f"{i}. **{theme_name}** - {data['mentions']} mentions, {sentiment_summary} sentiment\n")
 
-    summary += "\n"
-    return summary
+    out.write("\n")
 
-def generate_theme_section(theme_name, theme_data, rank):
-    """Generate a detailed theme section"""
+def write_theme_section(out, theme_name, theme_data, rank):
+    """Write a detailed theme section"""
     conviction_stars = "🔥" * min(5, max(1, theme_data['mentions']))
 
-    section = f"\n## {rank}. {theme_name}\n"
-    section += f"**Signal Strength:** {conviction_stars}\n\n"
+    out.write(f"\n## {rank}. {theme_name}\n")
+    out.write(f"**Signal Strength:** {conviction_stars}\n\n")
 
     # Tickers
     if theme_data['tickers']:
-        section += "**High-Potential Tickers:**\n"
-        for ticker in sorted(theme_data['tickers']):
-            section += f"- **{ticker}**\n"
-        section += "\n"
+        out.write("**High-Potential Tickers:**\n")
+        out.bullets(f"**{ticker}**" for ticker in sorted(theme_data['tickers']))
+        out.write("\n")
 
     # Sentiment analysis
     sentiment_counts = Counter(theme_data['sentiment'])
     total = sum(sentiment_counts.values())
     if total > 0:
-        section += "**Market Sentiment:**\n"
+        out.write("**Market Sentiment:**\n")
         for sentiment, count in sentiment_counts.most_common():
             percentage = (count / total) * 100
-            section += f"- {sentiment.title()}: {percentage:.0f}%\n"
-        section += "\n"
+            out.write(f"- {sentiment.title()}: {percentage:.0f}%\n")
+        out.write("\n")
+
+    # Mention count (near-duplicate copies count once)
+    copies = theme_data.get('copies', theme_data['mentions'])
+    if copies > theme_data['mentions']:
+        out.write(f"**Data Points:** {theme_data['mentions']} mentions across sources "
+                  f"({copies} including near-duplicates)\n\n")
+    else:
+        out.write(f"**Data Points:** {theme_data['mentions']} mentions across sources\n\n")
 
-    # Mention count
-    section += f"**Data Points:** {theme_data['mentions']} mentions across sources\n\n"
+    out.write("---\n")
 
-    section += "---\n"
-    return section
+def write_ticker_momentum_table(out, ticker_data, previous_data=None, baselines=None):
+    """
+    Write ticker momentum analysis tables
 
-def generate_ticker_momentum_table(ticker_data, previous_data=None):
-    """Generate ticker momentum analysis table"""
-    section = "\n## Ticker Momentum Analysis\n\n"
+    Tickers are compared against their rolling baseline ({ticker: average mentions}
+    from MomentumEngine) when one exists, else against the previous report. Only
+    the rows shown are kept: the top 10 gaining / stable and top 5 losing tickers
+    by mentions, so large ticker universes never get fully sorted.
+    """
+    out.write("\n## Ticker Momentum Analysis\n\n")
+    baselines = baselines or {}
 
-    # Sort tickers by mentions
-    sorted_tickers = sorted(ticker_data.items(), key=lambda x: x[1]['mentions'], reverse=True)
+    def reference(ticker):
+        if ticker in baselines:
+            return baselines[ticker]
+        return previous_data.get(ticker, {}).get('mentions', 0) if previous_data else 0
 
     gaining = []
     stable = []
     losing = []
 
-    for ticker, data in sorted_tickers:
+    for ticker, data in ticker_data.items():
         mentions = data['mentions']
-        prev_mentions = previous_data.get(ticker, {}).get('mentions', 0) if previous_data else 0
+        prev_mentions = reference(ticker)
 
         if mentions > prev_mentions * 1.2:  # 20% increase
             gaining.append((ticker, mentions, data))
@@ -216,273 +315,294 @@ def generate_ticker_momentum_table(ticker_data, previous_data=None):
         else:
             stable.append((ticker, mentions, data))
 
+    by_mentions = lambda row: row[1]
+
     # Gaining momentum
     if gaining:
-        section += "### Gaining Momentum 📈\n\n"
-        section += "| Ticker | Mentions | Theme | Sentiment |\n"
-        section += "|--------|----------|-------|----------|\n"
-        for ticker, mentions, data in gaining[:10]:
-            section += f"| {ticker} | {mentions} | {data.get('theme', 'Multiple')} | {data.get('sentiment', 'neutral')} |\n"
-        section += "\n"
+        out.write("### Gaining Momentum 📈\n\n")
+        out.table(["Ticker", "Mentions", "Theme", "Sentiment"], (
+            (ticker, mentions, data.get('theme', 'Multiple'), data.get('sentiment', 'neutral'))
+            for ticker, mentions, data in heapq.nlargest(10, gaining, key=by_mentions)
+        ))
+        out.write("\n")
 
     # Stable
     if stable:
-        section += "### Stable Momentum ➡️\n\n"
-        section += "| Ticker | Mentions | Theme | Sentiment |\n"
-        section += "|--------|----------|-------|----------|\n"
-        for ticker, mentions, data in stable[:10]:
-            section += f"| {ticker} | {mentions} | {data.get('theme', 'Multiple')} | {data.get('sentiment', 'neutral')} |\n"
-        section += "\n"
+        out.write("### Stable Momentum ➡️\n\n")
+        out.table(["Ticker", "Mentions", "Theme", "Sentiment"], (
+            (ticker, mentions, data.get('theme', 'Multiple'), data.get('sentiment', 'neutral'))
+            for ticker, mentions, data in heapq.nlargest(10, stable, key=by_mentions)
+        ))
+        out.write("\n")
 
     # Losing
     if losing:
-        section += "### Losing Momentum 📉\n\n"
-        section += "| Ticker | Mentions | Previous | Change |\n"
-        section += "|--------|----------|----------|--------|\n"
-        for ticker, mentions, data in losing[:5]:
-            prev = previous_data.get(ticker, {}).get('mentions', 0) if previous_data else 0
+        def losing_row(ticker, mentions):
+            prev = reference(ticker)
             change = f"-{((prev - mentions) / prev * 100):.0f}%" if prev > 0 else "N/A"
-            section += f"| {ticker} | {mentions} | {prev} | {change} |\n"
-        section += "\n"
-
-    section += "---\n"
-    return section
-
-def generate_risk_section():
-    """Generate risk warnings section"""
-    section = "\n## Risk Management & Warnings\n\n"
-
-    section += "### Position Sizing Guidelines\n"
-    section += "- Maximum 5% per theme\n"
-    section += "- Maximum 2% per individual ticker (3% for Tier 1 conviction)\n"
-    section += "- Total Reddit-sourced exposure: <25% of portfolio\n\n"
-
-    section += "### Red Flags to Monitor\n"
-    section += "- Excessive hype language (\"guaranteed\", \"to the moon\")\n"
-    section += "- Mainstream media saturation (CNBC features)\n"
-    section += "- Insider selling during price run-ups\n"
-    section += "- Fundamental deterioration vs. original thesis\n\n"
-
-    section += "### Stop-Loss Discipline\n"
-    section += "- 15-20% stops on individual positions\n"
-    section += "- Trailing stops once position up 50%+\n"
-    section += "- Re-evaluate thesis if down >30%\n\n"
-
-    section += "---\n"
-    return section
-
-def generate_sources_section(search_queries, search_results):
-    """Generate data sources section"""
-    section = "\n## Data Sources & Methodology\n\n"
-
-    section += "This analysis aggregated signals from:\n"
-    section += "- Web search across financial news and Reddit discussions\n"
-    section += "- Multi-source ticker mention tracking\n"
-    section += "- Sentiment analysis of investment themes\n"
-    section += "- Cross-validation of catalysts and news\n\n"
-
-    section += "**Search Queries Executed:**\n"
-    for query in search_queries:
-        section += f"- {query}\n"
-    section += "\n"
-
-    section += f"**Total Data Points:** {len(search_results)} search results analyzed\n"
-    section += f"**Analysis Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-
-    section += "---\n"
-    return section
-
-def generate_disclaimer():
-    """Generate disclaimer section"""
-    disclaimer = "\n## Disclaimer\n\n"
-    disclaimer += "**IMPORTANT:** This analysis is for informational and educational purposes only. "
-    disclaimer += "It is NOT financial advice. Reddit sentiment can be manipulated by pump-and-dump schemes. "
-    disclaimer += "Always conduct independent due diligence, consider your risk tolerance, and consult "
-    disclaimer += "with qualified financial advisors before making investment decisions.\n\n"
-    disclaimer += "Past performance does not guarantee future results. All investments carry risk of loss.\n"
-    return disclaimer
-
-def generate_full_report(search_results, previous_data=None):
-    """Generate complete markdown report from search results"""
-
-    # Extract data from search results
-    themes = extract_themes_from_results(search_results)
-
-    # Build ticker data
-    ticker_data = defaultdict(lambda: {
-        'mentions': 0,
-        'theme': '',
-        'sentiment': 'neutral',
-        'tier': ''
-    })
+            return ticker, mentions, f"{prev:.1f}" if ticker in baselines else prev, change
+
+        out.write("### Losing Momentum 📉\n\n")
+        out.table(["Ticker", "Mentions", "Baseline" if baselines else "Previous", "Change"], (
+            losing_row(ticker, mentions)
+            for ticker, mentions, _ in heapq.nlargest(5, losing, key=by_mentions)
+        ))
+        out.write("\n")
+
+    out.write("---\n")
+
+def write_risk_section(out):
+    """Write risk warnings section"""
+    out.write("\n## Risk Management & Warnings\n\n")
+
+    out.write("### Position Sizing Guidelines\n")
+    out.write("- Maximum 5% per theme\n")
+    out.write("- Maximum 2% per individual ticker (3% for Tier 1 conviction)\n")
+    out.write("- Total Reddit-sourced exposure: <25% of portfolio\n\n")
+
+    out.write("### Red Flags to Monitor\n")
+    out.write("- Excessive hype language (\"guaranteed\", \"to the moon\")\n")
+    out.write("- Mainstream media saturation (CNBC features)\n")
+    out.write("- Insider selling during price run-ups\n")
+    out.write("- Fundamental deterioration vs. original thesis\n\n")
+
+    out.write("### Stop-Loss Discipline\n")
+    out.write("- 15-20% stops on individual positions\n")
+    out.write("- Trailing stops once position up 50%+\n")
+    out.write("- Re-evaluate thesis if down >30%\n\n")
+
+    out.write("---\n")
+
+def write_sources_section(out, search_queries, search_results):
+    """Write data sources section"""
+    out.write("\n## Data Sources & Methodology\n\n")
+
+    out.write("This analysis aggregated signals from:\n")
+    out.write("- Web search across financial news and Reddit discussions\n")
+    out.write("- Multi-source ticker mention tracking\n")
+    out.write("- Sentiment analysis of investment themes\n")
+    out.write("- Cross-validation of catalysts and news\n\n")
+
+    out.write("**Search Queries Executed:**\n")
+    out.bullets(search_queries)
+    out.write("\n")
+
+    out.write(f"**Total Data Points:** {len(search_results)} search results analyzed\n")
+    out.write(f"**Analysis Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+
+    out.write("---\n")
+
+def write_duplicates_section(out, clusters, search_results, limit=5):
+    """Write near-duplicate cluster statistics and the largest clusters"""
+    stats = clusters.stats()
+    out.write("\n## Near-Duplicate Content\n\n")
+    out.write(f"**Distinct Stories:** {stats['clusters']} of {stats['documents']} search results "
+              f"({stats['duplicates']} near-duplicates collapsed, "
+              f"similarity >= {clusters.threshold:.0%}); each story counts once in the mentions above\n\n")
+
+    largest = clusters.members(limit=limit)
+    if largest:
+        def row(members):
+            sources = sorted({search_results[i].get('source', 'Unknown') for i in members})
+            excerpt = " ".join(search_results[members[0]].get('content', '').split())[:80].replace("|", "/").strip()
+            return len(members), ", ".join(sources[:3]) + (" ..." if len(sources) > 3 else ""), excerpt
+
+        out.table(["Copies", "Sources", "Excerpt"], map(row, largest))
+        out.write("\n")
+
+    out.write("---\n")
+
+def write_disclaimer(out):
+    """Write disclaimer section"""
+    out.write("\n## Disclaimer\n\n")
+    out.write("**IMPORTANT:** This analysis is for informational and educational purposes only. ")
+    out.write("It is NOT financial advice. Reddit sentiment can be manipulated by pump-and-dump schemes. ")
+    out.write("Always conduct independent due diligence, consider your risk tolerance, and consult ")
+    out.write("with qualified financial advisors before making investment decisions.\n\n")
+    out.write("Past performance does not guarantee future results. All investments carry risk of loss.\n")
+
+def write_report_title(out):
+    """Write the report title block"""
+    date_str = datetime.now().strftime("%B %d, %Y")
+    out.write(f"# Reddit Capital Rotation Analysis - {date_str}\n\n")
+    out.write(f"*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n\n")
+    out.write("---\n\n")
+
+def write_top_themes(out, themes, limit=10):
+    """Write the top themes, ranked by conviction"""
+    out.write("\n# Top Investment Themes (Ranked by Conviction)\n\n")
+    ranked = heapq.nlargest(limit, themes.items(), key=lambda x: x[1]['mentions'])
+    for i, (theme_name, theme_data) in enumerate(ranked, 1):
+        write_theme_section(out, theme_name, theme_data, i)
+
+def build_report(search_results, previous_data=None, momentum_engine=None, clusters=None):
+    """
+    Analyze search results into the report model
 
-    for ticker in ALL_TICKERS:
-        mentions = 0
-        sentiments = []
-        associated_themes = []
+    Returns (sections, ticker_data, themes); sections render the markdown report
+    with report_renderer (render_to_string / render_to_file).
 
-        for result in search_results:
-            content = result.get('content', '')
-            if ticker in extract_tickers_from_text(content):
-                mentions += 1
-                sentiments.append(analyze_sentiment(content))
+    Near-duplicate results are clustered first (pass `clusters` from
+    cluster_results to reuse them) and only one result per cluster is analyzed,
+    so a syndicated story counts as one mention; 'copies' keeps the raw count.
 
-        # Find which theme this ticker belongs to
-        for theme_name, theme_data in themes.items():
-            if ticker in theme_data['tickers']:
-                associated_themes.append(theme_name)
+    With momentum_engine, today's mentions are recorded into it and tickers are
+    ranked against their 7-day rolling baseline (the caller saves the engine).
+    """
+    if clusters is None:
+        clusters = cluster_results(search_results)
+    representatives = clusters.representatives()
+    unique_results = [search_results[i] for i in representatives]
+
+    # Analyze each distinct result once, then fill themes and tickers from the features
+    documents = analyze_documents(unique_results)
+    for document, weight in zip(documents, clusters.weights().tolist()):
+        document['weight'] = weight
+    ticker_index = build_ticker_index(documents)
+    themes = extract_themes_from_results(unique_results, documents)
 
-        if mentions > 0:
-            ticker_data[ticker]['mentions'] = mentions
-            ticker_data[ticker]['sentiment'] = Counter(sentiments).most_common(1)[0][0] if sentiments else 'neutral'
-            ticker_data[ticker]['theme'] = associated_themes[0] if associated_themes else 'Multiple'
+    # Build ticker data
+    ticker_data = {}
 
-            # Assign tier
-            for tier, tickers in CONFIG['tickers'].items():
-                if ticker in tickers:
-                    ticker_data[ticker]['tier'] = tier
+    # First theme (in discovery order) that mentions each ticker
+    ticker_themes = {}
+    for theme_name, theme_data in themes.items():
+        for ticker in theme_data['tickers']:
+            ticker_themes.setdefault(ticker, theme_name)
 
-    # Sort themes by conviction
-    sorted_themes = sorted(themes.items(), key=lambda x: x[1]['mentions'], reverse=True)
+    ticker_tiers = SETTINGS.ticker_tiers
 
-    # Build report
-    date_str = datetime.now().strftime("%B %d, %Y")
-    report = f"# Reddit Capital Rotation Analysis - {date_str}\n\n"
-    report += f"*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n\n"
-    report += "---\n\n"
+    for ticker in SETTINGS.all_tickers:
+        positions = ticker_index.get(ticker)
+        if not positions:
+            continue
 
-    # Executive Summary
-    report += generate_executive_summary(themes, ticker_data)
-    report += "---\n"
+        sentiments = [documents[position]['sentiment'] for position in positions]
 
-    # Top 10 Themes
-    report += "\n# Top Investment Themes (Ranked by Conviction)\n\n"
-    for i, (theme_name, theme_data) in enumerate(sorted_themes[:10], 1):
-        report += generate_theme_section(theme_name, theme_data, i)
+        ticker_data[ticker] = {
+            'mentions': len(positions),
+            'copies': sum(documents[position]['weight'] for position in positions),
+            'theme': ticker_themes.get(ticker, 'Multiple'),
+            'sentiment': Counter(sentiments).most_common(1)[0][0],
+            'tier': ticker_tiers.get(ticker, ''),
+        }
 
     # Ticker momentum
-    report += generate_ticker_momentum_table(dict(ticker_data), previous_data)
-
-    # Risk section
-    report += generate_risk_section()
+    baselines = None
+    if momentum_engine is not None:
+        momentum_engine.record_day(datetime.now(), {t: data['mentions'] for t, data in ticker_data.items()})
+        baselines = momentum_engine.baseline_dict(MOMENTUM_WINDOW)
+
+    sections = [
+        write_report_title,
+        partial(write_executive_summary, themes=themes, ticker_data=ticker_data),
+        lambda out: out.write("---\n"),
+        partial(write_top_themes, themes=themes),
+        partial(write_ticker_momentum_table, ticker_data=ticker_data,
+                previous_data=previous_data, baselines=baselines),
+        write_risk_section,
+        partial(write_sources_section, search_queries=get_search_queries(), search_results=search_results),
+        partial(write_duplicates_section, clusters=clusters, search_results=search_results),
+        write_disclaimer,
+    ]
 
-    # Sources
-    report += generate_sources_section(get_search_queries(), search_results)
+    return sections, ticker_data, themes
 
-    # Disclaimer
-    report += generate_disclaimer()
+def generate_full_report(search_results, previous_data=None, momentum_engine=None):
+    """Generate complete markdown report from search results (as a string; see build_report)"""
+    sections, ticker_data, themes = build_report(search_results, previous_data, momentum_engine)
+    return render_to_string(sections), ticker_data, themes
 
-    return report, dict(ticker_data), themes
+def report_manifest():
+    """Manifest of saved reports (built from the reports folder on first use)"""
+    return open_manifest(SETTINGS.data_dir / "report_index.ndjson", SETTINGS.reports_dir)
 
-def save_report(content, filename=None):
-    """Save report to Obsidian vault"""
+def save_report(content, filename=None, stats=None):
+    """Save report to Obsidian vault (content: markdown text or renderer sections)"""
     if filename is None:
         filename = f"{datetime.now().strftime('%Y-%m-%d')}_live_analysis.md"
 
-    report_path = REPORTS_DIR / filename
+    report_path = SETTINGS.reports_dir / filename
 
-    with open(report_path, 'w') as f:
-        f.write(content)
+    if isinstance(content, str):
+        written = VAULT.write(report_path, content)
+    else:
+        written = VAULT.write_sections(report_path, content)
 
-    print(f"✅ Report saved to: {report_path}")
+    if written:
+        report_manifest().add(report_path, stats)
+        print(f"✅ Report saved to: {report_path}")
+    else:
+        print(f"⏭️  Report unchanged: {report_path}")
     return report_path
 
-def save_ticker_history(ticker_data):
-    """Append ticker data to history CSV"""
-    history_file = DATA_DIR / "ticker_history.csv"
-
-    file_exists = history_file.exists()
+def ticker_history_store():
+    """Open the ticker history store, migrating a legacy ticker_history.csv once"""
+    # pyarrow is only imported when history is actually read or written
+    from history_store import TickerHistoryStore, migrate_if_needed
 
-    with open(history_file, 'a', newline='') as f:
-        writer = csv.writer(f)
+    store = TickerHistoryStore(SETTINGS.data_dir / "ticker_history")
+    migrate_if_needed(SETTINGS.data_dir / "ticker_history.csv", store)
+    return store
 
-        if not file_exists:
-            writer.writerow(['date', 'ticker', 'mentions', 'tier', 'theme', 'sentiment'])
-
-        for ticker, data in ticker_data.items():
-            writer.writerow([
-                datetime.now().strftime("%Y-%m-%d"),
-                ticker,
-                data.get('mentions', 0),
-                data.get('tier', ''),
-                data.get('theme', ''),
-                data.get('sentiment', 'neutral')
-            ])
+def save_ticker_history(ticker_data):
+    """Append ticker data to the history store (one Parquet partition per date)"""
+    store = ticker_history_store()
+    store.append_snapshot(ticker_data)
 
-    print(f"✅ Ticker history updated: {history_file}")
+    print(f"✅ Ticker history updated: {store.root}")
 
 def save_theme_evolution(themes_data):
-    """Save theme evolution data to JSON"""
-    evolution_file = DATA_DIR / "theme_evolution.json"
-
-    # Load existing data
-    if evolution_file.exists():
-        with open(evolution_file, 'r') as f:
-            history = json.load(f)
-    else:
-        history = []
-
-    # Add current snapshot
-    history.append({
-        'date': datetime.now().strftime("%Y-%m-%d"),
-        'themes': {name: {
-            'mentions': data['mentions'],
-            'tickers': list(data['tickers']),
-            'sentiment': data['sentiment']
-        } for name, data in themes_data.items()}
-    })
-
-    # Save updated history
-    with open(evolution_file, 'w') as f:
-        json.dump(history, f, indent=2)
-
-    print(f"✅ Theme evolution updated: {evolution_file}")
-
-def load_previous_data():
-    """Load previous ticker data for comparison"""
-    history_file = DATA_DIR / "ticker_history.csv"
-
-    if not history_file.exists():
-        return None
-
-    previous_data = {}
-
-    with open(history_file, 'r') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-
-        # Get most recent date
-        if not rows:
-            return None
-
-        recent_date = max(row['date'] for row in rows)
-
-        # Get data from most recent date
-        for row in rows:
-            if row['date'] == recent_date:
-                previous_data[row['ticker']] = {
-                    'mentions': int(row['mentions']) if row['mentions'] else 0,
-                    'theme': row['theme'],
-                    'sentiment': row['sentiment']
-                }
+    """Append a compact theme snapshot to the append-only evolution log"""
+    log = ThemeEvolutionLog(SETTINGS.data_dir / "theme_evolution.ndjson")
+    migrate_theme_log(SETTINGS.data_dir / "theme_evolution.json", log)
+    log.append(themes_data)
+
+    print(f"✅ Theme evolution updated: {log.path}")
+
+def load_momentum_engine():
+    """Load the persisted rolling-baseline engine (empty on the first run)"""
+    from momentum import MomentumEngine
+    return MomentumEngine.load(SETTINGS.data_dir / "momentum_state.npz", SETTINGS.all_tickers)
+
+def save_momentum_engine(engine):
+    """Persist the rolling-baseline engine for the next run"""
+    path = SETTINGS.data_dir / "momentum_state.npz"
+    engine.save(path)
+
+    print(f"✅ Momentum baselines updated: {path}")
+
+def load_previous_data(runs_ago=0):
+    """Load previous ticker data for comparison (reads only the latest partition)"""
+    date, snapshot = ticker_history_store().latest_snapshot(runs_ago)
+
+    previous_data = {
+        ticker: {
+            'mentions': row['mentions'] or 0,
+            'theme': row['theme'],
+            'sentiment': row['sentiment']
+        }
+        for ticker, row in snapshot.items()
+    }
 
     return previous_data if previous_data else None
 
 def update_index():
-    """Update index file with links to all reports"""
-    reports = sorted(REPORTS_DIR.glob("*_analysis.md"), reverse=True)
+    """Update index file with links to all reports (from the manifest, not a directory listing)"""
+    entries = report_manifest().entries()
 
     index_content = f"""# Reddit Capital Rotation - Report Index
 
-*Last Updated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}*
+*Last Changed: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}*
 
 ## 📚 All Reports
 
 """
 
-    for report in reports:
+    for entry in entries:
+        report = Path(entry['file'])
         date_str = report.stem.replace("_analysis", "").replace("_live_analysis", "")
-        index_content += f"- [[{report.stem}|{date_str}]]\n"
+        index_content += f"- [[{report.stem}|{date_str}]]{headline(entry)}\n"
 
     index_content += """
 
@@ -496,19 +616,19 @@ def update_index():
 
 ## 📊 Data Files
 
-- [Ticker History CSV](data/ticker_history.csv)
-- [Theme Evolution JSON](data/theme_evolution.json)
+- [Ticker History (Parquet)](data/ticker_history/)
+- [Theme Evolution Log (NDJSON)](data/theme_evolution.ndjson)
 
 ---
 
 *Reports generated by Reddit Capital Rotation Strategy*
 """
 
-    index_path = REPORTS_DIR / "_index.md"
-    with open(index_path, 'w') as f:
-        f.write(index_content)
-
-    print(f"✅ Index updated: {index_path}")
+    index_path = SETTINGS.reports_dir / "_index.md"
+    if VAULT.write(index_path, index_content):
+        print(f"✅ Index updated: {index_path}")
+    else:
+        print(f"⏭️  Index unchanged: {index_path}")
 
 def main(search_results=None):
     """
@@ -518,55 +638,80 @@ def main(search_results=None):
         search_results: List of search result dictionaries with 'content' and 'source' keys
                        If None, will return empty template (for testing)
     """
+    require_settings()
+    VAULT.reset()
+
     print("="*70)
     print("Live Reddit Capital Rotation Report Generator")
     print("="*70)
     print()
 
-    # Setup
-    print("📁 Setting up directories...")
-    ensure_directories()
-    print()
-
-    # Load previous data for comparison
-    print("📊 Loading previous data...")
-    previous_data = load_previous_data()
-    if previous_data:
-        print(f"   Found {len(previous_data)} tickers from previous report")
-    print()
-
-    # Generate report with search results
-    if search_results is None:
-        print("⚠️  No search results provided - generating template")
-        search_results = []
-
-    print(f"📝 Analyzing {len(search_results)} search results...")
-    report_content, ticker_data, themes_data = generate_full_report(search_results, previous_data)
-    report_path = save_report(report_content)
-    print()
-
-    # Save tracking data
-    print("💾 Saving tracking data...")
-    save_ticker_history(ticker_data)
-    save_theme_evolution(themes_data)
-    print()
-
-    # Update index
-    print("📚 Updating index...")
-    update_index()
-    print()
+    with profiled_run('live_report', SETTINGS.profile):
+        # Setup
+        print("📁 Setting up directories...")
+        with span('setup'):
+            ensure_directories()
+        print()
+
+        # Load previous data for comparison
+        print("📊 Loading previous data...")
+        with span('load_previous_data'):
+            previous_data = load_previous_data()
+        if previous_data:
+            print(f"   Found {len(previous_data)} tickers from previous report")
+        with span('load_momentum_engine'):
+            momentum_engine = load_momentum_engine()
+        print()
+
+        # Generate report with search results
+        if search_results is None:
+            print("⚠️  No search results provided - generating template")
+            search_results = []
+
+        print(f"📝 Analyzing {len(search_results)} search results...")
+        with span('cluster_results', results=len(search_results)):
+            clusters = cluster_results(search_results)
+        duplicates = clusters.stats()['duplicates']
+        count_metric('search_results', len(search_results))
+        count_metric('near_duplicates', duplicates)
+        if duplicates:
+            print(f"   Collapsed {duplicates} near-duplicates into {len(clusters) - duplicates} distinct stories")
+        with span('build_report', results=len(search_results)):
+            report_sections, ticker_data, themes_data = build_report(search_results, previous_data, momentum_engine, clusters)
+        count_metric('tickers', len(ticker_data))
+        count_metric('themes', len(themes_data))
+        with span('save_report'):
+            report_path = save_report(report_sections, stats={"themes": len(themes_data), "tickers": len(ticker_data)})
+        print()
+
+        # Save tracking data
+        print("💾 Saving tracking data...")
+        with span('save_ticker_history'):
+            save_ticker_history(ticker_data)
+        with span('save_theme_evolution'):
+            save_theme_evolution(themes_data)
+        with span('save_momentum_engine'):
+            save_momentum_engine(momentum_engine)
+        print()
+
+        # Update index
+        print("📚 Updating index...")
+        with span('update_index'):
+            update_index()
+        VAULT.print_summary()
+        print()
 
     print("="*70)
     print("✅ Report generation complete!")
     print("="*70)
     print()
     print(f"📍 Report Location: {report_path}")
-    print(f"📍 Index: {REPORTS_DIR / '_index.md'}")
+    print(f"📍 Index: {SETTINGS.reports_dir / '_index.md'}")
     print()
     print(f"📊 Analysis Summary:")
     print(f"   - {len(themes_data)} themes identified")
     print(f"   - {len(ticker_data)} tickers tracked")
-    print(f"   - {len(search_results)} data points analyzed")
+    print(f"   - {len(search_results)} data points analyzed ({duplicates} near-duplicates collapsed)")
     print()
 
     return report_path
@@ -0,0 +1,250 @@
+"""
+Momentum Engine
+Rolling per-ticker mention baselines kept in fixed-size NumPy ring buffers
+"""
+
+import os
+from datetime import date as Date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Baseline windows, in days
+BASELINE_WINDOWS = (7, 30, 90)
+
+
+def parse_day(day):
+    """Accept a date, datetime or 'YYYY-MM-DD' string"""
+    if isinstance(day, datetime):
+        return day.date()
+    if isinstance(day, Date):
+        return day
+    return datetime.strptime(day, "%Y-%m-%d").date()
+
+
+def momentum_ratios(current, baseline):
+    """
+    Element-wise current / baseline for aligned arrays
+
+    Tickers without a baseline (zero or NaN) get NaN rather than a division error.
+    """
+    current = np.asarray(current, dtype=np.float64)
+    baseline = np.asarray(baseline, dtype=np.float64)
+
+    ratios = np.full(current.shape, np.nan)
+    np.divide(current, baseline, out=ratios, where=baseline > 0)
+    return ratios
+
+
+class MomentumEngine:
+    """
+    Daily mention counts per ticker in a (tickers x days) ring buffer.
+
+    The buffer holds max(windows) + 1 days. Running sums are kept for every
+    window, so recording a day only touches the column entering and the column
+    leaving each window: O(tickers) per day, independent of history length.
+    Baselines and momentum ratios for all tickers come out of one array
+    operation.
+
+    Days that were never recorded (no run that day) are tracked separately
+    from days with zero mentions, so gaps do not drag baselines down.
+    """
+
+    def __init__(self, tickers=(), windows=BASELINE_WINDOWS):
+        self.windows = tuple(sorted(windows))
+        self.capacity = self.windows[-1] + 1
+        self.tickers = []
+        self._rows = {}
+
+        self.counts = np.zeros((0, self.capacity), dtype=np.int64)
+        self.observed = np.zeros(self.capacity, dtype=bool)
+        self.sums = np.zeros((len(self.windows), 0), dtype=np.int64)
+        self.observed_days = np.zeros(len(self.windows), dtype=np.int64)
+
+        self.head = 0
+        self.latest_day = None
+        self.add_tickers(tickers)
+
+    def add_tickers(self, tickers):
+        """Add rows for tickers not tracked yet (their history starts at zero)"""
+        new = [ticker for ticker in dict.fromkeys(tickers) if ticker not in self._rows]
+        if not new:
+            return
+
+        for ticker in new:
+            self._rows[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+
+        self.counts = np.vstack([self.counts, np.zeros((len(new), self.capacity), dtype=np.int64)])
+        self.sums = np.hstack([self.sums, np.zeros((len(self.windows), len(new)), dtype=np.int64)])
+
+    def _vector(self, counts):
+        """Map {ticker: count} onto an array aligned with self.tickers"""
+        self.add_tickers(counts)
+
+        vector = np.zeros(len(self.tickers), dtype=np.int64)
+        for ticker, count in counts.items():
+            vector[self._rows[ticker]] = count
+        return vector
+
+    def _reset(self):
+        self.counts[:] = 0
+        self.observed[:] = False
+        self.sums[:] = 0
+        self.observed_days[:] = 0
+
+    def _advance(self, day):
+        """Move the head forward to `day`, retiring columns that leave each window"""
+        gap = (day - self.latest_day).days if self.latest_day else self.capacity
+
+        if gap >= self.capacity:
+            self._reset()
+            self.head = 0
+        else:
+            for _ in range(gap):
+                self.head = (self.head + 1) % self.capacity
+                for i, window in enumerate(self.windows):
+                    leaving = (self.head - window) % self.capacity
+                    self.sums[i] -= self.counts[:, leaving]
+                    self.observed_days[i] -= self.observed[leaving]
+
+                # The recycled column is older than every window: already retired
+                self.counts[:, self.head] = 0
+                self.observed[self.head] = False
+
+        self.latest_day = day
+
+    def record_day(self, day, counts):
+        """
+        Record one day's {ticker: mentions}, replacing anything recorded for it
+
+        New days advance the buffer; recording the latest day again (a second run
+        the same day) or an older day still inside the buffer updates it in place.
+        Returns False when the day is older than the buffer holds.
+        """
+        day = parse_day(day)
+        vector = self._vector(counts)
+
+        if self.latest_day is None or day > self.latest_day:
+            self._advance(day)
+
+        age = (self.latest_day - day).days
+        if age >= self.capacity:
+            return False
+
+        column = (self.head - age) % self.capacity
+        delta = vector - self.counts[:, column]
+        newly_observed = not self.observed[column]
+
+        self.counts[:, column] = vector
+        self.observed[column] = True
+        for i, window in enumerate(self.windows):
+            if age < window:
+                self.sums[i] += delta
+                self.observed_days[i] += newly_observed
+
+        return True
+
+    def record_days(self, daily_counts):
+        """Record {day: {ticker: mentions}} in date order"""
+        for day, counts in sorted(daily_counts.items(), key=lambda item: parse_day(item[0])):
+            self.record_day(day, counts)
+
+    def _window_index(self, window):
+        if window not in self.windows:
+            raise ValueError(f"window must be one of {self.windows}, got {window}")
+        return self.windows.index(window)
+
+    def latest_counts(self):
+        """Mentions recorded for the latest day, aligned with self.tickers"""
+        return self.counts[:, self.head].copy()
+
+    def baseline(self, window):
+        """
+        Mean daily mentions over the `window` days before the latest day
+
+        The latest day itself is excluded, so it can be compared against its own
+        baseline. Tickers are NaN until at least one earlier day was recorded.
+        """
+        i = self._window_index(window)
+        oldest = (self.head - window) % self.capacity
+
+        # Window ending yesterday = window ending today - today + the day that just left
+        prior_sum = self.sums[i] - self.counts[:, self.head] + self.counts[:, oldest]
+        prior_days = self.observed_days[i] - self.observed[self.head] + self.observed[oldest]
+
+        if prior_days <= 0:
+            return np.full(len(self.tickers), np.nan)
+        return prior_sum / prior_days
+
+    def baseline_dict(self, window, days=1):
+        """{ticker: baseline} scaled to a `days`-long period, for tickers with a baseline"""
+        baseline = self.baseline(window) * days
+        return {
+            ticker: float(value)
+            for ticker, value in zip(self.tickers, baseline)
+            if not np.isnan(value)
+        }
+
+    def momentum(self, window, current=None, days=1):
+        """
+        Momentum ratio for every ticker against its `window`-day baseline
+
+        `current` defaults to the latest day's counts; pass {ticker: mentions}
+        covering `days` days to compare a longer period (e.g. a 7-day total).
+        Returns (tickers, current, baseline, ratios), all aligned.
+        """
+        current = self.latest_counts() if current is None else self._vector(current)
+        baseline = self.baseline(window) * days
+        return list(self.tickers), current, baseline, momentum_ratios(current, baseline)
+
+    def save(self, path):
+        """Persist the buffer and running sums (np.savez, written atomically)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_path = path.with_name(f".{path.name}.tmp")
+        with open(temp_path, 'wb') as f:
+            np.savez(
+                f,
+                tickers=np.array(self.tickers, dtype=str),
+                windows=np.array(self.windows),
+                counts=self.counts,
+                observed=self.observed,
+                sums=self.sums,
+                observed_days=self.observed_days,
+                head=self.head,
+                latest_day=self.latest_day.isoformat() if self.latest_day else '',
+            )
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path, tickers=(), windows=BASELINE_WINDOWS):
+        """Load saved state, or start empty if there is none or its windows changed"""
+        path = Path(path)
+        engine = cls(windows=windows)
+
+        if path.exists():
+            with np.load(path) as state:
+                if tuple(state['windows']) == engine.windows:
+                    engine.tickers = state['tickers'].tolist()
+                    engine._rows = {ticker: row for row, ticker in enumerate(engine.tickers)}
+                    engine.counts = state['counts']
+                    engine.observed = state['observed']
+                    engine.sums = state['sums']
+                    engine.observed_days = state['observed_days']
+                    engine.head = int(state['head'])
+                    latest_day = str(state['latest_day'])
+                    engine.latest_day = parse_day(latest_day) if latest_day else None
+
+        engine.add_tickers(tickers)
+        return engine
+
+
+def calendar_days(first_day, last_day):
+    """Every day from first_day to last_day inclusive, as 'YYYY-MM-DD'"""
+    first_day, last_day = parse_day(first_day), parse_day(last_day)
+    return [
+        (first_day + timedelta(days=offset)).isoformat()
+        for offset in range((last_day - first_day).days + 1)
+    ]
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Reddit Monitor Daemon
+Long-running collection loop that keeps its state warm between cycles
+
+Compiled matchers, Reddit clients, the rate limiter, checkpoint aggregates, the
+seen-post filter, the momentum engine and the previous cycle's mentions all
+stay in memory. Each cycle
+only fetches what is new since the last one; state is written to disk every
+`checkpoint_every` cycles and on shutdown.
+
+Usage:
+    python3 scripts/monitor_daemon.py          # run on the configured interval
+    python3 scripts/monitor_daemon.py --once   # one cycle, then checkpoint and exit
+"""
+
+import signal
+import sys
+import time
+import traceback
+from collections import Counter
+from pathlib import Path
+
+import schedule
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import reddit_monitor
+from momentum import MomentumEngine
+from rate_limiter import reddit_rate_limiter
+from run_profile import profiled_run, span
+from seen_posts import SeenPosts
+from settings import ConfigError, get_settings
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+# Overridable from the "daemon" block of config.json
+DAEMON_DEFAULTS = {
+    'interval_minutes': 15,
+    'checkpoint_every': 4,
+    'lookback_days': 7,
+    'include_comments': False,
+}
+
+# Momentum alerts compare the lookback window against this baseline (days)
+MOMENTUM_BASELINE_DAYS = 30
+
+
+def load_daemon_settings(settings=None):
+    """
+    Daemon settings and subreddits from config.json, falling back to defaults
+
+    The config is read through settings (get_settings() by default), the same
+    view the report generators use; without a config.json the daemon runs on
+    the defaults.
+    """
+    settings = get_settings() if settings is None else settings
+    options = dict(DAEMON_DEFAULTS)
+    options['subreddits'] = reddit_monitor.SUBREDDITS
+    options['profile'] = {}
+
+    try:
+        options.update(settings.daemon)
+        options['subreddits'] = settings.config.get('subreddits', options['subreddits'])
+        options['profile'] = settings.profile
+    except ConfigError:
+        pass
+
+    return options
+
+
+class MonitorDaemon:
+    """
+    Warm collection state plus the per-cycle pipeline
+
+    run_cycle() is the unit of work: incremental collection, then analysis
+    entirely from memory (momentum engine update, momentum signals, anomaly
+    scoring, changes vs. the previous cycle). checkpoint() persists it.
+    """
+
+    def __init__(self, reddit_factory=None, subreddits=None, lookback_days=7,
+                 checkpoint_every=4, include_comments=False,
+                 checkpoint_file=reddit_monitor.CHECKPOINT_FILE,
+                 momentum_file=reddit_monitor.MOMENTUM_STATE_FILE,
+                 report_file=DATA_DIR / 'daily_report.txt', profile=None):
+        self.reddit_factory = reddit_factory or reddit_monitor.setup_reddit
+        self.subreddits = list(subreddits or reddit_monitor.SUBREDDITS)
+        self.lookback_days = lookback_days
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.include_comments = include_comments
+        self.checkpoint_file = Path(checkpoint_file)
+        self.momentum_file = Path(momentum_file)
+        self.report_file = Path(report_file)
+        self.profile = profile or {}
+
+        # Loaded once; every cycle after this works from memory
+        self.checkpoints = reddit_monitor.load_checkpoints(self.checkpoint_file)
+        self.engine = MomentumEngine.load(self.momentum_file, reddit_monitor.ALL_TICKERS)
+        self.seen_file = self.checkpoint_file.with_name(reddit_monitor.SEEN_POSTS_FILE.name)
+        self.seen = SeenPosts.load(self.seen_file)
+        self.rate_limiter = reddit_rate_limiter()
+        self.clients = {}
+
+        self.cycles = 0
+        self.failures = 0
+        self.mentions = Counter()
+        self.previous = None
+        self.momentum = {}
+        self.anomalies = []
+        self.dirty = False
+
+    def run_cycle(self):
+        """
+        Collect new posts and refresh every signal; returns the cycle's timings
+
+        With a "profile" block enabled, each cycle writes its own run profile
+        (monitor_cycle-<timestamp>.json).
+        """
+        with profiled_run('monitor_cycle', self.profile):
+            return self._run_cycle()
+
+    def run_scheduled_cycle(self):
+        """
+        run_cycle() for the scheduler: a failed cycle is logged and counted, not raised
+
+        An exception escaping a job would stop schedule.run_pending() and with it the
+        daemon, so one bad cycle (Reddit down, a full disk) only costs that cycle.
+        Returns the cycle's timings, or None if it failed.
+        """
+        try:
+            return self.run_cycle()
+        except Exception as e:
+            self.failures += 1
+            print(f"❌ Cycle {self.cycles + 1} failed ({self.failures} so far): {e.__class__.__name__}: {e}")
+            traceback.print_exc()
+            return None
+
+    def _run_cycle(self):
+        start = time.perf_counter()
+        mentions, _ = reddit_monitor.collect_subreddits(
+            self.reddit_factory, self.subreddits, self.lookback_days,
+            rate_limiter=self.rate_limiter, include_comments=self.include_comments,
+            checkpoints=self.checkpoints, clients=self.clients, seen=self.seen
+        )
+        collected = time.perf_counter()
+
+        with span('analysis'):
+            reddit_monitor.record_checkpoints(self.engine, self.checkpoints)
+            baseline = self.engine.baseline_dict(MOMENTUM_BASELINE_DAYS, days=self.lookback_days)
+            self.momentum = reddit_monitor.calculate_momentum(mentions, baseline)
+            self.anomalies = reddit_monitor.detect_anomalies(checkpoints=self.checkpoints)
+
+        self.previous = self.mentions if self.cycles else None
+        self.mentions = mentions
+        analysed = time.perf_counter()
+
+        self.cycles += 1
+        self.dirty = True
+        timings = {'collect': collected - start, 'analysis': analysed - collected}
+        self.print_cycle(timings)
+
+        if self.cycles % self.checkpoint_every == 0:
+            with span('checkpoint'):
+                self.checkpoint()
+
+        return timings
+
+    def changes(self, top_n=5):
+        """Largest mention changes vs. the previous cycle, as [(ticker, delta)]"""
+        if self.previous is None:
+            return []
+
+        delta = Counter(self.mentions)
+        delta.subtract(self.previous)
+        moved = [(ticker, change) for ticker, change in delta.items() if change]
+        return sorted(moved, key=lambda item: abs(item[1]), reverse=True)[:top_n]
+
+    def print_cycle(self, timings):
+        print(f"🔄 Cycle {self.cycles}: {sum(self.mentions.values())} mentions, "
+              f"{len(self.momentum)} momentum / {len(self.anomalies)} anomaly alerts "
+              f"(collect {timings['collect'] * 1000:.0f} ms, analysis {timings['analysis'] * 1000:.1f} ms)")
+
+        moved = self.changes()
+        if moved:
+            print("   " + ", ".join(f"{ticker} {change:+d}" for ticker, change in moved))
+
+    def checkpoint(self):
+        """Persist checkpoints, the seen-post filter and momentum state and write the report"""
+        if not self.dirty:
+            return
+
+        reddit_monitor.save_checkpoints(self.checkpoints, self.checkpoint_file)
+        self.seen.save(self.seen_file)
+        self.engine.save(self.momentum_file)
+
+        self.report_file.parent.mkdir(parents=True, exist_ok=True)
+        reddit_monitor.write_report(self.mentions, self.momentum, self.report_file, self.anomalies)
+        self.dirty = False
+        print(f"💾 Checkpoint saved after cycle {self.cycles}")
+
+    def run_forever(self, interval_minutes=15):
+        """Run a cycle now and then every interval until SIGINT/SIGTERM, surviving failed cycles"""
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+
+        schedule.every(interval_minutes).minutes.do(self.run_scheduled_cycle)
+        print(f"🚀 Monitoring {len(self.subreddits)} subreddits every {interval_minutes} minutes")
+
+        try:
+            self.run_scheduled_cycle()
+            while not stopping:
+                schedule.run_pending()
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            schedule.clear()
+            self.checkpoint()
+            print("👋 Monitor stopped")
+
+
+def main(args=None):
+    """Start the daemon with settings from config.json"""
+    args = sys.argv[1:] if args is None else args
+    settings = load_daemon_settings()
+
+    daemon = MonitorDaemon(
+        subreddits=settings['subreddits'],
+        lookback_days=settings['lookback_days'],
+        checkpoint_every=settings['checkpoint_every'],
+        include_comments=settings['include_comments'],
+        profile=settings['profile'],
+    )
+
+    if "--once" in args:
+        daemon.run_cycle()
+        daemon.checkpoint()
+    else:
+        daemon.run_forever(settings['interval_minutes'])
+
+if __name__ == "__main__":
+    main()
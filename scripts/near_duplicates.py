@@ -0,0 +1,297 @@
+"""
+Near-Duplicate Clustering
+MinHash + LSH clustering of near-identical documents (syndicated articles,
+copy-pasted pump posts), so each story is counted once
+
+Documents are shingled into word 3-grams and summarised by NUM_PERM min-hashes.
+Signatures are split into bands; documents sharing any band bucket are
+candidates, and candidates whose estimated Jaccard similarity reaches the
+threshold are joined. Work grows with the number of documents plus the number
+of candidate pairs, never with all pairs, so a million documents cluster in
+seconds instead of the ~5 * 10^11 comparisons of the naive approach.
+"""
+
+import numpy as np
+
+# Jaccard similarity (of word 3-gram sets) at which two documents are one story
+DUPLICATE_THRESHOLD = 0.7
+
+# Min-hashes per document, and words per shingle
+NUM_PERM = 64
+SHINGLE_WORDS = 3
+
+# Band selection favours recall: candidates below the threshold are dropped again
+# by verification, so a false positive only costs time, a false negative a miscount
+FALSE_NEGATIVE_WEIGHT = 0.9
+
+# Documents tokenized per block (bounds the per-byte temporaries of word_hashes)
+DOCUMENT_BLOCK = 8192
+
+# Shingles hashed per block; keeps the (NUM_PERM x block) uint64 temporary in cache (~8 MB)
+CHUNK_SHINGLES = 1 << 14
+
+# Only the low byte of each min-hash is kept for verification (b-bit minwise hashing)
+SIGNATURE_BITS = 8
+
+# Bytes that make up words (after lower-casing): letters, digits, $ and ', and any non-ASCII byte
+WORD_BYTES = np.zeros(256, dtype=bool)
+WORD_BYTES[[ord(c) for c in "abcdefghijklmnopqrstuvwxyz0123456789$'"]] = True
+WORD_BYTES[128:] = True
+
+# Odd base of the polynomial word hash, and its inverse modulo 2^64
+HASH_BASE = 0x100000001B3
+HASH_BASE_INVERSE = pow(HASH_BASE, -1, 1 << 64)
+
+# Odd 64-bit multipliers that mix the word hashes of a shingle
+SHINGLE_MIXERS = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9], dtype=np.uint64)
+
+
+def band_parameters(threshold=DUPLICATE_THRESHOLD, num_perm=NUM_PERM):
+    """
+    (bands, rows) for LSH over num_perm min-hashes
+
+    Two documents with similarity s share a bucket with probability
+    1 - (1 - s^rows)^bands; this picks the split whose S-curve misclassifies the
+    least probability mass on either side of the threshold, with missed pairs
+    weighted by FALSE_NEGATIVE_WEIGHT.
+    """
+    best, best_error = (1, num_perm), None
+    below = np.linspace(0.0, threshold, 200)
+    above = np.linspace(threshold, 1.0, 200)
+
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        false_positive = np.mean(1 - (1 - below ** rows) ** bands) * threshold
+        false_negative = np.mean((1 - above ** rows) ** bands) * (1 - threshold)
+        error = (1 - FALSE_NEGATIVE_WEIGHT) * false_positive + FALSE_NEGATIVE_WEIGHT * false_negative
+        if best_error is None or error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+_POWERS = {}
+
+def base_powers(count):
+    """HASH_BASE^i and HASH_BASE^-i for i < count (modulo 2^64), cached and grown on demand"""
+    if _POWERS.get('count', 0) < count:
+        count = max(count, 2 * _POWERS.get('count', 0))
+        for key, base in (('powers', HASH_BASE), ('inverse', HASH_BASE_INVERSE)):
+            values = np.full(count, base, dtype=np.uint64)
+            values[0] = 1
+            _POWERS[key] = np.cumprod(values)
+        _POWERS['count'] = count
+    return _POWERS['powers'], _POWERS['inverse']
+
+def word_hashes(texts):
+    """
+    64-bit hashes of every document's words, flattened, plus each document's word count
+
+    The texts are lower-cased, encoded and joined into one byte array; words are
+    the runs of WORD_BYTES, and each is hashed as a polynomial over its bytes
+    taken from prefix sums, so no Python code runs per word. Call it on blocks
+    of documents: it needs ~30 bytes of temporaries per byte of text.
+    """
+    pieces = [text.lower().encode('utf-8') if text else b"" for text in texts]
+    sizes = np.fromiter(map(len, pieces), dtype=np.int64, count=len(pieces))
+    data = np.frombuffer(b" ".join(pieces), dtype=np.uint8)
+    del pieces
+
+    padded = np.zeros(len(data) + 2, dtype=bool)
+    padded[1:-1] = np.take(WORD_BYTES, data)
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    starts, ends = edges[0::2], edges[1::2]
+    del padded, edges
+
+    # sum(byte_j * BASE^(j - start)) = (prefix[end] - prefix[start]) * BASE^start
+    # with prefix[i] = sum(byte_j * BASE^-j) (BASE is odd, so invertible modulo 2^64)
+    powers, inverse = base_powers(len(data) + 1)
+    prefix = np.zeros(len(data) + 1, dtype=np.uint64)
+    np.multiply(data, inverse[:len(data)], out=prefix[1:])
+    np.cumsum(prefix[1:], out=prefix[1:])
+    hashes = (prefix[ends] - prefix[starts]) * powers[starts] + (ends - starts).astype(np.uint64)
+
+    # Each document is followed by one separator byte
+    document_ends = np.cumsum(sizes + 1)
+    lengths = np.diff(np.searchsorted(starts, document_ends), prepend=0)
+    return hashes, lengths
+
+def shingle_hashes(words, lengths, size=SHINGLE_WORDS):
+    """
+    32-bit hashes of every document's word n-grams, flattened, plus per-document counts
+
+    A document shorter than `size` words contributes one shingle of all its words.
+    """
+    ends = np.repeat(np.cumsum(lengths), lengths)
+    starts = ends - np.repeat(lengths, lengths)
+    positions = np.arange(len(words))
+
+    mixed = np.zeros(len(words), dtype=np.uint64)
+    for offset in range(size):
+        shifted = np.zeros(len(words), dtype=np.uint64)
+        shifted[:len(words) - offset] = words[offset:]
+        shifted *= SHINGLE_MIXERS[offset]
+        shifted[positions + offset >= ends] = 0
+        mixed ^= shifted
+    del shifted
+
+    valid = (positions <= ends - size) | ((positions == starts) & (ends - starts < size))
+    mixed = mixed[valid]
+    hashes = ((mixed >> np.uint64(32)) ^ mixed).astype(np.uint32)
+
+    counts = np.minimum(lengths, np.maximum(lengths - size + 1, 1))
+    return hashes, counts
+
+def minhash_chunks(shingles, counts, num_perm=NUM_PERM, seed=1):
+    """
+    Yield (document indices, uint32 signatures) for every document with shingles
+
+    Each permutation is a multiply-shift hash (a * x + b) >> 32 with random odd
+    64-bit a; the signature is its minimum over the document's shingles, taken
+    for a block of documents at once with np.minimum.reduceat.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 1 << 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+
+    documents = np.flatnonzero(counts)
+    offsets = np.concatenate(([0], np.cumsum(counts[documents])))
+
+    first = 0
+    while first < len(documents):
+        # Whole documents per block, at least one
+        last = max(first + 1, int(np.searchsorted(offsets, offsets[first] + CHUNK_SHINGLES, side='right')) - 1)
+        block = shingles[offsets[first]:offsets[last]].astype(np.uint64)
+
+        hashed = (a[:, None] * block[None, :] + b[:, None]) >> np.uint64(32)
+        starts = offsets[first:last] - offsets[first]
+        signatures = np.minimum.reduceat(hashed, starts, axis=1).T.astype(np.uint32)
+
+        yield documents[first:last], signatures
+        first = last
+
+def connected_labels(size, left, right):
+    """
+    Component label (its lowest index) of every node, from edge lists
+
+    Vectorised union-find: every edge hooks the larger root under the smaller,
+    then pointer jumping flattens the trees; repeated until each edge's ends share a root.
+    """
+    labels = np.arange(size)
+    while True:
+        left_roots, right_roots = labels[left], labels[right]
+        if np.array_equal(left_roots, right_roots):
+            return labels
+
+        low = np.minimum(left_roots, right_roots)
+        np.minimum.at(labels, left_roots, low)
+        np.minimum.at(labels, right_roots, low)
+
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+
+class NearDuplicateClusters:
+    """
+    Clusters of near-identical documents; labels[i] is the first document of i's cluster
+
+    The first document of a cluster is its representative: analysing only the
+    representatives counts each story once, and weights() says how many
+    copies each one stands for.
+    """
+
+    def __init__(self, labels, threshold=DUPLICATE_THRESHOLD):
+        self.labels = labels
+        self.threshold = threshold
+        self.sizes = np.bincount(labels, minlength=len(labels))
+
+    def __len__(self):
+        return len(self.labels)
+
+    def representatives(self):
+        """Indices of the first document of every cluster, in input order"""
+        return np.flatnonzero(self.labels == np.arange(len(self.labels)))
+
+    def weights(self):
+        """Copies behind each representative, aligned with representatives()"""
+        return self.sizes[self.representatives()]
+
+    def members(self, min_size=2, limit=None):
+        """[indices] of the clusters with at least min_size documents, largest first"""
+        clustered = np.flatnonzero(self.sizes[self.labels] >= min_size)
+        order = clustered[np.argsort(self.labels[clustered], kind='stable')]
+        split = np.flatnonzero(np.diff(self.labels[order])) + 1
+        groups = np.split(order, split) if len(order) else []
+        groups.sort(key=lambda group: (-len(group), group[0]))
+        return groups[:limit] if limit is not None else groups
+
+    def stats(self):
+        """Documents, clusters, near-duplicates collapsed, and the largest cluster"""
+        documents = len(self.labels)
+        clusters = len(self.representatives())
+        return {
+            'documents': documents,
+            'clusters': clusters,
+            'duplicates': documents - clusters,
+            'largest': int(self.sizes.max()) if documents else 0,
+        }
+
+
+def cluster_near_duplicates(texts, threshold=DUPLICATE_THRESHOLD, num_perm=NUM_PERM, seed=1):
+    """
+    Cluster texts whose word 3-gram Jaccard similarity is at least threshold
+
+    Returns NearDuplicateClusters. Empty documents are never clustered.
+    """
+    texts = list(texts)
+    size = len(texts)
+    bands, rows = band_parameters(threshold, num_perm)
+
+    shingles, counts = [], []
+    for start in range(0, size, DOCUMENT_BLOCK):
+        block_shingles, block_counts = shingle_hashes(*word_hashes(texts[start:start + DOCUMENT_BLOCK]))
+        shingles.append(block_shingles)
+        counts.append(block_counts)
+    shingles = np.concatenate(shingles) if shingles else np.zeros(0, dtype=np.uint32)
+    counts = np.concatenate(counts) if counts else np.zeros(0, dtype=np.int64)
+
+    # Per document: one 64-bit key per band, and the low byte of each min-hash
+    band_keys = np.zeros((size, bands), dtype=np.uint64)
+    signatures = np.zeros((size, num_perm), dtype=np.uint8)
+    mixers = np.random.default_rng(seed + 1).integers(1, 1 << 63, size=rows, dtype=np.uint64) | np.uint64(1)
+
+    for documents, block in minhash_chunks(shingles, counts, num_perm, seed):
+        signatures[documents] = block
+        for band in range(bands):
+            columns = block[:, band * rows:(band + 1) * rows].astype(np.uint64)
+            band_keys[documents, band] = (columns * mixers).sum(axis=1)
+
+    # Candidates: every document sharing a bucket is paired with the bucket's first document
+    hashed = np.flatnonzero(counts)
+    left, right = [], []
+    for band in range(bands):
+        keys = band_keys[hashed, band]
+        order = hashed[np.argsort(keys, kind='stable')]
+        sorted_keys = band_keys[order, band]
+        starts = np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))
+        firsts = order[np.flatnonzero(starts)[np.cumsum(starts) - 1]]
+        paired = firsts != order
+        left.append(firsts[paired])
+        right.append(order[paired])
+    del band_keys
+
+    left = np.concatenate(left) if left else np.zeros(0, dtype=np.int64)
+    right = np.concatenate(right) if right else np.zeros(0, dtype=np.int64)
+    pairs = np.unique(left.astype(np.int64) * size + right)
+    left, right = pairs // size, pairs % size
+
+    # Verify: the fraction of agreeing b-bit min-hashes, corrected for chance collisions
+    chance = 1.0 / (1 << SIGNATURE_BITS)
+    keep = np.zeros(len(pairs), dtype=bool)
+    for start in range(0, len(pairs), CHUNK_SHINGLES):
+        stop = start + CHUNK_SHINGLES
+        agree = (signatures[left[start:stop]] == signatures[right[start:stop]]).mean(axis=1)
+        keep[start:stop] = (agree - chance) / (1 - chance) >= threshold
+
+    return NearDuplicateClusters(connected_labels(size, left[keep], right[keep]), threshold)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Raw Post Archive
+Append-only archive of raw posts in gzip-compressed NDJSON segments, with a
+fixed-width offset index (post id hash, timestamp, segment, block) that is
+memory-mapped for lookups and time-range reads
+
+Usage:
+    python3 scripts/post_archive.py stats data/post_archive
+    python3 scripts/post_archive.py read data/post_archive 2026-01-01 2026-01-31
+"""
+
+import gzip
+import hashlib
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+# A new segment starts each UTC day, or once the current one reaches this size
+SEGMENT_BYTES = 32 * 1024 * 1024
+
+# Posts per gzip member; a random read decompresses at most one block
+BLOCK_POSTS = 256
+
+# One 32-byte index record per archived post
+INDEX_DTYPE = np.dtype([
+    ('id', '<u8'),          # 64-bit hash of the post id (see post_key)
+    ('ts', '<i8'),          # post timestamp, unix seconds
+    ('offset', '<u8'),      # byte offset of the post's block in its segment
+    ('segment', '<u4'),     # line number of the segment in segments.txt
+    ('length', '<u4'),      # compressed block length
+])
+
+
+def post_key(post):
+    """Stable identity of a post: its id, else its URL, else subreddit + title"""
+    key = post.get('id') or post.get('url') or f"{post.get('subreddit', '')}/{post.get('title', '')}"
+    return str(key)
+
+def key_hash(key):
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+def post_timestamp(post, default):
+    """created_utc (or created) in unix seconds, else the archive time"""
+    created = post.get('created_utc', post.get('created'))
+    try:
+        return int(float(created))
+    except (TypeError, ValueError):
+        return default
+
+def to_timestamp(value):
+    """Accept unix seconds, a datetime/date or an ISO 'YYYY-MM-DD[THH:MM:SS]' string (UTC)"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+class PostArchive:
+    """
+    Directory of compressed NDJSON segments plus `index.bin` and `segments.txt`.
+
+    append() writes posts in blocks of BLOCK_POSTS, each block one gzip member,
+    and appends one INDEX_DTYPE record per post. Posts whose id is already
+    archived are skipped, so overlapping scans can be archived as they come.
+    Readers memory-map the index, select rows with NumPy (by id hash or
+    timestamp range) and decompress only the blocks those rows point to.
+    """
+
+    def __init__(self, root, segment_bytes=SEGMENT_BYTES, block_posts=BLOCK_POSTS):
+        self.root = Path(root)
+        self.segment_bytes = segment_bytes
+        self.block_posts = block_posts
+        self.index_path = self.root / "index.bin"
+        self.segments_path = self.root / "segments.txt"
+
+    def segments(self):
+        """Segment file names, in creation order"""
+        if not self.segments_path.exists():
+            return []
+        return self.segments_path.read_text().split()
+
+    def index(self):
+        """The memory-mapped index (read-only; an empty array when nothing is archived)"""
+        if not self.index_path.exists() or self.index_path.stat().st_size < INDEX_DTYPE.itemsize:
+            return np.zeros(0, dtype=INDEX_DTYPE)
+
+        count = self.index_path.stat().st_size // INDEX_DTYPE.itemsize
+        return np.memmap(self.index_path, dtype=INDEX_DTYPE, mode='r', shape=(count,))
+
+    def _segment_for(self, day):
+        """(segment number, path) to append to, starting a new segment when needed"""
+        segments = self.segments()
+        if segments:
+            name = segments[-1]
+            path = self.root / name
+            if name.startswith(day) and (not path.exists() or path.stat().st_size < self.segment_bytes):
+                return len(segments) - 1, path
+
+        sequence = sum(1 for name in segments if name.startswith(day))
+        name = f"{day}.{sequence:03d}.ndjson.gz"
+        with open(self.segments_path, 'a') as f:
+            f.write(name + "\n")
+        return len(segments), self.root / name
+
+    def append(self, posts, now=None):
+        """Archive posts not archived yet; returns the number written"""
+        now = now or datetime.now(timezone.utc)
+        archived_at = int(now.timestamp())
+
+        keys = [key_hash(post_key(post)) for post in posts]
+        existing = self.index()['id']
+        seen = set(existing[np.isin(existing, np.array(keys, dtype=np.uint64))].tolist())
+        del existing
+
+        new = []
+        for key, post in zip(keys, posts):
+            if key not in seen:
+                seen.add(key)
+                new.append((key, post))
+        if not new:
+            return 0
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        segment, path = self._segment_for(now.strftime("%Y-%m-%d"))
+        records = np.zeros(len(new), dtype=INDEX_DTYPE)
+
+        with open(path, 'ab') as f:
+            for start in range(0, len(new), self.block_posts):
+                block = new[start:start + self.block_posts]
+                lines = "".join(json.dumps(post, separators=(',', ':')) + "\n" for _, post in block)
+                data = gzip.compress(lines.encode('utf-8'), mtime=0)
+
+                offset = f.tell()
+                f.write(data)
+
+                rows = records[start:start + len(block)]
+                rows['id'] = [key for key, _ in block]
+                rows['ts'] = [post_timestamp(post, archived_at) for _, post in block]
+                rows['offset'] = offset
+                rows['segment'] = segment
+                rows['length'] = len(data)
+
+        # Index last: a crash between the two leaves unindexed bytes, never dangling records
+        with open(self.index_path, 'ab') as f:
+            f.write(records.tobytes())
+
+        return len(new)
+
+    def _blocks(self, rows):
+        """
+        Yield (id hashes, post lines) per block referenced by index rows
+
+        Blocks are visited in file order and each is decompressed once, however
+        many of its posts were selected.
+        """
+        if not len(rows):
+            return
+
+        segments = self.segments()
+        rows = rows[np.lexsort((rows['offset'], rows['segment']))]
+        changes = (np.diff(rows['segment'].astype(np.int64)) != 0) | (np.diff(rows['offset'].astype(np.int64)) != 0)
+        handle, handle_segment = None, None
+
+        try:
+            for group in np.split(rows, np.flatnonzero(changes) + 1):
+                segment = int(group['segment'][0])
+                if segment != handle_segment:
+                    if handle:
+                        handle.close()
+                    handle, handle_segment = open(self.root / segments[segment], 'rb'), segment
+
+                handle.seek(int(group['offset'][0]))
+                data = gzip.decompress(handle.read(int(group['length'][0])))
+                yield set(group['id'].tolist()), data.decode('utf-8').splitlines()
+        finally:
+            if handle:
+                handle.close()
+
+    def get(self, post_id):
+        """A post by its post_key (id, else URL), or None"""
+        index = self.index()
+        matches = np.flatnonzero(index['id'] == np.uint64(key_hash(str(post_id))))
+
+        for _, lines in self._blocks(np.asarray(index[matches])):
+            for line in lines:
+                post = json.loads(line)
+                if post_key(post) == str(post_id):
+                    return post
+        return None
+
+    def read(self, start=None, end=None):
+        """
+        Stream posts with start <= timestamp < end (unix seconds, datetimes or
+        ISO dates), in archive order; only blocks holding matching posts are read
+        """
+        index = self.index()
+        start, end = to_timestamp(start), to_timestamp(end)
+
+        wanted = np.ones(len(index), dtype=bool)
+        if start is not None:
+            wanted &= index['ts'] >= start
+        if end is not None:
+            wanted &= index['ts'] < end
+
+        for ids, lines in self._blocks(np.asarray(index[wanted])):
+            for line in lines:
+                post = json.loads(line)
+                if key_hash(post_key(post)) in ids:
+                    yield post
+
+    def stats(self):
+        """Posts, segments and bytes on disk (compressed)"""
+        segments = self.segments()
+        size = sum((self.root / name).stat().st_size for name in segments if (self.root / name).exists())
+        return {'posts': len(self.index()), 'segments': len(segments), 'bytes': size}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("stats", "read"):
+        print(__doc__)
+        sys.exit(1)
+
+    archive = PostArchive(sys.argv[2])
+    if sys.argv[1] == "stats":
+        stats = archive.stats()
+        print(f"📦 {stats['posts']} posts in {stats['segments']} segments ({stats['bytes'] / 1024 / 1024:.1f} MB)")
+    else:
+        start = sys.argv[3] if len(sys.argv) > 3 else None
+        end = sys.argv[4] if len(sys.argv) > 4 else None
+        for post in archive.read(start, end):
+            print(json.dumps(post))
@@ -0,0 +1,61 @@
+"""
+Rate Limiter
+Thread-safe token bucket shared by every worker that talks to the same API client
+"""
+
+import threading
+import time
+
+# Reddit allows 100 queries per minute per OAuth client
+REDDIT_QUERIES_PER_MINUTE = 100
+
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, bursts of up to `capacity`.
+
+    acquire() blocks until a token is available, so any number of threads can
+    share one bucket and the combined request rate never exceeds the quota.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.waited = 0.0
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if available right now; return whether it succeeded"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1):
+        """Block until tokens are available, then take them"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+                self.waited += wait
+
+            self._sleep(wait)
+
+
+def reddit_rate_limiter(queries_per_minute=REDDIT_QUERIES_PER_MINUTE, burst=10):
+    """Token bucket sized for Reddit's per-client quota"""
+    return TokenBucket(queries_per_minute / 60.0, capacity=burst)
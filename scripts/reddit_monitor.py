@@ -4,11 +4,20 @@ Reddit Capital Rotation Monitor
 Tracks mention frequency and sentiment for key tickers across target subreddits
 """
 
-import praw
-import pandas as pd
+import json
+import time
+import tracemalloc
 from datetime import datetime, timedelta
-from collections import Counter
-import re
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from rate_limiter import reddit_rate_limiter
+from report_renderer import render_to_file, render_to_string
+from run_profile import count as count_metric, span
+from seen_posts import SeenPosts
+from ticker_matcher import build_matcher
 
 # Configuration
 SUBREDDITS = [
@@ -27,8 +36,36 @@ TICKERS_TO_TRACK = {
     'Tier 3': ['VSTS', 'HFWA', 'EBF']
 }
 
+# Posts per listing page (one API request each)
+LISTING_PAGE_SIZE = 100
+
+# Deepest a listing can be walked (Reddit stops serving /new after 1000 posts)
+LISTING_LIMIT = 1000
+
+# Opt-in comment ingestion: API requests per subreddit, MoreComments expansions per post
+COMMENT_API_BUDGET = 50
+REPLACE_MORE_LIMIT = 8
+
+# Per-subreddit high-water marks and daily mention aggregates
+CHECKPOINT_FILE = Path(__file__).parent.parent / 'data' / 'subreddit_checkpoints.json'
+
+# Days of daily aggregates kept in each checkpoint
+CHECKPOINT_RETENTION_DAYS = 90
+
+# Scalable Bloom filter of posts already analyzed (kept next to the checkpoints)
+SEEN_POSTS_FILE = CHECKPOINT_FILE.with_name('seen_posts.bloom')
+
+# Rolling 7/30/90-day mention baselines (see momentum.MomentumEngine)
+MOMENTUM_STATE_FILE = Path(__file__).parent.parent / 'data' / 'momentum_state.npz'
+
 ALL_TICKERS = [ticker for tier in TICKERS_TO_TRACK.values() for ticker in tier]
 
+# Only 2-5 letter symbols, matching the original [A-Z]{2,5} pattern
+TICKER_MATCHER = build_matcher(TICKERS_TO_TRACK, min_length=2, max_length=5)
+
+# praw, pandas and NumPy (via momentum/anomaly) are imported inside the functions
+# that use them, so the mock report path and library imports stay cheap
+
 # Reddit API Setup (requires credentials)
 def setup_reddit():
     """
@@ -36,6 +73,8 @@ def setup_reddit():
     Requires: reddit API credentials in environment or config file
     Get credentials at: https://www.reddit.com/prefs/apps
     """
+    import praw
+
     # TODO: Add your Reddit API credentials
     reddit = praw.Reddit(
         client_id='YOUR_CLIENT_ID',
@@ -45,130 +84,625 @@ def setup_reddit():
     return reddit
 
 def extract_tickers(text):
-    """Extract ticker mentions from text using regex"""
+    """Extract ticker mentions from text (one entry per occurrence)"""
     # Match $TICKER or TICKER in context
-    pattern = r'\b(?:\$)?([A-Z]{2,5})\b'
-    matches = re.findall(pattern, text.upper())
-    return [m for m in matches if m in ALL_TICKERS]
+    return TICKER_MATCHER.find_all(text)
 
-def analyze_subreddit(reddit, subreddit_name, lookback_days=7):
+def rate_limited(listing, rate_limiter, page_size=LISTING_PAGE_SIZE):
+    """
+    Yield from a lazy listing, taking a rate-limit token before each page fetch
+    """
+    listing = iter(listing)
+    count = 0
+
+    while True:
+        if rate_limiter is not None and count % page_size == 0:
+            with span('rate_limit_wait'):
+                rate_limiter.acquire()
+        try:
+            item = next(listing)
+        except StopIteration:
+            return
+        count += 1
+        yield item
+
+def extract_post_mentions(post, subreddit_name, post_time):
+    """Return (tickers, post_data rows) for one submission"""
+    # Extract tickers from title and body
+    text = f"{post.title} {post.selftext}"
+    tickers = extract_tickers(text)
+
+    records = [{
+        'subreddit': subreddit_name,
+        'ticker': ticker,
+        'title': post.title,
+        'score': post.score,
+        'num_comments': post.num_comments,
+        'url': post.url,
+        'created': post_time
+    } for ticker in tickers]
+
+    return tickers, records
+
+def analyze_subreddit(reddit, subreddit_name, lookback_days=7, rate_limiter=None,
+                      include_comments=False, comment_budget=COMMENT_API_BUDGET, seen=None):
     """
     Analyze ticker mentions in a subreddit over specified time period
+
+    With include_comments, comment mentions are streamed in afterwards, spending
+    comment_budget API requests on the posts with the most comments first.
+
+    With a SeenPosts filter, posts it has already seen (e.g. crossposts analyzed
+    in another subreddit) are skipped before extraction.
     """
+    import pandas as pd
+
     subreddit = reddit.subreddit(subreddit_name)
 
     mention_counts = Counter()
     post_data = []
+    comment_candidates = []
 
     # Get posts from time period
     time_filter = datetime.now() - timedelta(days=lookback_days)
 
     try:
-        for post in subreddit.new(limit=1000):
-            post_time = datetime.fromtimestamp(post.created_utc)
+        with span('fetch_posts', subreddit=subreddit_name) as fetch:
+            for post in rate_limited(subreddit.new(limit=LISTING_LIMIT), rate_limiter):
+                post_time = datetime.fromtimestamp(post.created_utc)
+
+                if post_time < time_filter:
+                    break
+
+                if seen is not None and not seen.check(post):
+                    continue
+
+                start = time.perf_counter()
+                tickers, records = extract_post_mentions(post, subreddit_name, post_time)
+                mention_counts.update(tickers)
+                post_data.extend(records)
+                comment_candidates.append((post.num_comments, post.id))
+                if seen is not None:
+                    seen.processed_post(time.perf_counter() - start)
+            fetch.set(posts=len(comment_candidates))
+        count_metric('posts_analyzed', len(comment_candidates))
+
+        if include_comments:
+            with span('fetch_comments', subreddit=subreddit_name):
+                daily_comment_mentions, stats = ingest_comments(
+                    reddit, comment_candidates, comment_budget, rate_limiter=rate_limiter
+                )
+            for counts in daily_comment_mentions.values():
+                mention_counts.update(counts)
+            count_metric('comments_analyzed', stats['comments'])
+            print_comment_stats(subreddit_name, stats)
+
+    except Exception as e:
+        print(f"Error analyzing r/{subreddit_name}: {e}")
+
+    return mention_counts, pd.DataFrame(post_data)
 
-            if post_time < time_filter:
-                break
+class RequestBudget:
+    """Count of API requests a comment walk may still spend"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.spent = 0
+
+    def spend(self, rate_limiter=None):
+        """Reserve one request; False once the budget is used up"""
+        if self.spent >= self.limit:
+            return False
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        self.spent += 1
+        return True
+
+def iter_comments(submission, replace_more_limit=REPLACE_MORE_LIMIT, budget=None, rate_limiter=None):
+    """
+    Yield a submission's comments breadth-first as they are loaded
+
+    Unlike CommentForest.replace_more(), "load more comments" stubs are expanded
+    lazily in BFS order, at most replace_more_limit times, and only while the
+    shared budget allows. Only the BFS frontier is held by the walk itself.
+    """
+    import praw
 
-            # Extract tickers from title and body
-            text = f"{post.title} {post.selftext}"
-            tickers = extract_tickers(text)
+    budget = budget or RequestBudget(float('inf'))
 
+    # Loading the submission's comment forest is itself one request
+    if not budget.spend(rate_limiter):
+        return
+
+    queue = deque(submission.comments)
+    expansions = 0
+
+    while queue:
+        item = queue.popleft()
+
+        if isinstance(item, praw.models.MoreComments):
+            if expansions < replace_more_limit and budget.spend(rate_limiter):
+                expansions += 1
+                queue.extend(item.comments())
+            continue
+
+        yield item
+        queue.extend(item.replies)
+
+def stream_comments(reddit, candidates, api_budget=COMMENT_API_BUDGET,
+                    replace_more_limit=REPLACE_MORE_LIMIT, rate_limiter=None, budget=None):
+    """
+    Yield comments from many submissions, spending the API budget on the busiest first
+
+    candidates are (num_comments, post_id) pairs. Each submission is loaded fresh
+    by id and released once walked, so at most one comment tree is alive at a time.
+    """
+    budget = budget or RequestBudget(api_budget)
+
+    for num_comments, post_id in sorted(candidates, key=lambda c: c[0], reverse=True):
+        if num_comments <= 0 or budget.spent >= budget.limit:
+            break
+
+        submission = reddit.submission(id=post_id)
+        yield from iter_comments(submission, replace_more_limit, budget, rate_limiter)
+
+def ingest_comments(reddit, candidates, api_budget=COMMENT_API_BUDGET,
+                    replace_more_limit=REPLACE_MORE_LIMIT, rate_limiter=None, track_memory=False):
+    """
+    Extract ticker mentions from streamed comments
+
+    Returns ({date: Counter}, stats) where stats has comments, comments_per_sec,
+    api_requests and (with track_memory) peak_memory_mb.
+    """
+    budget = RequestBudget(api_budget)
+    daily_mentions = {}
+    comments = 0
+
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+
+    try:
+        for comment in stream_comments(reddit, candidates, api_budget, replace_more_limit,
+                                       rate_limiter, budget):
+            comments += 1
+            tickers = extract_tickers(comment.body)
             if tickers:
-                for ticker in tickers:
-                    mention_counts[ticker] += 1
-                    post_data.append({
-                        'subreddit': subreddit_name,
-                        'ticker': ticker,
-                        'title': post.title,
-                        'score': post.score,
-                        'num_comments': post.num_comments,
-                        'url': post.url,
-                        'created': post_time
-                    })
+                day = datetime.fromtimestamp(comment.created_utc).strftime('%Y-%m-%d')
+                daily_mentions.setdefault(day, Counter()).update(tickers)
+    finally:
+        seconds = time.perf_counter() - start
+        peak_memory = tracemalloc.get_traced_memory()[1] if track_memory else None
+        if track_memory:
+            tracemalloc.stop()
+
+    stats = {
+        'comments': comments,
+        'seconds': seconds,
+        'comments_per_sec': comments / seconds if seconds > 0 else 0.0,
+        'api_requests': budget.spent,
+        'peak_memory_mb': peak_memory / 1024 / 1024 if peak_memory is not None else None,
+    }
+    return daily_mentions, stats
+
+def print_comment_stats(subreddit_name, stats):
+    """One-line summary of a comment ingestion run"""
+    line = (f"💬 r/{subreddit_name}: {stats['comments']} comments, "
+            f"{stats['comments_per_sec']:.0f} comments/sec, {stats['api_requests']} API requests")
+    if stats['peak_memory_mb'] is not None:
+        line += f", peak {stats['peak_memory_mb']:.1f} MB"
+    print(line)
+
+def load_checkpoints(checkpoint_file=CHECKPOINT_FILE):
+    """Load per-subreddit checkpoints ({} on first run)"""
+    checkpoint_file = Path(checkpoint_file)
+    if not checkpoint_file.exists():
+        return {}
+
+    with open(checkpoint_file, 'r') as f:
+        return json.load(f)
+
+def save_checkpoints(checkpoints, checkpoint_file=CHECKPOINT_FILE):
+    """Persist checkpoints (write to a temp file, then rename over the old one)"""
+    checkpoint_file = Path(checkpoint_file)
+    checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+
+    temp_file = checkpoint_file.with_suffix('.tmp')
+    with open(temp_file, 'w') as f:
+        json.dump(checkpoints, f)
+    temp_file.replace(checkpoint_file)
+
+def window_mentions(checkpoint, lookback_days=7, now=None):
+    """Rebuild the lookback-window Counter from a checkpoint's daily aggregates"""
+    first_day = ((now or datetime.now()) - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
+
+    mention_counts = Counter()
+    for day, counts in checkpoint.get('daily_mentions', {}).items():
+        if day >= first_day:
+            mention_counts.update(counts)
+
+    return mention_counts
+
+def analyze_subreddit_incremental(reddit, subreddit_name, checkpoint=None, lookback_days=7,
+                                  rate_limiter=None, include_comments=False,
+                                  comment_budget=COMMENT_API_BUDGET, seen=None):
+    """
+    Fetch only posts newer than the subreddit's high-water mark
+
+    New mentions are merged into the checkpoint's per-day counts and the lookback
+    window is rebuilt from those aggregates, so a run fetches one listing page per
+    100 new posts instead of re-walking the whole window.
+
+    With include_comments, comments on the new posts are ingested as in
+    analyze_subreddit and counted on the day they were written. Posts a SeenPosts
+    filter has already seen are skipped, as in analyze_subreddit.
+
+    The high-water mark only advances when the walk gets back to it (or to the
+    lookback cutoff, or the end of the listing). If a fetch fails or LISTING_LIMIT
+    runs out first, the old mark and boundary ids are kept and the gap is logged,
+    so the next run walks the same posts again; the SeenPosts filter skips the ones
+    already counted. Without a filter, an incomplete walk's mentions are left out
+    of the checkpoint instead, to be counted by that retry.
+
+    Returns (window mention Counter, DataFrame of the new posts, updated checkpoint).
+    """
+    import pandas as pd
+
+    checkpoint = dict(checkpoint or {})
+    daily_mentions = {day: Counter(counts) for day, counts in checkpoint.get('daily_mentions', {}).items()}
+    newest_utc = checkpoint.get('newest_created_utc', 0)
+    boundary_ids = set(checkpoint.get('boundary_ids', []))
+
+    subreddit = reddit.subreddit(subreddit_name)
+    time_filter = datetime.now() - timedelta(days=lookback_days)
+
+    post_data = []
+    comment_candidates = []
+    new_mentions = {}
+    new_newest_utc = newest_utc
+    new_boundary_ids = set(boundary_ids)
+    walked = 0
+    complete = False
+
+    try:
+        with span('fetch_posts', subreddit=subreddit_name, incremental=True) as fetch:
+            for post in rate_limited(subreddit.new(limit=LISTING_LIMIT), rate_limiter):
+                walked += 1
+
+                # Stop at the first post processed by an earlier run
+                if post.created_utc < newest_utc or (post.created_utc == newest_utc and post.id in boundary_ids):
+                    complete = True
+                    break
+
+                post_time = datetime.fromtimestamp(post.created_utc)
+                if post_time < time_filter:
+                    complete = True
+                    break
+
+                if post.created_utc > new_newest_utc:
+                    new_newest_utc = post.created_utc
+                    new_boundary_ids = {post.id}
+                elif post.created_utc == new_newest_utc:
+                    new_boundary_ids.add(post.id)
+
+                if seen is not None and not seen.check(post):
+                    continue
+
+                start = time.perf_counter()
+                tickers, records = extract_post_mentions(post, subreddit_name, post_time)
+                if tickers:
+                    new_mentions.setdefault(post_time.strftime('%Y-%m-%d'), Counter()).update(tickers)
+                    post_data.extend(records)
+                comment_candidates.append((post.num_comments, post.id))
+                if seen is not None:
+                    seen.processed_post(time.perf_counter() - start)
+            else:
+                # The listing ended before the limit: nothing older is left to reach
+                complete = walked < LISTING_LIMIT
+            fetch.set(posts=len(comment_candidates))
+        count_metric('posts_analyzed', len(comment_candidates))
+
+        if include_comments:
+            with span('fetch_comments', subreddit=subreddit_name):
+                daily_comment_mentions, stats = ingest_comments(
+                    reddit, comment_candidates, comment_budget, rate_limiter=rate_limiter
+                )
+            for day, counts in daily_comment_mentions.items():
+                new_mentions.setdefault(day, Counter()).update(counts)
+            count_metric('comments_analyzed', stats['comments'])
+            print_comment_stats(subreddit_name, stats)
 
     except Exception as e:
         print(f"Error analyzing r/{subreddit_name}: {e}")
 
-    return mention_counts, pd.DataFrame(post_data)
+    if not complete:
+        print(f"⚠️  r/{subreddit_name}: stopped after {walked} posts without reaching the last run's "
+              f"posts; keeping the old high-water mark so the gap is fetched next run")
+        new_newest_utc = newest_utc
+        new_boundary_ids = boundary_ids
+
+    if complete or seen is not None:
+        for day, counts in new_mentions.items():
+            daily_mentions.setdefault(day, Counter()).update(counts)
+
+    # Drop aggregates that fell out of the retention window
+    oldest_day = (datetime.now() - timedelta(days=CHECKPOINT_RETENTION_DAYS)).strftime('%Y-%m-%d')
+
+    checkpoint.update({
+        'newest_created_utc': new_newest_utc,
+        'boundary_ids': sorted(new_boundary_ids),
+        'daily_mentions': {
+            day: dict(counts) for day, counts in sorted(daily_mentions.items()) if day >= oldest_day
+        },
+        'updated': datetime.now().isoformat(),
+    })
+
+    return window_mentions(checkpoint, lookback_days), pd.DataFrame(post_data), checkpoint
 
-def calculate_momentum(current_mentions, historical_baseline):
+def collect_subreddits(reddit_factory=None, subreddits=None, lookback_days=7,
+                       max_workers=None, rate_limiter=None, checkpoint_file=None,
+                       include_comments=False, checkpoints=None, clients=None, seen=None):
     """
-    Calculate mention momentum vs. baseline
-    Returns tickers with >3x increase
+    Analyze several subreddits concurrently and merge the results
+
+    praw.Reddit instances are not thread safe, so each worker builds its own client
+    with reddit_factory (setup_reddit by default). All workers share one token
+    bucket so the combined request rate stays within Reddit's per-client quota.
+
+    With checkpoint_file, each subreddit is fetched incrementally from its
+    high-water mark (see analyze_subreddit_incremental) and the checkpoints are
+    saved once all workers finish. include_comments opts into comment ingestion.
+
+    A long-running caller can instead pass its in-memory `checkpoints` dict (updated
+    in place; saved only if checkpoint_file is also given) and a `clients` dict that
+    keeps one warm praw client per subreddit across calls.
+
+    Every post is checked against a shared SeenPosts filter first, so crossposts
+    are analyzed once across subreddits. With checkpoint_file the filter persists
+    next to it (seen_posts.bloom) across runs; a caller can pass its own `seen`.
+    Without either, a fresh filter is used, which only dedupes within the call
+    (the full lookback window is re-counted every time).
+
+    Returns a merged Counter and DataFrame, in the same order as `subreddits`.
     """
-    momentum_signals = {}
+    import pandas as pd
+
+    reddit_factory = reddit_factory or setup_reddit
+    subreddits = list(subreddits or SUBREDDITS)
+    rate_limiter = rate_limiter or reddit_rate_limiter()
+    if checkpoints is None and checkpoint_file:
+        checkpoints = load_checkpoints(checkpoint_file)
+
+    seen_file = Path(checkpoint_file).with_name(SEEN_POSTS_FILE.name) if checkpoint_file and seen is None else None
+    if seen is None:
+        seen = SeenPosts.load(seen_file) if seen_file else SeenPosts()
+    seen.reset_stats()
+
+    def worker(subreddit_name):
+        # Each subreddit has exactly one worker per call, so its client is never shared
+        if clients is None:
+            reddit = reddit_factory()
+        else:
+            reddit = clients.get(subreddit_name) or clients.setdefault(subreddit_name, reddit_factory())
+
+        if checkpoints is None:
+            return analyze_subreddit(
+                reddit, subreddit_name, lookback_days, rate_limiter, include_comments, seen=seen
+            )
+
+        return analyze_subreddit_incremental(
+            reddit, subreddit_name, checkpoints.get(subreddit_name),
+            lookback_days, rate_limiter, include_comments, seen=seen
+        )
+
+    # Worker threads' fetch spans are top-level spans of the run profile (tagged with their thread)
+    with span('collect_subreddits', subreddits=len(subreddits)):
+        with ThreadPoolExecutor(max_workers=max_workers or len(subreddits) or 1) as executor:
+            results = list(executor.map(worker, subreddits))
+
+    all_mentions = Counter()
+    frames = []
+    for subreddit_name, result in zip(subreddits, results):
+        mention_counts, frame = result[:2]
+        if checkpoints is not None:
+            checkpoints[subreddit_name] = result[2]
+
+        all_mentions.update(mention_counts)
+        if not frame.empty:
+            frames.append(frame)
+
+    with span('save_checkpoints'):
+        if checkpoints is not None and checkpoint_file:
+            save_checkpoints(checkpoints, checkpoint_file)
+        if seen_file:
+            seen.save(seen_file)
+    if seen.skipped:
+        seen.print_summary()
+
+    all_posts = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return all_mentions, all_posts
+
+def record_checkpoints(engine, checkpoints):
+    """
+    Fold checkpoint daily aggregates into a MomentumEngine
 
-    for ticker, current_count in current_mentions.items():
-        baseline = historical_baseline.get(ticker, 0)
+    Only days from the engine's latest day onwards are recorded (the latest day may
+    have been partial last time), so each call costs O(new days), not O(history).
+    """
+    from momentum import calendar_days
 
-        if baseline > 0:
-            momentum = current_count / baseline
-            if momentum >= 3.0:
-                momentum_signals[ticker] = {
-                    'current': current_count,
-                    'baseline': baseline,
-                    'momentum': momentum
-                }
+    first_day = engine.latest_day.isoformat() if engine.latest_day else ''
 
-    return momentum_signals
+    daily_mentions = {}
+    for checkpoint in checkpoints.values():
+        for day, counts in checkpoint.get('daily_mentions', {}).items():
+            if day >= first_day:
+                daily_mentions.setdefault(day, Counter()).update(counts)
 
-def generate_report(all_mentions, momentum_signals, output_file='data/daily_report.txt'):
-    """Generate daily monitoring report"""
+    if daily_mentions:
+        for day in calendar_days(min(daily_mentions), max(daily_mentions)):
+            engine.record_day(day, daily_mentions.get(day, {}))
 
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return engine
 
-    report = f"""
-╔═══════════════════════════════════════════════════════════════╗
-║          REDDIT CAPITAL ROTATION DAILY REPORT                 ║
-║          {timestamp}                          ║
-╚═══════════════════════════════════════════════════════════════╝
+def update_momentum(checkpoint_file=CHECKPOINT_FILE, state_file=MOMENTUM_STATE_FILE):
+    """Fold the saved checkpoints into the persisted momentum engine (see record_checkpoints)"""
+    from momentum import MomentumEngine
 
-═══════════════════════════════════════════════════════════════
-TOP 20 MOST MENTIONED TICKERS (7-Day Window)
-═══════════════════════════════════════════════════════════════
+    engine = MomentumEngine.load(state_file, ALL_TICKERS)
+    record_checkpoints(engine, load_checkpoints(checkpoint_file))
+    engine.save(state_file)
+    return engine
 
-"""
+def mention_matrix(checkpoints, tickers=None, days=None, now=None):
+    """
+    Build a (tickers x subreddits x days) mention count matrix from checkpoint aggregates
 
-    # Top 20 mentions
-    for i, (ticker, count) in enumerate(all_mentions.most_common(20), 1):
-        tier = 'T1' if ticker in TICKERS_TO_TRACK['Tier 1'] else 'T2' if ticker in TICKERS_TO_TRACK['Tier 2'] else 'T3'
-        report += f"{i:2}. {ticker:6} - {count:4} mentions [{tier}]\n"
+    The last day is today. By default the matrix starts at the oldest aggregated
+    day (at most CHECKPOINT_RETENTION_DAYS back), so days before collection
+    started are not mistaken for days without mentions.
+    Returns (counts, tickers, subreddits).
+    """
+    import numpy as np
 
-    report += """
-═══════════════════════════════════════════════════════════════
-⚠️  MOMENTUM ALERTS (3x+ vs 30-day baseline)
-═══════════════════════════════════════════════════════════════
+    tickers = list(tickers or ALL_TICKERS)
+    subreddits = sorted(checkpoints)
+    last_day = (now or datetime.now()).date()
 
-"""
+    if days is None:
+        recorded = [day for checkpoint in checkpoints.values() for day in checkpoint.get('daily_mentions', {})]
+        oldest = datetime.strptime(min(recorded), '%Y-%m-%d').date() if recorded else last_day
+        days = min(max((last_day - oldest).days + 1, 1), CHECKPOINT_RETENTION_DAYS)
 
-    if momentum_signals:
-        for ticker, data in sorted(momentum_signals.items(), key=lambda x: x[1]['momentum'], reverse=True):
-            report += f"🔥 {ticker}: {data['momentum']:.1f}x momentum ({data['current']} vs {data['baseline']} baseline)\n"
-    else:
-        report += "No significant momentum alerts detected.\n"
+    first_day = last_day - timedelta(days=days - 1)
 
-    report += """
-═══════════════════════════════════════════════════════════════
-TIER 1 TRACKER (High Conviction Holdings)
-═══════════════════════════════════════════════════════════════
+    rows = {ticker: i for i, ticker in enumerate(tickers)}
+    counts = np.zeros((len(tickers), len(subreddits), days), dtype=np.int32)
 
-"""
+    for col, subreddit_name in enumerate(subreddits):
+        for day, day_counts in checkpoints[subreddit_name].get('daily_mentions', {}).items():
+            offset = (datetime.strptime(day, '%Y-%m-%d').date() - first_day).days
+            if not 0 <= offset < days:
+                continue
+            for ticker, count in day_counts.items():
+                if ticker in rows:
+                    counts[rows[ticker], col, offset] = count
+
+    return counts, tickers, subreddits
+
+def detect_anomalies(checkpoint_file=CHECKPOINT_FILE, top_n=20, checkpoints=None):
+    """Score today's mentions per ticker and subreddit against their history"""
+    from anomaly import score_anomalies
+
+    if checkpoints is None:
+        checkpoints = load_checkpoints(checkpoint_file)
+
+    counts, tickers, subreddits = mention_matrix(checkpoints)
+    if not subreddits:
+        return []
+    return score_anomalies(counts, tickers, subreddits, top_n=top_n)
+
+def calculate_momentum(current_mentions, historical_baseline, threshold=3.0):
+    """
+    Calculate mention momentum vs. baseline
+    Returns tickers with >3x increase
+
+    historical_baseline is {ticker: baseline}, e.g.
+    MomentumEngine.baseline_dict(30, days=7) for a 7-day current window.
+    """
+    import numpy as np
+    from momentum import momentum_ratios
+
+    tickers = list(current_mentions)
+    current = np.array([current_mentions[ticker] for ticker in tickers], dtype=np.float64)
+    baseline = np.array([historical_baseline.get(ticker, 0) for ticker in tickers], dtype=np.float64)
+
+    ratios = momentum_ratios(current, baseline)
+    signals = np.flatnonzero(ratios >= threshold)
+
+    return {
+        tickers[i]: {
+            'current': current_mentions[tickers[i]],
+            'baseline': historical_baseline[tickers[i]],
+            'momentum': float(ratios[i])
+        }
+        for i in signals
+    }
+
+def write_report_header(out, title):
+    out.box(title, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+
+def write_top_mentions(out, all_mentions, top_n=20):
+    """Most mentioned tickers with their tier"""
+    out.banner(f"TOP {top_n} MOST MENTIONED TICKERS (7-Day Window)")
+
+    tiers = {ticker: 'T1' for ticker in TICKERS_TO_TRACK['Tier 1']}
+    tiers.update((ticker, 'T2') for ticker in TICKERS_TO_TRACK['Tier 2'] if ticker not in tiers)
+
+    for i, (ticker, count) in enumerate(all_mentions.most_common(top_n), 1):
+        out.write(f"{i:2}. {ticker:6} - {count:4} mentions [{tiers.get(ticker, 'T3')}]\n")
+
+def write_momentum_alerts(out, momentum_signals):
+    out.banner("⚠️  MOMENTUM ALERTS (3x+ vs 30-day baseline)")
+
+    if not momentum_signals:
+        out.line("No significant momentum alerts detected.")
+        return
+
+    for ticker, data in sorted(momentum_signals.items(), key=lambda x: x[1]['momentum'], reverse=True):
+        out.write(f"🔥 {ticker}: {data['momentum']:.1f}x momentum ({data['current']} vs {data['baseline']} baseline)\n")
+
+def write_anomaly_alerts(out, anomalies):
+    if not anomalies:
+        return
+
+    out.banner("🚨 ANOMALY ALERTS (today vs EWMA baseline)")
+    for alert in anomalies:
+        where = f"r/{alert.subreddit}" if alert.subreddit else "all subreddits"
+        out.write(f"🚨 {alert.ticker:6} in {where}: {alert.count} mentions vs {alert.baseline:.1f} expected "
+                  f"(z={alert.robust_z:.1f}, surprise={alert.surprise:.1f})\n")
+
+def write_tier1_tracker(out, all_mentions):
+    out.banner("TIER 1 TRACKER (High Conviction Holdings)")
 
     for ticker in TICKERS_TO_TRACK['Tier 1']:
         count = all_mentions.get(ticker, 0)
         status = "📈" if count > 50 else "📊" if count > 20 else "📉"
-        report += f"{status} {ticker:6} - {count:4} mentions\n"
-
-    report += "\n" + "="*63 + "\n"
+        out.write(f"{status} {ticker:6} - {count:4} mentions\n")
+
+    out.write("\n" + "="*63 + "\n")
+
+def report_sections(all_mentions, momentum_signals, anomalies=None):
+    """The daily report as renderer sections (see report_renderer)"""
+    return [
+        partial(write_report_header, title="REDDIT CAPITAL ROTATION DAILY REPORT"),
+        partial(write_top_mentions, all_mentions=all_mentions),
+        partial(write_momentum_alerts, momentum_signals=momentum_signals),
+        partial(write_anomaly_alerts, anomalies=anomalies),
+        partial(write_tier1_tracker, all_mentions=all_mentions),
+    ]
+
+def generate_report(all_mentions, momentum_signals, output_file='data/daily_report.txt', anomalies=None,
+                    echo=True):
+    """
+    Generate daily monitoring report (anomalies: Alerts from detect_anomalies)
 
-    # Save report
+    Saves it to output_file, prints it (with echo) and returns the report text.
+    write_report() streams the same report without holding it in memory.
+    """
+    report = render_to_string(report_sections(all_mentions, momentum_signals, anomalies))
     with open(output_file, 'w') as f:
         f.write(report)
 
-    print(report)
+    if echo:
+        print(report)
     return report
 
+def write_report(all_mentions, momentum_signals, output_file='data/daily_report.txt', anomalies=None,
+                 echo=True):
+    """Stream the generate_report() report straight into output_file (and stdout); returns the path"""
+    return render_to_file(report_sections(all_mentions, momentum_signals, anomalies), output_file, echo)
+
 def main():
     """Main execution function"""
 
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Replay / Backfill
+Re-run the analysis (tickers, sentiment, themes, momentum) over archived raw
+posts for a date range, in parallel worker processes
+
+Use it after changing TICKERS or the theme keywords, or to backfill a new
+ticker: the range is split into day-aligned chunks, each worker reads its own
+chunk from the post archive, and the per-day results are merged in date order,
+so the output does not depend on the number of workers.
+
+Usage:
+    python3 scripts/replay.py data/post_archive 2026-01-01 2026-03-31
+    python3 scripts/replay.py data/post_archive 2026-01-01 2026-03-31 --workers 8 --momentum data/momentum_state.npz
+"""
+
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path (worker processes import this module by name)
+sys.path.insert(0, str(Path(__file__).parent))
+
+import live_reddit_monitor
+import sentiment
+from keyword_index import get_theme_index
+from post_archive import PostArchive, post_timestamp
+from settings import ConfigError
+from ticker_matcher import build_matcher
+
+# Sentiment labels in tie-break order (a ticker split evenly is reported as the first)
+SENTIMENT_LABELS = ('positive', 'negative', 'neutral')
+
+
+def _init_worker(tickers):
+    """Point analyze_posts at the replayed ticker universe (once per process)"""
+    if tickers is not None:
+        live_reddit_monitor.TICKER_MATCHER = build_matcher(tickers, min_length=2, max_length=5)
+
+def analyze_day(posts, theme_index):
+    """
+    Aggregate one day of posts
+
+    Posts are grouped by (sentiment label, matched themes) and each group goes
+    through live_reddit_monitor.analyze_posts once, so every post is scanned for
+    tickers exactly once and the group counts add up to the day's mentions,
+    per-ticker sentiment and theme co-mentions.
+    """
+    texts = [f"{post.get('title', '')} {post.get('body', '')}" for post in posts]
+    groups = {}
+    for post, text in zip(posts, texts):
+        label = sentiment.analyze_sentiment(text)
+        groups.setdefault((label, tuple(theme_index.match(text))), []).append(post)
+
+    mentions = Counter()
+    by_label = {}
+    themes = Counter()
+    theme_tickers = {}
+    for (label, matched), group in groups.items():
+        counts, _ = live_reddit_monitor.analyze_posts(group)
+        mentions.update(counts)
+        by_label.setdefault(label, Counter()).update(counts)
+        for theme in matched:
+            themes[theme] += len(group)
+            theme_tickers.setdefault(theme, Counter()).update(counts)
+
+    return {
+        'posts': len(posts),
+        'mentions': mentions,
+        'sentiment': by_label,
+        'themes': themes,
+        'theme_tickers': theme_tickers,
+    }
+
+def replay_chunk(archive_root, start, end, theme_keywords):
+    """Analyze archived posts with start <= timestamp < end; returns {day: aggregate}"""
+    theme_index = get_theme_index(theme_keywords)
+    start_ts, end_ts = int(start.timestamp()), int(end.timestamp())
+
+    days = {}
+    for post in PostArchive(archive_root).read(start_ts, end_ts):
+        day = datetime.fromtimestamp(post_timestamp(post, start_ts), timezone.utc).strftime("%Y-%m-%d")
+        days.setdefault(day, []).append(post)
+
+    return {day: analyze_day(days[day], theme_index) for day in sorted(days)}
+
+def chunk_ranges(first_day, last_day, chunk_days=1):
+    """[(start, end)] UTC datetimes covering first_day..last_day inclusive"""
+    start = datetime.strptime(str(first_day), "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    stop = datetime.strptime(str(last_day), "%Y-%m-%d").replace(tzinfo=timezone.utc) + timedelta(days=1)
+
+    ranges = []
+    while start < stop:
+        end = min(start + timedelta(days=chunk_days), stop)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+def replay(archive_root, first_day, last_day, tickers=None, theme_keywords=None,
+           workers=None, chunk_days=1):
+    """
+    Replay archived posts from first_day to last_day (inclusive, 'YYYY-MM-DD')
+
+    tickers ({tier: [tickers]}) defaults to live_reddit_monitor.TICKERS and
+    theme_keywords to the live report generator's themes. workers=1 runs in
+    this process; otherwise chunks go to a ProcessPoolExecutor (os.cpu_count()
+    workers by default). Returns {day: aggregate} in date order.
+    """
+    if theme_keywords is None:
+        from live_report_generator import DEFAULT_THEME_KEYWORDS, theme_keywords as configured_themes
+        try:
+            theme_keywords = configured_themes()
+        except ConfigError:
+            theme_keywords = DEFAULT_THEME_KEYWORDS
+
+    ranges = chunk_ranges(first_day, last_day, chunk_days)
+    args = [(str(archive_root), start, end, theme_keywords) for start, end in ranges]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(ranges) == 1:
+        previous = live_reddit_monitor.TICKER_MATCHER
+        try:
+            _init_worker(tickers)
+            results = [replay_chunk(*chunk) for chunk in args]
+        finally:
+            live_reddit_monitor.TICKER_MATCHER = previous
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tickers,)) as executor:
+            results = list(executor.map(replay_chunk, *zip(*args)))
+
+    # Chunks are disjoint and in date order, so merging is a plain ordered update
+    merged = {}
+    for result in results:
+        merged.update(result)
+    return merged
+
+def total_mentions(days):
+    """Ticker mentions summed over every replayed day"""
+    totals = Counter()
+    for aggregate in days.values():
+        totals.update(aggregate['mentions'])
+    return totals
+
+def ticker_snapshots(days, tickers=None):
+    """
+    {day: {ticker: {mentions, tier, theme, sentiment}}}, the ticker history format
+
+    A ticker's theme is the one it was co-mentioned with most, and its sentiment
+    the most common label of the posts mentioning it (ties broken by name / label order).
+    """
+    tickers = tickers or live_reddit_monitor.TICKERS
+    tiers = {ticker: tier for tier, members in tickers.items() for ticker in members}
+
+    snapshots = {}
+    for day, aggregate in days.items():
+        snapshot = {}
+        for ticker, count in sorted(aggregate['mentions'].items()):
+            themes = {theme: counts[ticker] for theme, counts in aggregate['theme_tickers'].items() if counts[ticker]}
+            labels = [aggregate['sentiment'].get(label, Counter())[ticker] for label in SENTIMENT_LABELS]
+
+            snapshot[ticker] = {
+                'mentions': count,
+                'tier': tiers.get(ticker, ''),
+                'theme': min(themes, key=lambda theme: (-themes[theme], theme)) if themes else 'Multiple',
+                'sentiment': SENTIMENT_LABELS[labels.index(max(labels))] if any(labels) else 'neutral',
+            }
+        snapshots[day] = snapshot
+    return snapshots
+
+def rebuild_momentum(days, engine):
+    """Record every replayed day's mentions into a MomentumEngine, in date order"""
+    engine.record_days({day: aggregate['mentions'] for day, aggregate in days.items()})
+    return engine
+
+def main(args=None):
+    """Replay a date range from the command line"""
+    args = sys.argv[1:] if args is None else list(args)
+
+    def option(name, default=None):
+        if name in args:
+            position = args.index(name)
+            value = args[position + 1]
+            del args[position:position + 2]
+            return value
+        return default
+
+    workers = int(option("--workers", 0)) or None
+    chunk_days = int(option("--chunk-days", 1))
+    momentum_path = option("--momentum")
+
+    if len(args) != 3:
+        print(__doc__)
+        sys.exit(1)
+
+    archive_root, first_day, last_day = args
+    started = datetime.now()
+    days = replay(archive_root, first_day, last_day, workers=workers, chunk_days=chunk_days)
+    elapsed = (datetime.now() - started).total_seconds()
+
+    posts = sum(aggregate['posts'] for aggregate in days.values())
+    print(f"✅ Replayed {posts:,} posts over {len(days)} days in {elapsed:.1f}s")
+    for ticker, count in total_mentions(days).most_common(10):
+        print(f"   ${ticker:6} {count:6} mentions")
+
+    if momentum_path:
+        from momentum import MomentumEngine
+        engine = rebuild_momentum(days, MomentumEngine(live_reddit_monitor.ALL_TICKERS))
+        engine.save(momentum_path)
+        print(f"✅ Momentum baselines rebuilt: {momentum_path}")
+
+if __name__ == "__main__":
+    main()
@@ -5,43 +5,25 @@ Generates comprehensive investment theme analysis reports using web search
 """
 
 import os
-import json
-import csv
-import sys
 from datetime import datetime
 from pathlib import Path
 from collections import defaultdict
 
-# Load configuration
-def load_config():
-    """Load configuration from config.json"""
-    config_path = Path(__file__).parent.parent / "config.json"
+from report_index import headline, open_manifest
+from settings import get_settings, require_settings
+from theme_log import ThemeEvolutionLog, migrate_if_needed as migrate_theme_log
+from vault_writer import VaultWriter
 
-    if not config_path.exists():
-        print("❌ Error: config.json not found!")
-        print(f"   Expected at: {config_path}")
-        print("\n📝 Please copy config.example.json to config.json and update with your settings:")
-        print("   cp config.example.json config.json")
-        sys.exit(1)
+# Config is read on first use, not at import (see settings.Settings)
+SETTINGS = get_settings()
 
-    with open(config_path, 'r') as f:
-        return json.load(f)
-
-# Load config
-CONFIG = load_config()
-
-# Paths from config
-OBSIDIAN_VAULT = Path(CONFIG['obsidian_vault_path']).expanduser()
-REPORTS_DIR = OBSIDIAN_VAULT / CONFIG['reports_subfolder']
-DATA_DIR = REPORTS_DIR / "data"
-
-# Tracked tickers from config
-TICKERS = CONFIG['tickers']
+# Vault notes are only rewritten when their content changes (bytes written/skipped per run)
+VAULT = VaultWriter()
 
 def ensure_directories():
     """Create necessary directories if they don't exist"""
-    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    SETTINGS.reports_dir.mkdir(parents=True, exist_ok=True)
+    SETTINGS.data_dir.mkdir(parents=True, exist_ok=True)
 
 def get_search_queries():
     """Generate search queries for data collection"""
@@ -255,34 +237,40 @@ This report synthesized information from:
 
     return report
 
-def save_report(content, filename=None):
+def report_manifest():
+    """Manifest of saved reports (built from the reports folder on first use)"""
+    return open_manifest(SETTINGS.data_dir / "report_index.ndjson", SETTINGS.reports_dir)
+
+def save_report(content, filename=None, stats=None):
     """Save report to Obsidian vault"""
     if filename is None:
         filename = f"{datetime.now().strftime('%Y-%m-%d')}_analysis.md"
 
-    report_path = REPORTS_DIR / filename
-
-    with open(report_path, 'w') as f:
-        f.write(content)
+    report_path = SETTINGS.reports_dir / filename
 
-    print(f"✅ Report saved to: {report_path}")
+    if VAULT.write(report_path, content):
+        report_manifest().add(report_path, stats)
+        print(f"✅ Report saved to: {report_path}")
+    else:
+        print(f"⏭️  Report unchanged: {report_path}")
     return report_path
 
 def update_index():
-    """Update index file with links to all reports"""
-    reports = sorted(REPORTS_DIR.glob("*_analysis.md"), reverse=True)
+    """Update index file with links to all reports (from the manifest, not a directory listing)"""
+    entries = report_manifest().entries()
 
     index_content = f"""# Reddit Capital Rotation - Report Index
 
-*Last Updated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}*
+*Last Changed: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}*
 
 ## 📚 All Reports
 
 """
 
-    for report in reports:
+    for entry in entries:
+        report = Path(entry['file'])
         date_str = report.stem.replace("_analysis", "")
-        index_content += f"- [[{report.stem}|{date_str}]]\n"
+        index_content += f"- [[{report.stem}|{date_str}]]{headline(entry)}\n"
 
     index_content += f"""
 
@@ -290,14 +278,14 @@ def update_index():
 
 ## 🔄 Quick Access
 
-- [[{reports[0].stem}|Latest Report]]
+- [[{Path(entries[0]['file']).stem}|Latest Report]]
 - [[ticker_tracking|Ticker Performance Tracker]]
 - [[theme_evolution|Theme Evolution Analysis]]
 
 ## 📊 Data Files
 
-- [Ticker History CSV](data/ticker_history.csv)
-- [Theme Evolution JSON](data/theme_evolution.json)
+- [Ticker History (Parquet)](data/ticker_history/)
+- [Theme Evolution Log (NDJSON)](data/theme_evolution.ndjson)
 
 ---
 
@@ -314,58 +302,30 @@ def update_index():
 *Repository: https://github.com/jkiley129/reddit-capital-rotation*
 """
 
-    index_path = REPORTS_DIR / "_index.md"
-    with open(index_path, 'w') as f:
-        f.write(index_content)
-
-    print(f"✅ Index updated: {index_path}")
+    index_path = SETTINGS.reports_dir / "_index.md"
+    if VAULT.write(index_path, index_content):
+        print(f"✅ Index updated: {index_path}")
+    else:
+        print(f"⏭️  Index unchanged: {index_path}")
 
 def save_ticker_history(ticker_data):
-    """Append ticker data to history CSV"""
-    history_file = DATA_DIR / "ticker_history.csv"
-
-    file_exists = history_file.exists()
+    """Append ticker data to the history store (one Parquet partition per date)"""
+    # pyarrow is only imported when history is actually written
+    from history_store import TickerHistoryStore, migrate_if_needed
 
-    with open(history_file, 'a', newline='') as f:
-        writer = csv.writer(f)
+    store = TickerHistoryStore(SETTINGS.data_dir / "ticker_history")
+    migrate_if_needed(SETTINGS.data_dir / "ticker_history.csv", store)
+    store.append_snapshot(ticker_data)
 
-        if not file_exists:
-            writer.writerow(['date', 'ticker', 'mentions', 'tier', 'theme', 'sentiment'])
-
-        for ticker, data in ticker_data.items():
-            writer.writerow([
-                datetime.now().strftime("%Y-%m-%d"),
-                ticker,
-                data.get('mentions', 0),
-                data.get('tier', ''),
-                data.get('theme', ''),
-                data.get('sentiment', 'neutral')
-            ])
-
-    print(f"✅ Ticker history updated: {history_file}")
+    print(f"✅ Ticker history updated: {store.root}")
 
 def save_theme_evolution(themes_data):
-    """Save theme evolution data to JSON"""
-    evolution_file = DATA_DIR / "theme_evolution.json"
-
-    # Load existing data
-    if evolution_file.exists():
-        with open(evolution_file, 'r') as f:
-            history = json.load(f)
-    else:
-        history = []
-
-    # Add current snapshot
-    history.append({
-        'date': datetime.now().strftime("%Y-%m-%d"),
-        'themes': themes_data
-    })
+    """Append a compact theme snapshot to the append-only evolution log"""
+    log = ThemeEvolutionLog(SETTINGS.data_dir / "theme_evolution.ndjson")
+    migrate_theme_log(SETTINGS.data_dir / "theme_evolution.json", log)
+    log.append(themes_data)
 
-    # Save updated history
-    with open(evolution_file, 'w') as f:
-        json.dump(history, f, indent=2)
-
-    print(f"✅ Theme evolution updated: {evolution_file}")
+    print(f"✅ Theme evolution updated: {log.path}")
 
 def create_readme():
     """Create README in the Obsidian folder"""
@@ -407,17 +367,20 @@ Run every 2-3 days to track momentum shifts effectively.
 
 ---
 
-*Last updated: {datetime.now().strftime("%Y-%m-%d")}*
+*Last changed: {datetime.now().strftime("%Y-%m-%d")}*
 """
 
-    readme_path = REPORTS_DIR / "README.md"
-    with open(readme_path, 'w') as f:
-        f.write(readme_content)
-
-    print(f"✅ README created: {readme_path}")
+    readme_path = SETTINGS.reports_dir / "README.md"
+    if VAULT.write(readme_path, readme_content):
+        print(f"✅ README created: {readme_path}")
+    else:
+        print(f"⏭️  README unchanged: {readme_path}")
 
 def main():
     """Main execution function"""
+    require_settings()
+    VAULT.reset()
+
     print("="*70)
     print("Reddit Capital Rotation Report Generator")
     print("="*70)
@@ -442,6 +405,7 @@ def main():
     # Create README
     print("📄 Creating README...")
     create_readme()
+    VAULT.print_summary()
     print()
 
     # Save sample tracker data
@@ -464,7 +428,7 @@ def main():
     print("="*70)
     print()
     print(f"📍 Location: {report_path}")
-    print(f"📍 Index: {REPORTS_DIR / '_index.md'}")
+    print(f"📍 Index: {SETTINGS.reports_dir / '_index.md'}")
     print()
     print("💡 Next steps:")
     print("   1. Open in Obsidian to view the report")
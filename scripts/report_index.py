@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Report Index Manifest
+Append-only NDJSON manifest of saved reports, so `_index.md` is rendered
+without listing the (synced) reports folder on every run
+
+Usage (rebuild the manifest from the reports on disk):
+    python3 scripts/report_index.py repair [path/to/reports_dir]
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Reports covered by the index (both generators)
+REPORT_PATTERN = "*_analysis.md"
+
+
+def report_date(filename):
+    """'2026-01-18_live_analysis.md' -> '2026-01-18'"""
+    return Path(filename).name.split("_", 1)[0]
+
+
+class ReportManifest:
+    """
+    One JSON line per saved report: {"file", "date", "saved", "stats"}
+
+    save_report appends an entry in O(1); when a report is saved again (a
+    second run the same day) the later entry wins. entries() reads the
+    manifest, never the reports folder; repair() is the only directory scan.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def add(self, report_path, stats=None, saved=None):
+        """Record a saved report"""
+        entry = {
+            'file': Path(report_path).name,
+            'date': report_date(report_path),
+            'saved': saved or datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'stats': stats or {},
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(entry, separators=(',', ':'), sort_keys=True) + '\n')
+        return entry
+
+    def entries(self):
+        """Latest entry per report, newest report first (by filename, like the old glob)"""
+        latest = {}
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        latest[entry['file']] = entry
+
+        return [latest[name] for name in sorted(latest, reverse=True)]
+
+    def repair(self, reports_dir):
+        """
+        Rebuild the manifest from the reports on disk (written atomically)
+
+        Stats of reports that are still present are kept; reports that are gone
+        are dropped, and reports missing from the manifest are added without stats.
+        Returns the number of entries.
+        """
+        known = {entry['file']: entry for entry in self.entries()}
+        entries = []
+
+        for report in sorted(Path(reports_dir).glob(REPORT_PATTERN)):
+            entry = known.get(report.name)
+            if entry is None:
+                saved = datetime.fromtimestamp(report.stat().st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+                entry = {'file': report.name, 'date': report_date(report), 'saved': saved, 'stats': {}}
+            entries.append(entry)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(f".{self.path.name}.tmp")
+        with open(temp_path, 'w') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(',', ':'), sort_keys=True) + '\n')
+        os.replace(temp_path, self.path)
+
+        return len(entries)
+
+
+def open_manifest(path, reports_dir):
+    """Open the manifest, building it from disk once if it does not exist yet"""
+    manifest = ReportManifest(path)
+    if not manifest.path.exists():
+        entries = manifest.repair(reports_dir)
+        print(f"✅ Report manifest built from {entries} reports: {manifest.path}")
+    return manifest
+
+def headline(entry):
+    """' — 12 themes, 30 tickers' from an entry's stats ('' without stats)"""
+    stats = entry.get('stats') or {}
+    parts = [f"{stats[key]} {key}" for key in ('themes', 'tickers') if key in stats]
+    return f" — {', '.join(parts)}" if parts else ""
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (2, 3) or sys.argv[1] != "repair":
+        print(__doc__)
+        sys.exit(1)
+
+    if len(sys.argv) == 3:
+        reports_dir = Path(sys.argv[2]).expanduser()
+    else:
+        from settings import require_settings
+        reports_dir = require_settings().reports_dir
+
+    manifest = ReportManifest(reports_dir / "data" / "report_index.ndjson")
+    entries = manifest.repair(reports_dir)
+    print(f"✅ Rebuilt {manifest.path} from {entries} reports")
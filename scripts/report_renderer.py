@@ -0,0 +1,84 @@
+"""
+Report Renderer
+Streams reports section by section to text handles (files, stdout, io.StringIO)
+
+A report is a list of sections; a section is any callable that takes a
+ReportWriter (usually a functools.partial over a write_* function). Nothing is
+concatenated: every helper writes straight through, so memory stays bounded by
+the largest single row no matter how large the report is, and table rows can
+be generators.
+"""
+
+import io
+import sys
+from pathlib import Path
+
+# Width of the ═══ banners in the plain-text monitor reports
+BANNER_WIDTH = 63
+
+
+class ReportWriter:
+    """Writes every piece of a report to all of its handles as soon as it is produced"""
+
+    def __init__(self, *handles):
+        self.handles = handles
+        if len(handles) == 1:
+            self.write = handles[0].write
+
+    def write(self, text):
+        for handle in self.handles:
+            handle.write(text)
+
+    def line(self, text=""):
+        self.write(text + "\n")
+
+    def lines(self, lines):
+        for text in lines:
+            self.write(text + "\n")
+
+    def bullets(self, items, prefix="- "):
+        for item in items:
+            self.write(f"{prefix}{item}\n")
+
+    def table(self, headers, rows):
+        """Markdown table; rows is any iterable of cell sequences"""
+        self.write("| " + " | ".join(headers) + " |\n")
+        self.write("|" + "|".join("-" * (len(header) + 2) for header in headers) + "|\n")
+        write = self.write
+        for row in rows:
+            write("| " + " | ".join(map(str, row)) + " |\n")
+
+    def banner(self, title, width=BANNER_WIDTH):
+        """Plain-text section banner used by the monitor reports"""
+        rule = "═" * width
+        self.write(f"\n{rule}\n{title}\n{rule}\n\n")
+
+    def box(self, *titles, width=BANNER_WIDTH, indent=10):
+        """Boxed plain-text report header, one padded line per title"""
+        self.write("\n╔" + "═" * width + "╗\n")
+        for title in titles:
+            self.write("║" + (" " * indent + title).ljust(width) + "║\n")
+        self.write("╚" + "═" * width + "╝\n")
+
+
+def render(sections, *handles):
+    """Stream sections, in order, to every handle"""
+    writer = ReportWriter(*handles)
+    for section in sections:
+        section(writer)
+
+def render_to_string(sections):
+    """Render sections into a string (for callers that need the text itself)"""
+    buffer = io.StringIO()
+    render(sections, buffer)
+    return buffer.getvalue()
+
+def render_to_file(sections, path, echo=False):
+    """Stream sections into a file (and to stdout with echo); returns the path"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path, 'w') as f:
+        render(sections, *((f, sys.stdout) if echo else (f,)))
+
+    return path
@@ -0,0 +1,235 @@
+"""
+Response Cache
+Persistent TTL + LRU cache of search results and listing pages, shared across runs
+
+Entries are keyed by source, the normalized query or URL, and a time bucket the
+size of the source's TTL. The same query on the same day (or the same listing
+page within a few minutes) is therefore a hit, and the next bucket starts fresh.
+Each entry is one file: a JSON header line (source, key, stored, expires,
+fetch_seconds) followed by the raw response bytes, written atomically. The
+cache stays under max_bytes by evicting the least recently used entries; a hit
+touches its file, so the LRU order survives restarts without a separate index.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from run_profile import count as count_metric
+
+RESPONSE_CACHE_DIR = Path(__file__).parent.parent / 'data' / 'response_cache'
+
+# Seconds an entry stays fresh, per source (also the size of the key's time bucket)
+DEFAULT_TTLS = {
+    'search': 24 * 3600,
+    'listing': 5 * 60,
+}
+DEFAULT_TTL = 3600
+
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def normalize_query(query):
+    """Case- and whitespace-insensitive form of a search query"""
+    return " ".join(query.lower().split())
+
+def normalize_url(url):
+    """URL with a lowercase scheme and host, sorted query parameters and no fragment"""
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+
+def normalize_key(key):
+    """normalize_url for URLs and paths, normalize_query for anything else"""
+    if '://' in key or key.startswith('/'):
+        return normalize_url(key)
+    return normalize_query(key)
+
+
+class ResponseCache:
+    """
+    Thread-safe on-disk TTL + LRU response cache
+
+    get() / put() work on bytes, get_json() / put_json() on JSON values, and
+    get_or_fetch() wraps a fetch function. Each entry remembers how long its
+    fetch took, so a hit adds that time (less the lookup) to saved_seconds.
+    hits, misses, expired and evicted count since the last reset_stats().
+    """
+
+    def __init__(self, root=RESPONSE_CACHE_DIR, max_bytes=RESPONSE_CACHE_MAX_BYTES, ttls=None,
+                 clock=time.time):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.reset_stats()
+        self._scan()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+        self.saved_seconds = 0.0
+        self.lookup_seconds = 0.0
+
+    def ttl(self, source):
+        return self.ttls.get(source, DEFAULT_TTL)
+
+    def _digest(self, source, key, now):
+        bucket = int(now // self.ttl(source))
+        return hashlib.sha256(f"{source}\0{normalize_key(key)}\0{bucket}".encode('utf-8')).hexdigest()
+
+    def _path(self, digest):
+        return self.root / digest[:2] / digest
+
+    def _scan(self):
+        """Load sizes and expiry times of the saved entries, least recently used first"""
+        if not self.root.exists():
+            return
+
+        now = self.clock()
+        found = []
+        for path in self.root.glob('??/*'):
+            if path.name.startswith('.'):
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    header = json.loads(f.readline())
+                stat = path.stat()
+                expired = header['expires'] <= now
+            except (OSError, ValueError, KeyError, TypeError):
+                # Unreadable, or not one of our entries
+                continue
+            if expired:
+                path.unlink(missing_ok=True)
+                continue
+            found.append((stat.st_mtime, path.name, header['expires'], stat.st_size))
+
+        for _, digest, expires, size in sorted(found):
+            self.entries[digest] = (expires, size)
+            self.nbytes += size
+
+    def _drop(self, digest):
+        expires, size = self.entries.pop(digest)
+        self.nbytes -= size
+        self._path(digest).unlink(missing_ok=True)
+
+    def get(self, source, key):
+        """Cached bytes for (source, key) in the current time bucket, or None"""
+        start = time.perf_counter()
+        now = self.clock()
+        digest = self._digest(source, key, now)
+
+        with self.lock:
+            entry = self.entries.get(digest)
+            if entry is not None and entry[0] <= now:
+                self._drop(digest)
+                self.expired += 1
+                entry = None
+
+            data = None
+            if entry is not None:
+                path = self._path(digest)
+                try:
+                    with open(path, 'rb') as f:
+                        header = json.loads(f.readline())
+                        data = f.read()
+                    os.utime(path)
+                    self.entries.move_to_end(digest)
+                except (OSError, ValueError):
+                    # Removed or replaced by another process
+                    self.entries.pop(digest, None)
+                    self.nbytes -= entry[1]
+
+            elapsed = time.perf_counter() - start
+            self.lookup_seconds += elapsed
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.saved_seconds += max(0.0, header.get('fetch_seconds', 0.0) - elapsed)
+        count_metric('response_cache_hits' if data is not None else 'response_cache_misses')
+        return data
+
+    def put(self, source, key, data, fetch_seconds=0.0):
+        """Store bytes for (source, key) in the current time bucket, evicting LRU entries over max_bytes"""
+        now = self.clock()
+        digest = self._digest(source, key, now)
+        header = {
+            'source': source, 'key': normalize_key(key), 'stored': now,
+            'expires': now + self.ttl(source), 'fetch_seconds': round(fetch_seconds, 6),
+        }
+        encoded = json.dumps(header).encode('utf-8') + b"\n"
+        size = len(encoded) + len(data)
+        if size > self.max_bytes:
+            return False
+
+        path = self._path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{digest}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(encoded)
+            f.write(data)
+        os.replace(temp_path, path)
+
+        with self.lock:
+            if digest in self.entries:
+                self.nbytes -= self.entries.pop(digest)[1]
+            self.entries[digest] = (header['expires'], size)
+            self.nbytes += size
+
+            # Expired entries are never touched again, so they drift to the LRU end too
+            while self.nbytes > self.max_bytes:
+                self._drop(next(iter(self.entries)))
+                self.evicted += 1
+        return True
+
+    def get_json(self, source, key):
+        data = self.get(source, key)
+        return None if data is None else json.loads(data)
+
+    def put_json(self, source, key, value, fetch_seconds=0.0):
+        return self.put(source, key, json.dumps(value).encode('utf-8'), fetch_seconds)
+
+    def get_or_fetch(self, source, key, fetch):
+        """Cached bytes, or fetch() (timed and stored) on a miss"""
+        data = self.get(source, key)
+        if data is None:
+            start = time.perf_counter()
+            data = fetch()
+            self.put(source, key, data, time.perf_counter() - start)
+        return data
+
+    def purge(self):
+        """Delete every expired entry; returns how many"""
+        now = self.clock()
+        with self.lock:
+            stale = [digest for digest, (expires, _) in self.entries.items() if expires <= now]
+            for digest in stale:
+                self._drop(digest)
+        return len(stale)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def summary(self):
+        return (f"{self.hits} hits / {self.misses} misses ({self.hit_rate():.0%}), "
+                f"~{self.saved_seconds:.2f}s of fetching saved "
+                f"({len(self)} entries, {self.nbytes / 1024 / 1024:.1f} MB"
+                + (f", {self.evicted} evicted" if self.evicted else "") + ")")
+
+    def print_summary(self):
+        print(f"🗄️  Response cache: {self.summary()}")
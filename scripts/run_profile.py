@@ -0,0 +1,315 @@
+"""
+Run Profile
+Lightweight span timing for pipeline stages, written as a JSON run profile and
+optionally as a Prometheus textfile (for node_exporter's textfile collector)
+
+Instrumented code calls the module-level span() / count() helpers. They go to
+the active profile, which is a no-op until profiled_run() starts a real one, so
+uninstrumented runs pay one function call and an empty `with` per span.
+
+    with profiled_run('live_report', options):
+        with span('setup'):
+            ensure_directories()
+
+options is the "profile" block of config.json:
+    {"enabled": true, "directory": "data/profiles", "prometheus_textfile_dir": "/var/lib/node_exporter"}
+Each run writes <directory>/<run>-<YYYYmmdd-HHMMSS-ffffff>.json (the newest `keep` per run are
+kept) and, with prometheus_textfile_dir, <run>.prom there (gauges of the latest run).
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+PROFILE_DIR = Path(__file__).parent.parent / 'data' / 'profiles'
+
+# Individual spans kept per run; past this only the per-stage totals grow
+MAX_SPANS = 10000
+
+# JSON profiles kept per run name; older ones are deleted (the "keep" option)
+MAX_PROFILES = 200
+
+# Prometheus metric name prefix
+METRIC_PREFIX = 'reddit_monitor'
+
+
+class _NullSpan:
+    """Shared span of a disabled profile: entering, exiting and setting attributes do nothing"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+NULL_SPAN = _NullSpan()
+
+
+class NullProfile:
+    """Profile used when profiling is off"""
+
+    enabled = False
+
+    def span(self, name, **attrs):
+        return NULL_SPAN
+
+    def count(self, name, value=1):
+        pass
+
+
+class Span:
+    """One timed stage; attributes can be added while it runs with set()"""
+
+    __slots__ = ('profile', 'name', 'attrs', 'parent', 'depth', 'start', 'seconds', 'index')
+
+    def __init__(self, profile, name, attrs):
+        self.profile = profile
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        stack = self.profile._stack()
+        self.parent = stack[-1].index if stack else None
+        self.depth = len(stack)
+        self.index = self.profile._reserve()
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.seconds = time.perf_counter() - self.start
+        self.profile._stack().pop()
+        if exc_type is not None:
+            self.attrs['error'] = exc_type.__name__
+        self.profile._finish(self)
+        return False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class RunProfile:
+    """
+    Spans and counters of one run (thread-safe)
+
+    Spans nest per thread: a span's parent is the innermost open span on the
+    same thread, so stages run by worker threads show up as top-level spans
+    tagged with their thread name. Per-stage totals (calls, seconds) are kept
+    for every span, the spans themselves for the first MAX_SPANS.
+    """
+
+    enabled = True
+
+    def __init__(self, run):
+        self.run = run
+        self.started = datetime.now()
+        self.start = time.perf_counter()
+        self.seconds = None
+        self.status = 'running'
+        self.spans = []
+        self.dropped = 0
+        self.stages = {}
+        self.counters = {}
+        self.path = None
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def _stack(self):
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def _reserve(self):
+        """Slot for a span being entered (spans are listed in start order), or None past MAX_SPANS"""
+        with self.lock:
+            if len(self.spans) >= MAX_SPANS:
+                return None
+            self.spans.append(None)
+            return len(self.spans) - 1
+
+    def _finish(self, span):
+        with self.lock:
+            calls, seconds = self.stages.get(span.name, (0, 0.0))
+            self.stages[span.name] = (calls + 1, seconds + span.seconds)
+            if span.index is not None:
+                self.spans[span.index] = {
+                    'name': span.name,
+                    'start': round(span.start - self.start, 6),
+                    'seconds': round(span.seconds, 6),
+                    'depth': span.depth,
+                    'parent': span.parent,
+                    'thread': threading.current_thread().name,
+                    **({'attrs': span.attrs} if span.attrs else {}),
+                }
+            else:
+                self.dropped += 1
+
+    def span(self, name, **attrs):
+        return Span(self, name, attrs)
+
+    def count(self, name, value=1):
+        """Add value to a run counter (posts fetched, seconds waited, ...)"""
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def finish(self, status='ok'):
+        self.seconds = time.perf_counter() - self.start
+        self.status = status
+
+    def to_dict(self):
+        with self.lock:
+            return {
+                'run': self.run,
+                'started': self.started.isoformat(timespec='seconds'),
+                'seconds': round(self.seconds if self.seconds is not None else time.perf_counter() - self.start, 6),
+                'status': self.status,
+                'pid': os.getpid(),
+                'stages': {
+                    name: {'calls': calls, 'seconds': round(seconds, 6)}
+                    for name, (calls, seconds) in self.stages.items()
+                },
+                'counters': dict(self.counters),
+                'spans': [span for span in self.spans if span is not None],
+                'dropped_spans': self.dropped,
+            }
+
+    def write_json(self, path):
+        """Write the profile as JSON (atomically); returns the path"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.tmp")
+        with open(temp_path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(temp_path, path)
+        return path
+
+    def prometheus_lines(self):
+        """The profile in the Prometheus text exposition format"""
+        profile = self.to_dict()
+        run = f'run="{profile["run"]}"'
+
+        lines = [
+            f"# HELP {METRIC_PREFIX}_stage_seconds Wall time spent in each stage of the last run",
+            f"# TYPE {METRIC_PREFIX}_stage_seconds gauge",
+        ]
+        lines += [f'{METRIC_PREFIX}_stage_seconds{{{run},stage="{name}"}} {stage["seconds"]}'
+                  for name, stage in profile['stages'].items()]
+        lines += [
+            f"# HELP {METRIC_PREFIX}_stage_calls Times each stage ran in the last run",
+            f"# TYPE {METRIC_PREFIX}_stage_calls gauge",
+        ]
+        lines += [f'{METRIC_PREFIX}_stage_calls{{{run},stage="{name}"}} {stage["calls"]}'
+                  for name, stage in profile['stages'].items()]
+        if profile['counters']:
+            lines += [
+                f"# HELP {METRIC_PREFIX}_run_counter Counters recorded during the last run",
+                f"# TYPE {METRIC_PREFIX}_run_counter gauge",
+            ]
+            lines += [f'{METRIC_PREFIX}_run_counter{{{run},counter="{name}"}} {value}'
+                      for name, value in profile['counters'].items()]
+        lines += [
+            f"# HELP {METRIC_PREFIX}_run_seconds Wall time of the last run",
+            f"# TYPE {METRIC_PREFIX}_run_seconds gauge",
+            f"{METRIC_PREFIX}_run_seconds{{{run}}} {profile['seconds']}",
+            f"# HELP {METRIC_PREFIX}_run_success Whether the last run finished without an error",
+            f"# TYPE {METRIC_PREFIX}_run_success gauge",
+            f"{METRIC_PREFIX}_run_success{{{run}}} {int(profile['status'] == 'ok')}",
+            f"# HELP {METRIC_PREFIX}_run_timestamp_seconds Unix time the last run started",
+            f"# TYPE {METRIC_PREFIX}_run_timestamp_seconds gauge",
+            f"{METRIC_PREFIX}_run_timestamp_seconds{{{run}}} {self.started.timestamp():.0f}",
+        ]
+        return lines
+
+    def write_prometheus(self, path):
+        """
+        Write a Prometheus textfile; returns the path
+
+        The file is replaced atomically, so the textfile collector never reads a
+        half-written one (its temp name does not end in .prom).
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.tmp")
+        with open(temp_path, 'w') as f:
+            f.write("\n".join(self.prometheus_lines()) + "\n")
+        os.replace(temp_path, path)
+        return path
+
+    def summary(self):
+        stages = sorted(self.stages.items(), key=lambda item: item[1][1], reverse=True)
+        return ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, (_, seconds) in stages[:5])
+
+
+_profile = NullProfile()
+
+def get_profile():
+    """The active profile (a NullProfile unless a profiled_run is in progress)"""
+    return _profile
+
+def span(name, **attrs):
+    """Time a stage of the active profile: `with span('fetch', subreddit=name):`"""
+    if not _profile.enabled:
+        return NULL_SPAN
+    return _profile.span(name, **attrs)
+
+def count(name, value=1):
+    """Add to a counter of the active profile"""
+    _profile.count(name, value)
+
+def profile_path(directory, run, started):
+    """<directory>/<run>-<YYYYmmdd-HHMMSS-ffffff>.json: one file per run, in time order by name"""
+    return Path(directory) / f"{run}-{started:%Y%m%d-%H%M%S-%f}.json"
+
+def prune_profiles(directory, run, keep=MAX_PROFILES):
+    """Delete all but the newest `keep` JSON profiles of run; returns how many were deleted"""
+    pattern = re.compile(rf"{re.escape(run)}-\d{{8}}-\d{{6}}-\d{{6}}\.json")
+    paths = sorted(path for path in Path(directory).glob(f"{run}-*.json") if pattern.fullmatch(path.name))
+    stale = paths[:-max(1, keep)]
+    for path in stale:
+        path.unlink(missing_ok=True)
+    return len(stale)
+
+@contextmanager
+def profiled_run(run, options=None, directory=PROFILE_DIR):
+    """
+    Profile the enclosed block as run `run` if options (the config's "profile" block) enable it
+
+    On exit, even after an error, the profile is written to
+    <directory>/<run>-<YYYYmmdd-HHMMSS-ffffff>.json (its path is then profile.path) and,
+    with a prometheus_textfile_dir option, to <run>.prom there. Only the newest
+    `keep` (default MAX_PROFILES) JSON profiles of the run are kept. Yields the
+    profile (a NullProfile when disabled).
+    """
+    global _profile
+    options = options or {}
+    if not options.get('enabled'):
+        yield _profile
+        return
+
+    profile = RunProfile(run)
+    previous, _profile = _profile, profile
+    status = 'error'
+    try:
+        yield profile
+        status = 'ok'
+    finally:
+        _profile = previous
+        profile.finish(status)
+
+        profile_dir = Path(options.get('directory') or directory)
+        profile.path = profile.write_json(profile_path(profile_dir, run, profile.started))
+        prune_profiles(profile_dir, run, options.get('keep', MAX_PROFILES))
+        print(f"⏱️  Run profile: {profile.summary()} ({profile.path})")
+        if options.get('prometheus_textfile_dir'):
+            profile.write_prometheus(Path(options['prometheus_textfile_dir']) / f"{run}.prom")
@@ -0,0 +1,278 @@
+"""
+Seen Posts
+Scalable Bloom filter of already-processed submissions, keyed by fullname and
+crosspost parent, so repeated scans and crossposts are only analyzed once
+"""
+
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+
+from run_profile import count as count_metric
+
+# Defaults for the persisted seen-post filter
+SEEN_POSTS_CAPACITY = 10000          # posts in the first filter; each new one holds GROWTH x more
+SEEN_POSTS_ERROR_RATE = 0.001        # overall false-positive rate (a new post wrongly skipped)
+SEEN_POSTS_MAX_BYTES = 8 * 1024 * 1024
+
+# Scalable Bloom filter parameters (Almeida et al.): capacity growth and error tightening per filter
+GROWTH = 2
+TIGHTENING = 0.5
+
+# Saved filter layout; files from another version (other probe positions) are not loaded
+FORMAT_VERSION = 2
+
+
+def key_hashes(key):
+    """Two independent 32-bit hashes of a key (for enhanced double hashing; small ints keep probing cheap)"""
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest[:4], 'little'), int.from_bytes(digest[4:], 'little') | 1
+
+
+def filter_hashes(error_rate):
+    """Probes per key: k = ceil(log2(1 / error_rate))"""
+    return max(1, math.ceil(-math.log2(error_rate)))
+
+def filter_bits(capacity, error_rate):
+    """
+    Bits for a capacity and false-positive rate: m = ceil(n k / ln 2)
+
+    With the integer k above this fills half the bits at capacity, so the
+    false-positive rate is 0.5 ** k <= error_rate (the usual
+    m = -n ln p / ln(2)^2 overshoots the target once k is rounded).
+    """
+    return max(8, math.ceil(capacity * filter_hashes(error_rate) / math.log(2)))
+
+
+class BloomFilter:
+    """
+    Fixed-capacity Bloom filter over a bytearray
+
+    Probe i is h1 + i h2 + (i^3 - i) / 6 (mod size), Kirsch and Mitzenmacher's
+    enhanced double hashing. Plain h1 + i h2 probes are correlated enough to
+    push the measured false-positive rate ~25% past 0.5 ** k.
+    """
+
+    def __init__(self, capacity, error_rate, count=0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = filter_bits(capacity, error_rate)
+        self.hashes = filter_hashes(error_rate)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = count
+
+    def __contains__(self, hashes):
+        # Probes are generated lazily: a miss usually stops after one or two
+        bits, size = self.bits, self.size
+        position, step = hashes[0] % size, hashes[1] % size
+        for i in range(1, self.hashes + 1):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+            position = (position + step) % size
+            step = (step + i) % size
+        return True
+
+    def add(self, hashes):
+        bits, size = self.bits, self.size
+        position, step = hashes[0] % size, hashes[1] % size
+        for i in range(1, self.hashes + 1):
+            bits[position >> 3] |= 1 << (position & 7)
+            position = (position + step) % size
+            step = (step + i) % size
+        self.count += 1
+
+    @property
+    def full(self):
+        return self.count >= self.capacity
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows instead of degrading as items are added
+
+    When the current filter reaches its capacity a new one is added with GROWTH
+    times the capacity and TIGHTENING times the error rate, which keeps the
+    compound false-positive rate under error_rate. Filters stop growing once one
+    would take more than half of max_bytes; from then on new filters repeat the
+    last size and the oldest are dropped to stay under the cap, so the structure
+    forgets the oldest posts rather than growing without bound or losing accuracy.
+    """
+
+    def __init__(self, capacity=SEEN_POSTS_CAPACITY, error_rate=SEEN_POSTS_ERROR_RATE,
+                 max_bytes=SEEN_POSTS_MAX_BYTES):
+        self.initial_capacity = capacity
+        self.error_rate = error_rate
+        self.max_bytes = max_bytes
+        self.filters = []
+        self.generation = 0
+
+    def _new_filter(self):
+        capacity = self.initial_capacity * GROWTH ** self.generation
+        error_rate = self.error_rate * (1 - TIGHTENING) * TIGHTENING ** self.generation
+
+        if self.filters and filter_bits(capacity, error_rate) // 8 > self.max_bytes // 2:
+            last = self.filters[-1]
+            return BloomFilter(last.capacity, last.error_rate)
+
+        self.generation += 1
+        return BloomFilter(capacity, error_rate)
+
+    def __contains__(self, key):
+        hashes = key_hashes(key)
+        return any(hashes in bloom for bloom in reversed(self.filters))
+
+    def __len__(self):
+        return sum(bloom.count for bloom in self.filters)
+
+    @property
+    def nbytes(self):
+        return sum(len(bloom.bits) for bloom in self.filters)
+
+    def add(self, key):
+        """Add key; returns False if it was (probably) already present"""
+        hashes = key_hashes(key)
+        if any(hashes in bloom for bloom in reversed(self.filters)):
+            return False
+
+        if not self.filters or self.filters[-1].full:
+            bloom = self._new_filter()
+            while self.filters and self.nbytes + len(bloom.bits) > self.max_bytes:
+                self.filters.pop(0)
+            self.filters.append(bloom)
+
+        self.filters[-1].add(hashes)
+        return True
+
+    def save(self, path):
+        """Persist as a JSON header line followed by the raw filter bits (written atomically)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        header = {
+            'version': FORMAT_VERSION, 'capacity': self.initial_capacity, 'error_rate': self.error_rate,
+            'max_bytes': self.max_bytes, 'generation': self.generation,
+            'filters': [
+                {'capacity': bloom.capacity, 'error_rate': bloom.error_rate, 'count': bloom.count}
+                for bloom in self.filters
+            ],
+        }
+
+        temp_path = path.with_name(f".{path.name}.tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(json.dumps(header).encode('utf-8') + b"\n")
+            for bloom in self.filters:
+                f.write(bloom.bits)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path, capacity=SEEN_POSTS_CAPACITY, error_rate=SEEN_POSTS_ERROR_RATE,
+             max_bytes=SEEN_POSTS_MAX_BYTES):
+        """Load a saved filter, or start empty if there is none, it is an older format or its error rate changed"""
+        path = Path(path)
+        seen = cls(capacity, error_rate, max_bytes)
+        if not path.exists():
+            return seen
+
+        with open(path, 'rb') as f:
+            header = json.loads(f.readline())
+            if (header.get('version') != FORMAT_VERSION or header['error_rate'] != error_rate
+                    or header['capacity'] != capacity):
+                return seen
+
+            seen.generation = header['generation']
+            for spec in header['filters']:
+                bloom = BloomFilter(spec['capacity'], spec['error_rate'], count=spec['count'])
+                f.readinto(bloom.bits)
+                seen.filters.append(bloom)
+
+        # A lower cap than the one the filter was saved with applies from now on
+        while len(seen.filters) > 1 and seen.nbytes > max_bytes:
+            seen.filters.pop(0)
+        return seen
+
+
+def post_keys(post):
+    """Fullname and crosspost parent of a praw submission or a post dict"""
+    if isinstance(post, dict):
+        fullname = post.get('name') or (f"t3_{post['id']}" if post.get('id') else post.get('url', ''))
+        parent = post.get('crosspost_parent')
+    else:
+        fullname = getattr(post, 'name', None) or f"t3_{post.id}"
+        parent = getattr(post, 'crosspost_parent', None)
+    return fullname, parent
+
+
+class SeenPosts:
+    """
+    Thread-safe seen-post check shared by the subreddit workers
+
+    check() marks a post (and its crosspost parent) as seen and says whether it
+    is new, so a crosspost and its original are analyzed once whichever comes
+    first. It also keeps the numbers for the run summary: posts checked and
+    skipped, time spent in the filter, and extraction time per processed post,
+    from which the time saved by skipping is estimated.
+    """
+
+    def __init__(self, bloom=None):
+        self.bloom = bloom if bloom is not None else ScalableBloomFilter()
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.checked = 0
+        self.skipped = 0
+        self.processed = 0
+        self.processing_seconds = 0.0
+        self.check_seconds = 0.0
+
+    def check(self, post):
+        """True if the post is new (and now marked seen), False to skip it"""
+        start = time.perf_counter()
+        fullname, parent = post_keys(post)
+        with self.lock:
+            self.checked += 1
+            # add() is the membership test: it returns False for a post already seen
+            new = self.bloom.add(fullname)
+            if parent:
+                new = self.bloom.add(parent) and new
+
+            if not new:
+                self.skipped += 1
+            self.check_seconds += time.perf_counter() - start
+        count_metric('seen_posts_checked')
+        if not new:
+            count_metric('seen_posts_skipped')
+        return new
+
+    def processed_post(self, seconds, posts=1):
+        """Record how long new posts (one by default) took to analyze"""
+        with self.lock:
+            self.processed += posts
+            self.processing_seconds += seconds
+
+    def saved_seconds(self):
+        """Estimated processing time saved: skipped posts x mean time per processed post"""
+        if not self.processed:
+            return 0.0
+        return self.skipped * self.processing_seconds / self.processed
+
+    def summary(self):
+        return (f"{self.skipped} of {self.checked} posts already seen, "
+                f"~{self.saved_seconds() * 1000:.1f} ms of processing saved "
+                f"for {self.check_seconds * 1000:.1f} ms of checks "
+                f"(filter: {len(self.bloom)} posts, {self.bloom.nbytes / 1024:.0f} KB)")
+
+    def print_summary(self):
+        print(f"⏭️  Seen posts: {self.summary()}")
+
+    def save(self, path):
+        with self.lock:
+            self.bloom.save(path)
+
+    @classmethod
+    def load(cls, path, **options):
+        return cls(ScalableBloomFilter.load(path, **options))
@@ -0,0 +1,33 @@
+"""
+Sentiment Engine
+Keyword lexicon sentiment scoring
+"""
+
+POSITIVE_WORDS = ['bullish', 'surge', 'gain', 'growth', 'momentum', 'upgrade',
+                  'strong', 'rally', 'breakout', 'buy', 'opportunity', 'catalyst',
+                  'outperform', 'beating', 'revenue growth', 'partnership']
+
+NEGATIVE_WORDS = ['bearish', 'decline', 'loss', 'drop', 'downgrade', 'weak',
+                  'risk', 'concern', 'warning', 'overvalued', 'sell', 'miss']
+
+# A label needs this many more hits on one side than the other
+LABEL_MARGIN = 2
+
+def analyze_sentiment(text):
+    """Simple sentiment analysis based on keywords"""
+    if not text:
+        return "neutral"
+
+    text_lower = text.lower()
+
+    # Each keyword counts once (substring presence). For a lexicon this size,
+    # one C substring search per keyword beats tokenizing the text in Python.
+    positive_count = sum(1 for word in POSITIVE_WORDS if word in text_lower)
+    negative_count = sum(1 for word in NEGATIVE_WORDS if word in text_lower)
+
+    if positive_count > negative_count + LABEL_MARGIN:
+        return "positive"
+    elif negative_count > positive_count + LABEL_MARGIN:
+        return "negative"
+    else:
+        return "neutral"
@@ -0,0 +1,124 @@
+"""
+Settings
+Lazily loaded view of config.json, shared by the report generators
+
+Nothing is read at import time: the file is loaded the first time a value is
+needed, so the analysis modules can be imported as a library (or with an
+in-memory config) without a config.json on disk.
+"""
+
+import json
+import sys
+from functools import cached_property
+from pathlib import Path
+
+CONFIG_PATH = Path(__file__).parent.parent / "config.json"
+
+
+class ConfigError(Exception):
+    """config.json is missing or unreadable"""
+
+
+class Settings:
+    """
+    Settings derived from one config (a config.json path or an already-loaded dict)
+
+    Every value is computed on first access and cached, including the compiled
+    ticker matcher.
+    """
+
+    def __init__(self, path=CONFIG_PATH, config=None):
+        self.path = Path(path)
+        if config is not None:
+            self.__dict__['config'] = config
+
+    @cached_property
+    def config(self):
+        """The raw config dict"""
+        if not self.path.exists():
+            raise ConfigError(f"config.json not found at {self.path}")
+
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    @cached_property
+    def vault(self):
+        return Path(self.config['obsidian_vault_path']).expanduser()
+
+    @cached_property
+    def reports_dir(self):
+        return self.vault / self.config['reports_subfolder']
+
+    @cached_property
+    def data_dir(self):
+        return self.reports_dir / "data"
+
+    @cached_property
+    def tickers(self):
+        """{tier: [tickers]}"""
+        return self.config['tickers']
+
+    @cached_property
+    def all_tickers(self):
+        """Every tracked ticker, in tier order"""
+        return [ticker for tickers in self.tickers.values() for ticker in tickers]
+
+    @cached_property
+    def ticker_tiers(self):
+        """{ticker: tier}; a ticker listed in several tiers keeps the last one"""
+        return {ticker: tier for tier, tickers in self.tickers.items() for ticker in tickers}
+
+    @cached_property
+    def ticker_matcher(self):
+        """Compiled matcher for every tracked ticker"""
+        from ticker_matcher import build_matcher
+        return build_matcher(self.tickers)
+
+    @cached_property
+    def profile(self):
+        """Run profiling options, the "profile" block (see run_profile.profiled_run)"""
+        return self.config.get('profile', {})
+
+    @cached_property
+    def daemon(self):
+        """Monitor daemon options, the "daemon" block (see monitor_daemon.DAEMON_DEFAULTS)"""
+        return self.config.get('daemon', {})
+
+    def themes(self, default=None):
+        """{theme: [keywords]} from config, or `default` when the config has none"""
+        return self.config.get('themes', default)
+
+
+_settings = None
+
+def get_settings():
+    """The process-wide Settings (created on first call, loaded on first use)"""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
+
+def configure(path=CONFIG_PATH, config=None):
+    """
+    Point the process-wide Settings at another config (e.g. an in-memory dict)
+
+    The shared instance is reset in place, so modules that already hold it see
+    the new values; cached values are recomputed on next access.
+    """
+    settings = get_settings()
+    settings.__dict__.clear()
+    settings.__init__(path, config)
+    return settings
+
+def require_settings():
+    """get_settings() for script entry points: exit with a message if config.json is unusable"""
+    settings = get_settings()
+    try:
+        settings.config
+    except ConfigError:
+        print("❌ Error: config.json not found!")
+        print(f"   Expected at: {settings.path}")
+        print("\n📝 Please copy config.example.json to config.json and update with your settings:")
+        print("   cp config.example.json config.json")
+        sys.exit(1)
+    return settings
@@ -0,0 +1,144 @@
+"""
+Synthetic Corpus
+Seeded generator of Reddit-like posts and web search results for benchmarks (runs offline)
+
+Words are drawn from one weighted vocabulary: filler words, sentiment words,
+theme keywords, tracked tickers (Zipf-distributed, a third of them as
+$cashtags) and uppercase words that look like tickers but are not tracked.
+Post bodies have a long-tailed length, scores are heavy-tailed, and a few
+posts are crossposts. The same seed always gives the same corpus.
+"""
+
+import numpy as np
+
+from live_reddit_monitor import TICKERS
+from live_report_generator import DEFAULT_THEME_KEYWORDS
+from sentiment import NEGATIVE_WORDS, POSITIVE_WORDS
+
+# The monitors' own defaults (config.example.json carries the same), so there is one table to edit
+DEFAULT_TICKERS = TICKERS
+DEFAULT_THEMES = DEFAULT_THEME_KEYWORDS
+
+SUBREDDITS = {'wallstreetbets': 0.5, 'stocks': 0.2, 'investing': 0.15, 'stockmarket': 0.15}
+
+SOURCES = ['Yahoo Finance', 'Motley Fool', 'Seeking Alpha', 'Benzinga', 'MarketBeat', 'Reuters',
+           'Nasdaq', 'TipRanks', 'CNBC', 'Barron\'s']
+
+FILLER_WORDS = [
+    'the', 'a', 'to', 'and', 'of', 'is', 'in', 'this', 'I', 'it', 'for', 'on', 'my', 'with', 'that',
+    'stock', 'market', 'shares', 'calls', 'puts', 'earnings', 'guidance', 'revenue', 'price',
+    'week', 'today', 'next', 'year', 'think', 'going', 'buy', 'sell', 'hold', 'position', 'dip',
+    'moon', 'yolo', 'bag', 'holder', 'options', 'volume', 'chart', 'analyst', 'target', 'quarter',
+    'company', 'deal', 'contract', 'launch', 'data', 'center', 'power', 'chips', 'AI', 'run',
+]
+
+# Uppercase words that look like tickers but are not tracked
+LOOKALIKES = ['CEO', 'USA', 'DD', 'YOLO', 'IPO', 'ETF', 'FDA', 'GDP', 'NVDA', 'TSLA', 'AMD', 'SPY',
+              'EPS', 'ATH', 'IMO', 'FOMO', 'SEC', 'FED']
+
+# Share of words from each part of the vocabulary
+WORD_MIX = {'filler': 0.85, 'sentiment': 0.04, 'theme': 0.03, 'ticker': 0.025, 'lookalike': 0.055}
+
+# Zipf exponent of ticker popularity (in config order: Tier 1 names are discussed most)
+TICKER_ZIPF = 1.1
+
+# Documents generated per block (bounds the word-index temporaries)
+BLOCK_DOCS = 10000
+
+
+class SyntheticCorpus:
+    """
+    Seeded generator of posts (live_reddit_monitor format) and search results
+    (live_report_generator format)
+
+    posts(n) and search_results(n) return lists; iter_posts / iter_search_results
+    stream them in blocks. Each kind has its own random stream, so generating
+    posts does not change the search results and vice versa.
+    """
+
+    def __init__(self, seed=42, tickers=DEFAULT_TICKERS, themes=DEFAULT_THEMES):
+        self.seed = seed
+        self.tickers = [ticker for tier in tickers.values() for ticker in tier]
+
+        keywords = list(dict.fromkeys(keyword for words in themes.values() for keyword in words))
+        zipf = 1.0 / np.arange(1, len(self.tickers) + 1) ** TICKER_ZIPF
+        zipf /= zipf.sum()
+
+        parts = [
+            (FILLER_WORDS, WORD_MIX['filler'], None),
+            (POSITIVE_WORDS + NEGATIVE_WORDS, WORD_MIX['sentiment'], None),
+            (keywords, WORD_MIX['theme'], None),
+            (self.tickers, WORD_MIX['ticker'] * 2 / 3, zipf),
+            ([f"${ticker}" for ticker in self.tickers], WORD_MIX['ticker'] / 3, zipf),
+            (LOOKALIKES, WORD_MIX['lookalike'], None),
+        ]
+        words, weights = [], []
+        for part, share, distribution in parts:
+            words.extend(part)
+            weights.append(share * (distribution if distribution is not None else np.full(len(part), 1 / len(part))))
+
+        self.vocabulary = np.array(words, dtype=object)
+        self.weights = np.concatenate(weights)
+        self.weights /= self.weights.sum()
+
+    def _rng(self, kind):
+        return np.random.default_rng([self.seed, kind])
+
+    def _texts(self, rng, lengths):
+        """One space-joined text per length"""
+        words = self.vocabulary[rng.choice(len(self.vocabulary), size=int(lengths.sum()), p=self.weights)].tolist()
+        ends = np.cumsum(lengths).tolist()
+        return [" ".join(words[end - length:end]) for end, length in zip(ends, lengths.tolist())]
+
+    def iter_posts(self, n, start_time=1767225600):
+        """Yield n posts: id, name, title, body, subreddit, score, url, created_utc (+ crosspost_parent)"""
+        rng = self._rng(1)
+        subreddits, shares = list(SUBREDDITS), np.array(list(SUBREDDITS.values()))
+
+        for first in range(0, n, BLOCK_DOCS):
+            count = min(BLOCK_DOCS, n - first)
+            titles = self._texts(rng, rng.integers(6, 15, size=count))
+            # Long-tailed body length; a fifth are link posts without a body
+            body_lengths = np.minimum(rng.lognormal(3.8, 0.8, size=count).astype(np.int64), 600)
+            body_lengths[rng.random(count) < 0.2] = 0
+            bodies = self._texts(rng, body_lengths)
+            scores = (rng.pareto(1.2, size=count) * 10).astype(np.int64).tolist()
+            places = rng.choice(len(subreddits), size=count, p=shares).tolist()
+            times = (start_time + np.sort(rng.integers(0, 86400, size=count))).tolist()
+            crossposts = (rng.random(count) < 0.03).tolist()
+
+            for i in range(count):
+                number = first + i
+                post = {
+                    'id': f"s{number:x}",
+                    'name': f"t3_s{number:x}",
+                    'title': titles[i],
+                    'body': bodies[i],
+                    'subreddit': subreddits[places[i]],
+                    'score': scores[i],
+                    'url': f"https://reddit.com/r/{subreddits[places[i]]}/comments/s{number:x}",
+                    'created_utc': times[i],
+                }
+                if crossposts[i] and number:
+                    post['crosspost_parent'] = f"t3_s{number // 2:x}"
+                yield post
+
+    def iter_search_results(self, n):
+        """Yield n search results: content (80-250 words) and source (1-3 outlets)"""
+        rng = self._rng(2)
+
+        for first in range(0, n, BLOCK_DOCS):
+            count = min(BLOCK_DOCS, n - first)
+            contents = self._texts(rng, rng.integers(80, 250, size=count))
+            outlets = rng.integers(1, 4, size=count).tolist()
+            # 1-3 distinct outlets per result: the first columns of a random permutation per row
+            picks = rng.random((count, len(SOURCES))).argsort(axis=1)[:, :3].tolist()
+            for i in range(count):
+                source = ", ".join(SOURCES[pick] for pick in picks[i][:outlets[i]])
+                yield {'content': contents[i], 'source': source}
+
+    def posts(self, n):
+        return list(self.iter_posts(n))
+
+    def search_results(self, n):
+        return list(self.iter_search_results(n))
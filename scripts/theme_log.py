@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Theme Evolution Log
+Append-only NDJSON log of theme snapshots (optionally gzip-compressed), with a
+small date -> byte offset index so readers can seek straight to a date range
+
+Usage (one-time migration of an existing theme_evolution.json):
+    python3 scripts/theme_log.py migrate path/to/theme_evolution.json path/to/theme_evolution.ndjson
+"""
+
+import bisect
+import gzip
+import json
+import sys
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+
+def compact_themes(themes_data):
+    """
+    One compact record per theme: mentions, sorted tickers and sentiment counts
+    (instead of the raw per-document sentiment label lists)
+    """
+    if isinstance(themes_data, list):
+        # Legacy template snapshots are lists of {'name': ..., ...}
+        return {
+            item.get('name', str(i)): {k: v for k, v in item.items() if k != 'name'}
+            for i, item in enumerate(themes_data)
+        }
+
+    compact = {}
+    for name, data in themes_data.items():
+        record = dict(data)
+        if 'tickers' in record:
+            record['tickers'] = sorted(record['tickers'])
+        if isinstance(record.get('sentiment'), list):
+            record['sentiment'] = dict(Counter(record['sentiment']))
+        for key in ('catalysts', 'sources'):
+            record.pop(key, None)
+        compact[name] = record
+
+    return compact
+
+
+class ThemeEvolutionLog:
+    """
+    Append-only snapshot log.
+
+    Every append writes one line (or, when compressed, one self-contained gzip
+    member) and records its starting byte offset in `<log>.idx`. Readers bisect
+    the index for the first wanted date, seek there and stream forward, so the
+    cost depends on the range read rather than on the size of the history.
+    """
+
+    def __init__(self, path, compress=None):
+        self.path = Path(path)
+        self.compress = self.path.suffix == '.gz' if compress is None else compress
+        self.index_path = self.path.with_name(self.path.name + '.idx')
+
+    def append(self, themes_data, date=None):
+        """Append one snapshot; returns the byte offset it was written at"""
+        date = date or datetime.now().strftime("%Y-%m-%d")
+        record = {'date': date, 'themes': compact_themes(themes_data)}
+        line = (json.dumps(record, separators=(',', ':'), sort_keys=True) + '\n').encode('utf-8')
+
+        if self.compress:
+            line = gzip.compress(line, mtime=0)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'ab') as f:
+            offset = f.tell()
+            f.write(line)
+
+        with open(self.index_path, 'a') as f:
+            f.write(f"{date}\t{offset}\n")
+
+        return offset
+
+    def _index(self):
+        """[(date, offset)] in append order"""
+        if not self.index_path.exists():
+            return []
+
+        entries = []
+        with open(self.index_path, 'r') as f:
+            for line in f:
+                date, _, offset = line.rstrip('\n').partition('\t')
+                if offset:
+                    entries.append((date, int(offset)))
+        return entries
+
+    def _start_offset(self, start_date):
+        if not start_date:
+            return 0
+
+        index = self._index()
+        position = bisect.bisect_left([date for date, _ in index], start_date)
+
+        # Records appended after the last index write are still found by scanning on
+        if position >= len(index):
+            return index[-1][1] if index else 0
+        return index[position][1]
+
+    def read(self, start_date=None, end_date=None):
+        """Stream snapshots with start_date <= date <= end_date, oldest first"""
+        if not self.path.exists():
+            return
+
+        with open(self.path, 'rb') as raw:
+            raw.seek(self._start_offset(start_date))
+            lines = gzip.GzipFile(fileobj=raw) if self.compress else raw
+
+            for line in lines:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+
+                if start_date and record['date'] < start_date:
+                    continue
+                if end_date and record['date'] > end_date:
+                    break
+                yield record
+
+    def latest(self):
+        """The most recent snapshot, or None"""
+        index = self._index()
+        start_date = index[-1][0] if index else None
+
+        latest = None
+        for record in self.read(start_date):
+            latest = record
+        return latest
+
+    def migrate_json(self, json_path):
+        """One-time import of a theme_evolution.json list; returns snapshots migrated"""
+        with open(json_path, 'r') as f:
+            history = json.load(f)
+
+        for snapshot in history:
+            self.append(snapshot.get('themes', {}), date=snapshot.get('date'))
+
+        return len(history)
+
+
+def migrate_if_needed(json_path, log):
+    """Migrate a legacy theme_evolution.json into an empty log, then rename it"""
+    json_path = Path(json_path)
+    if not json_path.exists() or log.path.exists():
+        return 0
+
+    snapshots = log.migrate_json(json_path)
+    json_path.rename(json_path.with_name(json_path.name + ".migrated"))
+    print(f"✅ Migrated {snapshots} snapshots from {json_path.name} to {log.path.name}")
+    return snapshots
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] != "migrate":
+        print(__doc__)
+        sys.exit(1)
+
+    log = ThemeEvolutionLog(sys.argv[3])
+    snapshots = log.migrate_json(sys.argv[2])
+    print(f"✅ Migrated {snapshots} snapshots into {log.path}")
@@ -0,0 +1,107 @@
+"""
+Ticker Matcher
+Compiled multi-pattern matcher that finds every tracked ticker in one scan of the text
+"""
+
+import re
+from collections import Counter
+
+# Word tokens, same notion of "word" as the \b boundaries the old per-ticker regexes used
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+class TickerMatcher:
+    """
+    Match a fixed universe of tickers against text in a single pass.
+
+    The text is uppercased and split into word tokens once; each token is then
+    looked up in a hash table built from the ticker list. A ticker consisting only
+    of word characters matches `\\bTICKER\\b` exactly when it equals a whole token,
+    so results are identical to running one word-boundary regex per ticker.
+    Tickers containing other characters (e.g. "BRK.B") fall back to their own regex.
+    """
+
+    def __init__(self, tickers):
+        # Preserve configuration order (first occurrence wins) for stable output
+        self.tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        self._rank = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+        self._token_tickers = frozenset(t for t in self.tickers if TOKEN_PATTERN.fullmatch(t))
+        self._regex_tickers = [
+            (ticker, re.compile(r'\b' + re.escape(ticker) + r'\b'))
+            for ticker in self.tickers
+            if ticker not in self._token_tickers
+        ]
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def __contains__(self, ticker):
+        return ticker in self._rank
+
+    def _tokens(self, text_upper):
+        return TOKEN_PATTERN.findall(text_upper)
+
+    def find(self, text):
+        """Return the distinct tickers found in text, in configuration order"""
+        if not text:
+            return []
+
+        return self.find_upper(text.upper())
+
+    def find_upper(self, text_upper):
+        """Like find(), for text that has already been uppercased"""
+        found = self._token_tickers.intersection(self._tokens(text_upper))
+        if not self._regex_tickers:
+            return sorted(found, key=self._rank.__getitem__)
+
+        # intersection() of a frozenset is frozen
+        found = set(found)
+        for ticker, pattern in self._regex_tickers:
+            if pattern.search(text_upper):
+                found.add(ticker)
+
+        return sorted(found, key=self._rank.__getitem__)
+
+    def find_all(self, text):
+        """Return every ticker occurrence in text, in order of appearance"""
+        if not text:
+            return []
+
+        text_upper = text.upper()
+        if not self._regex_tickers:
+            token_tickers = self._token_tickers
+            return [token for token in self._tokens(text_upper) if token in token_tickers]
+
+        hits = [
+            (match.start(), match.group())
+            for match in TOKEN_PATTERN.finditer(text_upper)
+            if match.group() in self._token_tickers
+        ]
+        for ticker, pattern in self._regex_tickers:
+            hits.extend((match.start(), ticker) for match in pattern.finditer(text_upper))
+
+        return [ticker for _, ticker in sorted(hits)]
+
+    def count(self, text):
+        """Return a Counter of ticker occurrences in text"""
+        return Counter(self.find_all(text))
+
+
+def build_matcher(tickers_by_tier, min_length=1, max_length=None):
+    """
+    Build a matcher from a {tier: [tickers]} mapping such as CONFIG['tickers']
+
+    min_length/max_length restrict the universe, for callers that historically
+    only recognised symbols of a certain length.
+    """
+    tickers = []
+    for tier_tickers in tickers_by_tier.values():
+        for ticker in tier_tickers:
+            if len(ticker) < min_length:
+                continue
+            if max_length is not None and len(ticker) > max_length:
+                continue
+            tickers.append(ticker)
+
+    return TickerMatcher(tickers)
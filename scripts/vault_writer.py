@@ -0,0 +1,164 @@
+"""
+Vault Writer
+Write-if-changed, atomic file writes for the Obsidian vault
+
+The vault is usually synced (iCloud, Dropbox, network shares), so every
+rewrite of an unchanged file costs an upload and can trigger a sync storm.
+VaultWriter hashes the rendered output first and only touches files whose
+content changed; changed files are written to a temp file next to the target
+and renamed over it, so a sync client never sees a half-written note.
+
+Lines matching a `volatile` pattern (e.g. "*Last Changed: ...*") are left out
+of the hash: a file that differs only in its timestamps is not rewritten, so it
+keeps the stamps of the run that last changed its content. The generators word
+their stamps accordingly ("Last Changed", "Generated") rather than claiming the
+latest run updated the note.
+"""
+
+import hashlib
+import os
+import re
+from pathlib import Path
+
+from report_renderer import render
+from run_profile import count as count_metric
+
+# Bytes read per chunk when hashing an existing file
+CHUNK_SIZE = 1 << 16
+
+# Timestamp lines the generators stamp into every note ("Last Updated" is the older wording)
+TIMESTAMP_LINES = (r"^\*(Last Changed|Last changed|Last Updated|Last updated|Generated): .*\*$"
+                   r"|^\*\*Analysis Date:\*\* |^Analysis completed on .* at \d\d:\d\d\. ")
+
+
+class ContentHash:
+    """
+    Text handle that hashes what is written to it (sha256 of UTF-8 lines)
+
+    Writes may split lines anywhere; complete lines are checked against the
+    volatile pattern before they are hashed.
+    """
+
+    def __init__(self, volatile=None):
+        self.volatile = re.compile(volatile) if isinstance(volatile, str) else volatile
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.pending = ""
+
+    def write(self, text):
+        self.size += len(text.encode('utf-8'))
+
+        if self.volatile is None:
+            self.digest.update(text.encode('utf-8'))
+            return
+
+        lines = (self.pending + text).split("\n")
+        self.pending = lines.pop()
+        for line in lines:
+            if not self.volatile.search(line):
+                self.digest.update(line.encode('utf-8') + b"\n")
+
+    def hexdigest(self):
+        if self.pending and not (self.volatile and self.volatile.search(self.pending)):
+            self.digest.update(self.pending.encode('utf-8'))
+        self.pending = ""
+        return self.digest.hexdigest()
+
+
+def file_hash(path, volatile=None):
+    """ContentHash digest of an existing file, or None if it does not exist"""
+    sink = ContentHash(volatile)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), ''):
+                sink.write(chunk)
+    except (FileNotFoundError, UnicodeDecodeError):
+        return None
+    return sink.hexdigest()
+
+
+class VaultWriter:
+    """
+    Writes files only when their content changed, and keeps per-run totals
+
+    write() takes a string; write_sections() takes report_renderer sections and
+    streams them once, into a temp file and the hash together, so a report is
+    never held in memory whole.
+    """
+
+    def __init__(self, volatile=TIMESTAMP_LINES):
+        self.volatile = volatile
+        self.reset()
+
+    def reset(self):
+        self.written = []
+        self.skipped = []
+        self.bytes_written = 0
+        self.bytes_skipped = 0
+
+    def _unchanged(self, path, sink):
+        path = Path(path)
+        if not path.exists():
+            return False
+        return sink.hexdigest() == file_hash(path, self.volatile)
+
+    def _replace(self, path, write_to):
+        """Write through write_to(handle) into a temp file, then rename it over path"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_path = path.with_name(f".{path.name}.tmp")
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                write_to(f)
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+    def _record(self, path, size, changed):
+        if changed:
+            self.written.append(Path(path))
+            self.bytes_written += size
+        else:
+            self.skipped.append(Path(path))
+            self.bytes_skipped += size
+        outcome = 'written' if changed else 'skipped'
+        count_metric(f'vault_files_{outcome}')
+        count_metric(f'vault_bytes_{outcome}', size)
+        return changed
+
+    def write(self, path, content):
+        """Write content to path unless it is unchanged; returns True if written"""
+        sink = ContentHash(self.volatile)
+        sink.write(content)
+
+        changed = not self._unchanged(path, sink)
+        if changed:
+            self._replace(path, lambda f: f.write(content))
+        return self._record(path, sink.size, changed)
+
+    def write_sections(self, path, sections):
+        """Render report sections to path unless the output is unchanged; returns True if written"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        sink = ContentHash(self.volatile)
+
+        temp_path = path.with_name(f".{path.name}.tmp")
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                render(sections, f, sink)
+            changed = not self._unchanged(path, sink)
+            if changed:
+                os.replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+        return self._record(path, sink.size, changed)
+
+    def summary(self):
+        """One-line per-run totals"""
+        return (f"{len(self.written)} written ({self.bytes_written / 1024:.1f} KB), "
+                f"{len(self.skipped)} unchanged ({self.bytes_skipped / 1024:.1f} KB skipped)")
+
+    def print_summary(self):
+        print(f"💾 Vault: {self.summary()}")
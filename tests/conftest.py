@@ -0,0 +1,6 @@
+"""Shared pytest setup: the scripts are flat modules, imported by name as the scripts do"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
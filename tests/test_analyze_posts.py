@@ -0,0 +1,38 @@
+import live_reddit_monitor as monitor
+from seen_posts import SeenPosts
+
+
+def make_posts(count):
+    return [{'id': f"p{i}", 'title': f"ASTS and RKLB {i}", 'body': "SMR" if i % 3 == 0 else "",
+             'subreddit': 'stocks', 'score': (i * 37) % 11, 'url': f"https://reddit.com/p{i}"}
+            for i in range(count)]
+
+
+def test_serial_keeps_the_top_posts_per_ticker_in_post_order():
+    posts = make_posts(40)
+    mentions, ticker_posts = monitor.analyze_posts(posts)
+
+    assert mentions == {'ASTS': 40, 'RKLB': 40, 'SMR': 14}
+    assert list(mentions) == ['ASTS', 'RKLB', 'SMR']
+    for ticker, kept in ticker_posts.items():
+        assert len(kept) == monitor.TOP_POSTS_PER_TICKER
+        scores = sorted((post['score'] for post in posts if ticker in post['title'] + post['body']), reverse=True)
+        assert sorted((post['score'] for post in kept), reverse=True) == scores[:monitor.TOP_POSTS_PER_TICKER]
+        indices = [int(post['url'].rsplit('p', 1)[1]) for post in kept]
+        assert indices == sorted(indices)
+
+
+def test_serial_and_parallel_return_the_same_result():
+    posts = make_posts(300)
+    serial = monitor.analyze_posts(posts)
+    parallel = monitor.analyze_posts_parallel(posts, workers=2, chunk_posts=64)
+    assert parallel == serial
+
+
+def test_seen_posts_are_skipped():
+    posts = make_posts(10)
+    seen = SeenPosts()
+    monitor.analyze_posts(posts[:5], seen)
+    mentions, _ = monitor.analyze_posts(posts, seen)
+    assert mentions['ASTS'] == 5
+    assert seen.skipped == 5
@@ -0,0 +1,98 @@
+import time
+from types import SimpleNamespace
+
+import reddit_monitor
+from reddit_monitor import analyze_subreddit_incremental
+from seen_posts import SeenPosts
+
+
+def make_post(i, created_utc, text="ASTS to the moon"):
+    return SimpleNamespace(
+        id=f"p{i}", name=f"t3_p{i}", title=text, selftext="", score=1,
+        num_comments=0, url=f"https://example.com/{i}", created_utc=created_utc,
+    )
+
+
+class FakeListing:
+    """praw stand-in serving posts newest first, optionally failing after `fail_after` posts"""
+
+    def __init__(self, posts, fail_after=None):
+        self.posts = sorted(posts, key=lambda post: post.created_utc, reverse=True)
+        self.fail_after = fail_after
+
+    def subreddit(self, name):
+        return self
+
+    def new(self, limit=100):
+        for i, post in enumerate(self.posts[:limit]):
+            if self.fail_after is not None and i == self.fail_after:
+                raise ConnectionError("page fetch failed")
+            yield post
+
+
+def total(checkpoint):
+    return sum(sum(counts.values()) for counts in checkpoint['daily_mentions'].values())
+
+
+NOW = time.time()
+OLD_POSTS = [make_post(i, NOW - 3600 - i) for i in range(5)]
+NEW_POSTS = [make_post(i, NOW - 60 - i) for i in range(5, 15)]
+
+
+def test_complete_walk_advances_the_mark():
+    _, _, checkpoint = analyze_subreddit_incremental(FakeListing(OLD_POSTS), 'stocks')
+    assert checkpoint['newest_created_utc'] == OLD_POSTS[0].created_utc
+    assert checkpoint['boundary_ids'] == ['p0']
+    assert total(checkpoint) == 5
+
+    mentions, _, checkpoint = analyze_subreddit_incremental(FakeListing(OLD_POSTS + NEW_POSTS), 'stocks', checkpoint)
+    assert checkpoint['newest_created_utc'] == NEW_POSTS[0].created_utc
+    assert mentions['ASTS'] == total(checkpoint) == 15
+
+
+def test_failed_walk_keeps_the_mark_and_the_retry_fills_the_gap():
+    seen = SeenPosts()
+    _, _, checkpoint = analyze_subreddit_incremental(FakeListing(OLD_POSTS), 'stocks', seen=seen)
+    mark = checkpoint['newest_created_utc']
+
+    _, _, checkpoint = analyze_subreddit_incremental(
+        FakeListing(OLD_POSTS + NEW_POSTS, fail_after=4), 'stocks', checkpoint, seen=seen
+    )
+    assert checkpoint['newest_created_utc'] == mark
+    assert checkpoint['boundary_ids'] == ['p0']
+    assert total(checkpoint) == 9
+
+    # The retry walks the same posts again; the ones already counted are skipped
+    _, _, checkpoint = analyze_subreddit_incremental(FakeListing(OLD_POSTS + NEW_POSTS), 'stocks', checkpoint, seen=seen)
+    assert checkpoint['newest_created_utc'] == NEW_POSTS[0].created_utc
+    assert total(checkpoint) == 15
+
+
+def test_failed_walk_without_a_seen_filter_holds_its_counts_back():
+    _, _, checkpoint = analyze_subreddit_incremental(FakeListing(OLD_POSTS), 'stocks')
+    _, _, checkpoint = analyze_subreddit_incremental(
+        FakeListing(OLD_POSTS + NEW_POSTS, fail_after=4), 'stocks', checkpoint
+    )
+    assert total(checkpoint) == 5
+
+    _, _, checkpoint = analyze_subreddit_incremental(FakeListing(OLD_POSTS + NEW_POSTS), 'stocks', checkpoint)
+    assert total(checkpoint) == 15
+
+
+def test_listing_limit_before_the_mark_keeps_the_mark(monkeypatch, capsys):
+    _, _, checkpoint = analyze_subreddit_incremental(FakeListing(OLD_POSTS), 'stocks')
+    mark = checkpoint['newest_created_utc']
+
+    monkeypatch.setattr(reddit_monitor, 'LISTING_LIMIT', 8)
+    _, _, checkpoint = analyze_subreddit_incremental(
+        FakeListing(OLD_POSTS + NEW_POSTS), 'stocks', checkpoint, seen=SeenPosts()
+    )
+    assert checkpoint['newest_created_utc'] == mark
+    assert "keeping the old high-water mark" in capsys.readouterr().out
+
+
+def test_lookback_cutoff_completes_the_walk():
+    stale = [make_post(i, NOW - 30 * 86400 - i) for i in range(20, 25)]
+    _, _, checkpoint = analyze_subreddit_incremental(FakeListing(NEW_POSTS + stale), 'stocks')
+    assert checkpoint['newest_created_utc'] == NEW_POSTS[0].created_utc
+    assert total(checkpoint) == 10
@@ -0,0 +1,120 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from http_client import HttpClient, HttpError, iter_listing
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    """Replies from `script` (status, headers, body), one entry per request; the last one repeats"""
+
+    protocol_version = 'HTTP/1.1'
+    script = []
+    received = []
+
+    def do_GET(self):
+        self.received.append((self.path, dict(self.headers)))
+        status, headers, body = self.script[min(len(self.received), len(self.script)) - 1]
+        if callable(body):
+            body = body(self.path)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Start a stand-in server; returns (base_url, set_script(...), received requests)"""
+    received = []
+    handler = type('Handler', (ScriptedHandler,), {'script': [], 'received': received})
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, args=(0.01,), daemon=True).start()
+
+    def set_script(*script):
+        handler.script = list(script)
+
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", set_script, received
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def client(base_url, sleeps, rng=lambda: 0.5, **kwargs):
+    return HttpClient(base_url, sleep=sleeps.append, rng=rng, backoff_base=1.0, **kwargs)
+
+
+def test_retry_after_sets_the_minimum_wait(server):
+    base_url, set_script, received = server
+    set_script((429, {'Retry-After': '7'}, b'{}'), (200, {}, b'{"ok": true}'))
+    sleeps = []
+
+    with client(base_url, sleeps) as http:
+        assert http.get_json('/r/stocks/new.json') == {'ok': True}
+    assert sleeps == [7.0]
+    assert http.stats['retries'] == 1 and len(received) == 2
+
+
+def test_backoff_is_full_jitter_and_gives_up_after_max_retries(server):
+    base_url, set_script, received = server
+    set_script((503, {}, b'{}'))
+    sleeps = []
+
+    with client(base_url, sleeps, max_retries=3) as http:
+        with pytest.raises(HttpError) as error:
+            http.get('/r/stocks/new.json')
+    # rng() * base * 2 ** attempt
+    assert sleeps == [0.5, 1.0, 2.0]
+    assert error.value.status == 503
+    assert len(received) == 4 and http.stats['failures'] == 1
+
+
+def test_other_4xx_are_not_retried(server):
+    base_url, set_script, received = server
+    set_script((404, {}, b'{}'))
+    sleeps = []
+
+    with client(base_url, sleeps) as http:
+        with pytest.raises(HttpError) as error:
+            http.get('/r/missing/new.json')
+    assert error.value.status == 404
+    assert sleeps == [] and len(received) == 1
+
+
+def test_not_modified_reuses_the_stored_body(server):
+    base_url, set_script, received = server
+    set_script((200, {'ETag': '"v1"'}, b'{"page": 1}'), (304, {'ETag': '"v1"'}, b''))
+    sleeps = []
+
+    with client(base_url, sleeps) as http:
+        first = http.get('/r/stocks/new.json')
+        second = http.get('/r/stocks/new.json')
+    assert first == second == b'{"page": 1}'
+    assert received[1][1].get('If-None-Match') == '"v1"'
+    assert http.stats['not_modified'] == 1 and http.stats['bytes_saved'] == len(first)
+
+
+def test_iter_listing_pages_with_after(server):
+    base_url, set_script, received = server
+
+    def listing(path):
+        query = parse_qs(urlparse(path).query)
+        start = int(query.get('after', ['t3_0'])[0][3:])
+        end = min(start + int(query['limit'][0]), 5)
+        children = [{'kind': 't3', 'data': {'id': str(i), 'title': f"post {i}"}} for i in range(start, end)]
+        return json.dumps({'data': {'children': children, 'after': f"t3_{end}" if end < 5 else None}}).encode()
+
+    set_script((200, {}, listing))
+    with client(base_url, []) as http:
+        posts = list(iter_listing(http, 'stocks', page_size=2))
+    assert [post['id'] for post in posts] == ['0', '1', '2', '3', '4']
+    assert posts[0]['name'] == 't3_0' and posts[0]['title'] == 'post 0'
+    assert [urlparse(path).path for path, _ in received] == ['/r/stocks/new.json'] * 3
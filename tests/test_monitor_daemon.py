@@ -0,0 +1,55 @@
+from monitor_daemon import DAEMON_DEFAULTS, MonitorDaemon, load_daemon_settings
+from settings import Settings
+
+
+class FlakyFactory:
+    """reddit_factory that fails its first call, like an unreachable API"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("reddit is down")
+        return EmptyReddit()
+
+
+class EmptyReddit:
+    def subreddit(self, name):
+        return self
+
+    def new(self, limit=100):
+        return iter(())
+
+
+def test_failed_cycle_is_logged_and_the_next_one_runs(tmp_path, capsys):
+    daemon = MonitorDaemon(
+        reddit_factory=FlakyFactory(), subreddits=['stocks'], checkpoint_every=100,
+        checkpoint_file=tmp_path / 'checkpoints.json', momentum_file=tmp_path / 'momentum.npz',
+        report_file=tmp_path / 'report.txt',
+    )
+
+    assert daemon.run_scheduled_cycle() is None
+    assert daemon.failures == 1 and daemon.cycles == 0
+    assert "Cycle 1 failed" in capsys.readouterr().out
+
+    timings = daemon.run_scheduled_cycle()
+    assert set(timings) == {'collect', 'analysis'}
+    assert daemon.failures == 1 and daemon.cycles == 1
+
+
+def test_daemon_settings_come_from_the_shared_settings():
+    settings = Settings(config={'daemon': {'interval_minutes': 5}, 'subreddits': ['stocks'],
+                                'profile': {'enabled': True}})
+    options = load_daemon_settings(settings)
+    assert options['interval_minutes'] == 5
+    assert options['checkpoint_every'] == DAEMON_DEFAULTS['checkpoint_every']
+    assert options['subreddits'] == ['stocks']
+    assert options['profile'] == {'enabled': True}
+
+
+def test_daemon_runs_on_defaults_without_a_config(tmp_path):
+    options = load_daemon_settings(Settings(tmp_path / "config.json"))
+    assert options['interval_minutes'] == DAEMON_DEFAULTS['interval_minutes']
+    assert options['profile'] == {}
@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+from post_archive import PostArchive, to_timestamp
+
+DAY = datetime(2026, 1, 18, 12, tzinfo=timezone.utc)
+START = int(DAY.timestamp())
+
+
+def make_posts(count, first=0, step=3600):
+    return [{'id': f"p{i}", 'title': f"post {i}", 'subreddit': 'stocks', 'created_utc': START + i * step}
+            for i in range(first, first + count)]
+
+
+def test_append_skips_posts_already_archived(tmp_path):
+    archive = PostArchive(tmp_path, block_posts=4)
+    assert archive.append(make_posts(10), now=DAY) == 10
+    assert archive.append(make_posts(15), now=DAY) == 5
+    assert archive.append(make_posts(3) + make_posts(3), now=DAY) == 0
+    assert archive.stats()['posts'] == 15
+
+
+def test_get_finds_posts_by_id_or_url(tmp_path):
+    archive = PostArchive(tmp_path, block_posts=4)
+    posts = make_posts(9) + [{'url': 'https://example.com/x', 'title': 'no id'}]
+    archive.append(posts, now=DAY)
+
+    assert archive.get('p7') == posts[7]
+    assert archive.get('https://example.com/x')['title'] == 'no id'
+    assert archive.get('missing') is None
+
+
+def test_read_streams_a_time_range_in_archive_order(tmp_path):
+    archive = PostArchive(tmp_path, block_posts=4)
+    posts = make_posts(48)
+    archive.append(posts, now=DAY)
+
+    assert [post['id'] for post in archive.read()] == [post['id'] for post in posts]
+
+    week = list(archive.read(START + 5 * 3600, START + 20 * 3600))
+    assert [post['id'] for post in week] == [f"p{i}" for i in range(5, 20)]
+    assert list(archive.read("2026-01-19", "2026-01-20")) == posts[12:36]
+
+
+def test_segments_roll_over_by_day_and_size(tmp_path):
+    archive = PostArchive(tmp_path, segment_bytes=1, block_posts=4)
+    archive.append(make_posts(4), now=DAY)
+    archive.append(make_posts(4, first=4), now=DAY)
+    archive.append(make_posts(4, first=8), now=datetime(2026, 1, 19, tzinfo=timezone.utc))
+
+    assert archive.segments() == ['2026-01-18.000.ndjson.gz', '2026-01-18.001.ndjson.gz',
+                                  '2026-01-19.000.ndjson.gz']
+    assert len(list(archive.read())) == 12
+
+
+def test_empty_archive(tmp_path):
+    archive = PostArchive(tmp_path / 'none')
+    assert list(archive.read()) == []
+    assert archive.get('p1') is None
+    assert archive.stats() == {'posts': 0, 'segments': 0, 'bytes': 0}
+
+
+def test_to_timestamp_accepts_dates_and_seconds():
+    assert to_timestamp("2026-01-18T12:00:00") == START
+    assert to_timestamp(DAY) == START
+    assert to_timestamp(START) == START
+    assert to_timestamp(None) is None
+
+
+def test_save_posts_json_appends_to_the_archive(tmp_path):
+    from live_reddit_monitor import POST_ARCHIVE_DIR, save_posts_json
+
+    assert POST_ARCHIVE_DIR.is_absolute()
+    assert save_posts_json(make_posts(3), tmp_path) == 3
+    assert save_posts_json(make_posts(4), tmp_path) == 1
+    assert PostArchive(tmp_path).stats()['posts'] == 4
@@ -0,0 +1,39 @@
+import re
+from collections import Counter
+
+import live_reddit_monitor
+import reddit_monitor
+
+MENTIONS = Counter({'ASTS': 12, 'SMR': 7, 'NVDA': 30})
+MOMENTUM = {'SMR': {'current': 7, 'baseline': 2, 'momentum': 3.5}}
+
+
+def untimed(text):
+    """Report text without its generation timestamps (two renders may straddle a second)"""
+    return re.sub(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", "<time>", text)
+
+
+def test_generate_report_returns_the_text_it_saves(tmp_path, capsys):
+    path = tmp_path / 'daily_report.txt'
+    report = reddit_monitor.generate_report(MENTIONS, MOMENTUM, output_file=str(path))
+
+    assert isinstance(report, str) and 'ASTS' in report
+    assert path.read_text() == report
+    assert report in capsys.readouterr().out
+
+
+def test_write_report_streams_the_same_report(tmp_path):
+    text = reddit_monitor.generate_report(MENTIONS, MOMENTUM, output_file=str(tmp_path / 'a.txt'), echo=False)
+    path = reddit_monitor.write_report(MENTIONS, MOMENTUM, output_file=tmp_path / 'b.txt', echo=False)
+    assert untimed(path.read_text()) == untimed(text)
+
+
+def test_live_generate_report_returns_text(tmp_path):
+    posts = {'ASTS': [{'title': 'ASTS launch', 'score': 10, 'num_comments': 3, 'subreddit': 'stocks',
+                       'url': 'https://example.com', 'sentiment': 'positive'}]}
+    text = live_reddit_monitor.generate_report(Counter({'ASTS': 1}), posts,
+                                               output_file=str(tmp_path / 'live.txt'), echo=False)
+    path = live_reddit_monitor.write_report(Counter({'ASTS': 1}), posts,
+                                            output_file=str(tmp_path / 'live_stream.txt'), echo=False)
+    assert (tmp_path / 'live.txt').read_text() == text
+    assert untimed(path.read_text()) == untimed(text)
@@ -0,0 +1,72 @@
+import json
+
+from live_report_generator import cache_search_results, collect_search_results
+from response_cache import ResponseCache
+
+
+def result(query, content, source='Web Search'):
+    return {'query': query, 'content': content, 'source': source}
+
+
+def test_every_result_of_a_query_is_kept(tmp_path):
+    cache = ResponseCache(tmp_path)
+    results = [result('q1', 'a'), result('q1', 'b'), result('q2', 'c')]
+
+    assert cache_search_results(results, cache) == results
+    found, missing = collect_search_results(['q1', 'q2'], cache=cache)
+    assert found == results
+    assert missing == []
+
+
+def test_queries_are_grouped_by_normalized_form(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache_search_results([result('AVGO  Broadcom', 'a'), result('avgo broadcom', 'b')], cache)
+
+    found, _ = collect_search_results(['Avgo Broadcom'], cache=cache)
+    assert [r['content'] for r in found] == ['a', 'b']
+
+
+def test_later_results_are_merged_without_repeats(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache_search_results([result('q1', 'a'), result('q1', 'b')], cache)
+    stored = cache_search_results([result('q1', 'b'), result('q1', 'b', 'Other'), result('q1', 'c')], cache)
+
+    assert [(r['content'], r['source']) for r in stored] == [
+        ('a', 'Web Search'), ('b', 'Web Search'), ('b', 'Other'), ('c', 'Web Search')]
+    found, _ = collect_search_results(['q1'], cache=cache)
+    assert found == stored
+
+
+def test_results_without_a_query_are_not_cached(tmp_path):
+    cache = ResponseCache(tmp_path)
+    assert cache_search_results([result('', 'a'), {'content': 'b'}], cache) == []
+    assert len(cache) == 0
+
+
+def test_search_is_only_called_for_uncached_queries(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache_search_results([result('q1', 'a')], cache)
+    searched = []
+
+    def search(query):
+        searched.append(query)
+        return {'content': f'fresh {query}', 'source': 'Web Search'} if query == 'q2' else None
+
+    found, missing = collect_search_results(['q1', 'q2', 'q3'], search=search, cache=cache)
+    assert searched == ['q2', 'q3']
+    assert [r['content'] for r in found] == ['a', 'fresh q2']
+    assert missing == ['q3']
+    assert collect_search_results(['q2'], cache=cache)[0] == [result('q2', 'fresh q2')]
+
+
+
+def test_entries_with_foreign_headers_are_skipped(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache_search_results([result('q1', 'a')], cache)
+    (tmp_path / 'ab').mkdir(exist_ok=True)
+    for name, header in [('abc1', {}), ('abc2', []), ('abc3', {'expires': 'soon'})]:
+        (tmp_path / 'ab' / name).write_bytes(json.dumps(header).encode('utf-8') + b"\n[]")
+
+    reopened = ResponseCache(tmp_path)
+    assert len(reopened) == 1
+    assert collect_search_results(['q1'], cache=reopened)[0] == [result('q1', 'a')]
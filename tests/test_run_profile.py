@@ -0,0 +1,83 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from response_cache import ResponseCache
+from run_profile import count, profile_path, profiled_run, prune_profiles, span
+from seen_posts import SeenPosts
+from vault_writer import VaultWriter
+
+
+def test_each_run_writes_its_own_timestamped_profile(tmp_path):
+    paths = []
+    for _ in range(2):
+        with profiled_run('cycle', {'enabled': True, 'directory': str(tmp_path)}) as profile:
+            with span('stage'):
+                pass
+        paths.append(profile.path)
+
+    assert paths[0] != paths[1]
+    assert sorted(tmp_path.glob('cycle-*.json')) == paths
+
+
+def test_profile_path_sorts_by_start_time(tmp_path):
+    earlier = profile_path(tmp_path, 'run', datetime(2026, 1, 18, 9, 59, 59, 999999))
+    later = profile_path(tmp_path, 'run', datetime(2026, 1, 18, 10, 0, 0))
+    assert earlier.name == 'run-20260118-095959-999999.json'
+    assert earlier.name < later.name
+
+
+def test_prune_keeps_the_newest_profiles_of_that_run_only(tmp_path):
+    names = [profile_path(tmp_path, 'run', datetime(2026, 1, day)) for day in range(1, 6)]
+    for path in names:
+        path.write_text('{}')
+    other = tmp_path / 'run-notes.json'
+    other.write_text('{}')
+    sibling = profile_path(tmp_path, 'run_other', datetime(2026, 1, 1))
+    sibling.write_text('{}')
+
+    assert prune_profiles(tmp_path, 'run', keep=2) == 3
+    assert sorted(tmp_path.glob('run-2026*.json')) == names[-2:]
+    assert other.exists() and sibling.exists()
+
+
+def test_counters_reach_the_json_profile(tmp_path):
+    cache = ResponseCache(tmp_path / 'cache')
+    seen = SeenPosts()
+    writer = VaultWriter()
+    note = tmp_path / 'vault' / 'note.md'
+
+    with profiled_run('run', {'enabled': True, 'directory': str(tmp_path)}) as profile:
+        count('search_results', 3)
+        cache.put('search', 'nvda', b'[]')
+        cache.get('search', 'NVDA')
+        cache.get('search', 'amd')
+        post = {'id': 'abc', 'name': 't3_abc'}
+        seen.check(post)
+        seen.check(post)
+        writer.write(note, "# Note\n")
+        writer.write(note, "# Note\n")
+
+    counters = json.loads(profile.path.read_text())['counters']
+    assert counters == {
+        'search_results': 3,
+        'response_cache_hits': 1, 'response_cache_misses': 1,
+        'seen_posts_checked': 2, 'seen_posts_skipped': 1,
+        'vault_files_written': 1, 'vault_bytes_written': 7,
+        'vault_files_skipped': 1, 'vault_bytes_skipped': 7,
+    }
+
+
+def test_disabled_profile_ignores_counters(tmp_path):
+    with profiled_run('run', {'enabled': False, 'directory': str(tmp_path)}) as profile:
+        count('search_results')
+    assert not profile.enabled
+    assert not list(tmp_path.iterdir())
+
+
+def test_failed_run_still_writes_its_profile(tmp_path):
+    with pytest.raises(RuntimeError):
+        with profiled_run('run', {'enabled': True, 'directory': str(tmp_path)}) as profile:
+            raise RuntimeError('boom')
+    assert json.loads(profile.path.read_text())['status'] == 'error'
@@ -0,0 +1,62 @@
+import json
+
+from seen_posts import ScalableBloomFilter, SeenPosts
+
+
+def test_added_keys_are_always_found():
+    bloom = ScalableBloomFilter(capacity=100)
+    keys = [f"t3_{i}" for i in range(5000)]
+    assert all(bloom.add(key) for key in keys[:10])
+    for key in keys[10:]:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    assert not bloom.add(keys[0])
+    assert len(bloom.filters) > 1
+
+
+def test_false_positive_rate_stays_under_the_target():
+    bloom = ScalableBloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(50000):
+        bloom.add(f"t3_{i}")
+
+    false_positives = sum(f"t3_unseen{i}" in bloom for i in range(50000))
+    assert false_positives / 50000 <= bloom.error_rate
+
+
+def test_crossposts_are_checked_once():
+    seen = SeenPosts()
+    assert seen.check({'id': 'a1'})
+    assert not seen.check({'id': 'b2', 'crosspost_parent': 't3_a1'})
+    assert not seen.check({'name': 't3_a1'})
+    assert seen.checked == 3 and seen.skipped == 2
+
+
+def test_memory_cap_forgets_the_oldest_posts():
+    bloom = ScalableBloomFilter(capacity=1000, max_bytes=64 * 1024)
+    for i in range(100000):
+        bloom.add(f"t3_{i}")
+
+    assert bloom.nbytes <= 64 * 1024
+    assert "t3_99999" in bloom
+    assert sum(f"t3_{i}" in bloom for i in range(1000)) < 100
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = tmp_path / 'seen_posts.bloom'
+    bloom = ScalableBloomFilter(capacity=100)
+    for i in range(1000):
+        bloom.add(f"t3_{i}")
+    bloom.save(path)
+
+    loaded = ScalableBloomFilter.load(path, capacity=100)
+    assert len(loaded) == len(bloom)
+    assert all(f"t3_{i}" in loaded for i in range(1000))
+
+    # Another capacity, or a file from before the current probe layout, starts empty
+    assert len(ScalableBloomFilter.load(path, capacity=200)) == 0
+    lines = path.read_bytes().split(b"\n", 1)
+    header = json.loads(lines[0])
+    del header['version']
+    path.write_bytes(json.dumps(header).encode('utf-8') + b"\n" + lines[1])
+    assert len(ScalableBloomFilter.load(path, capacity=100)) == 0
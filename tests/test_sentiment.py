@@ -0,0 +1,26 @@
+from keyword_index import DIRECT_SCAN_MAX_KEYWORDS, KeywordIndex
+from sentiment import analyze_sentiment
+
+# Enough extra keywords to push a KeywordIndex onto its chunk path
+EXTRA_WORDS = [f"filler{i}" for i in range(DIRECT_SCAN_MAX_KEYWORDS)]
+
+
+def test_labels_need_more_than_the_margin():
+    assert analyze_sentiment("Bullish breakout, strong revenue growth and a partnership catalyst") == "positive"
+    assert analyze_sentiment("Bearish: weak guidance, a miss, downgrade and overvalued - sell") == "negative"
+    assert analyze_sentiment("Bullish, strong, buy - but a real risk") == "neutral"
+    assert analyze_sentiment("Nothing to see here") == analyze_sentiment("") == "neutral"
+
+
+def test_keywords_match_as_substrings_once_each():
+    # 'gain' inside 'against', 'sell' inside 'upsell'; repeats do not add up
+    assert analyze_sentiment("SELL sell sell, weak against the upsell") == "neutral"
+    assert analyze_sentiment("Against a surge, momentum is STRONG") == "positive"
+
+
+def test_keyword_index_chunk_path_matches_substring_checks():
+    keywords = ['Growth', 'revenue growth', 'sell'] + EXTRA_WORDS
+    index = KeywordIndex(keywords)
+    text = "Revenue growth beat; upsell of filler3x but not filler"
+    expected = [keyword.lower() for keyword in keywords if keyword.lower() in text.lower()]
+    assert index.keywords_in(index.match(text)) == expected
@@ -0,0 +1,48 @@
+import re
+
+from ticker_matcher import TickerMatcher, build_matcher
+
+TICKERS = ['ASTS', 'RKLB', 'AVGO', 'D', 'SMR', 'BRK.B']
+
+
+def regex_find(text, tickers=TICKERS):
+    """The per-ticker word-boundary regexes TickerMatcher replaces"""
+    return [ticker for ticker in tickers if re.search(r'\b' + re.escape(ticker) + r'\b', text.upper())]
+
+
+def test_find_matches_per_ticker_regexes():
+    matcher = TickerMatcher(TICKERS)
+    texts = [
+        "ASTS and $RKLB to the moon",
+        "avgo earnings, smr-power, brk.b holders",
+        "DASTS ASTSX RKLB_2 D-day",
+        "BRK.BX is not BRK.B",
+        "",
+    ]
+    for text in texts:
+        assert matcher.find(text) == regex_find(text)
+
+
+def test_find_reports_each_ticker_once_in_config_order():
+    matcher = TickerMatcher(TICKERS)
+    assert matcher.find("SMR SMR RKLB ASTS") == ['ASTS', 'RKLB', 'SMR']
+
+
+def test_find_all_and_count_keep_every_occurrence():
+    matcher = TickerMatcher(TICKERS)
+    text = "SMR then BRK.B then SMR and $ASTS"
+    assert matcher.find_all(text) == ['SMR', 'BRK.B', 'SMR', 'ASTS']
+    assert matcher.count(text) == {'SMR': 2, 'BRK.B': 1, 'ASTS': 1}
+
+
+def test_tickers_are_deduplicated_and_uppercased():
+    matcher = TickerMatcher(['asts', 'ASTS', 'rklb'])
+    assert matcher.tickers == ['ASTS', 'RKLB']
+    assert len(matcher) == 2
+    assert 'RKLB' in matcher
+
+
+def test_build_matcher_length_limits():
+    matcher = build_matcher({'Tier 1': ['D', 'ASTS'], 'Tier 2': ['GOOGLE', 'SMR']}, min_length=2, max_length=5)
+    assert matcher.tickers == ['ASTS', 'SMR']
+    assert matcher.find("D ASTS GOOGLE SMR") == ['ASTS', 'SMR']
@@ -0,0 +1,58 @@
+from vault_writer import VaultWriter
+
+NOTE = "# Index\n\n*Last Changed: {stamp}*\n\n- [[2026-01-18_live_analysis]]\n"
+
+
+def test_unchanged_content_is_skipped_and_keeps_its_stamp(tmp_path):
+    path = tmp_path / "_index.md"
+    writer = VaultWriter()
+
+    assert writer.write(path, NOTE.format(stamp="2026-01-18 09:00:00"))
+    assert not writer.write(path, NOTE.format(stamp="2026-01-18 10:00:00"))
+    assert "09:00:00" in path.read_text()
+    assert len(writer.written) == len(writer.skipped) == 1
+    assert writer.bytes_skipped == len(NOTE.format(stamp="2026-01-18 10:00:00").encode('utf-8'))
+
+
+def test_changed_content_is_rewritten_with_the_new_stamp(tmp_path):
+    path = tmp_path / "_index.md"
+    writer = VaultWriter()
+    writer.write(path, NOTE.format(stamp="2026-01-18 09:00:00"))
+
+    changed = NOTE.format(stamp="2026-01-19 09:00:00") + "- [[2026-01-19_live_analysis]]\n"
+    assert writer.write(path, changed)
+    assert path.read_text() == changed
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_write_sections_renders_each_section_once(tmp_path):
+    calls = []
+
+    def section(out):
+        calls.append(1)
+        out.write("*Generated: 2026-01-18 09:00:00*\n\nbody\n")
+
+    writer = VaultWriter()
+    assert writer.write_sections(tmp_path / "report.md", [section])
+    assert not writer.write_sections(tmp_path / "report.md", [section])
+    assert len(calls) == 2
+    assert (tmp_path / "report.md").read_text().endswith("body\n")
+
+
+def test_write_sections_streams_to_disk_and_cleans_up(tmp_path):
+    path = tmp_path / "vault" / "report.md"
+    streaming = []
+
+    def rows(out):
+        for i in range(3):
+            out.write(f"row {i}\n")
+        # Rows go straight to a temp file next to the note, not into a string
+        streaming.append((path.parent / ".report.md.tmp").exists())
+
+    writer = VaultWriter()
+    assert writer.write_sections(path, [rows])
+    assert not writer.write_sections(path, [rows])
+    assert streaming == [True, True]
+    assert path.read_text() == "row 0\nrow 1\nrow 2\n"
+    assert [p.name for p in path.parent.iterdir()] == ["report.md"]
+    assert writer.bytes_written == writer.bytes_skipped == len("row 0\nrow 1\nrow 2\n")